@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Apply Queue
+Cola de prioridad que ordena los trabajos pendientes por valor esperado
+"""
+
+import heapq
+import math
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Iterable
+
+from utils import clean_text
+
+
+# Pesos de cada componente del score (suman 1)
+WEIGHT_MATCH = 0.35        # Coincidencia con keywords de búsqueda y CVs
+WEIGHT_FRESHNESS = 0.20    # Qué tan reciente es la publicación
+WEIGHT_COMPLETION = 0.30   # Tasa histórica de postulaciones completadas en la empresa
+WEIGHT_LOW_RISK = 0.15     # 1 - riesgo estimado de terminar en MANUAL
+
+# Vida media (días) del componente de frescura
+FRESHNESS_HALF_LIFE_DAYS = 3
+
+# Peso (en número de postulaciones) del promedio global al suavizar tasas por empresa
+PRIOR_STRENGTH = 3
+
+
+class ApplyQueue:
+    """
+    Cola de trabajos pendientes servida de mejor a peor score
+
+    El score se calcula antes de abrir el navegador, solo con datos locales:
+    frescura de la publicación, coincidencia de keywords, tasa histórica de
+    éxito de la empresa y riesgo estimado de terminar en MANUAL.
+    """
+
+    def __init__(self, yaml_config: Dict[str, Any], history: Iterable[Dict[str, Any]] = ()):
+        """
+        Inicializa la cola
+
+        Args:
+            yaml_config: Contenido de config.yaml
+            history: Resultados de postulaciones anteriores (application_results)
+        """
+        busqueda = yaml_config.get('busqueda', {})
+        self.search_keywords = [k.lower() for k in busqueda.get('palabras_clave', [])]
+        self.cv_keywords = sorted({
+            k.lower()
+            for cv_info in yaml_config.get('cvs', {}).values()
+            for k in cv_info.get('keywords', [])
+        })
+
+        self._heap: List[tuple] = []
+        self._counter = 0
+
+        self._build_company_stats(history)
+
+    def _build_company_stats(self, history: Iterable[Dict[str, Any]]):
+        """Agrega resultados históricos por empresa"""
+        self.company_stats: Dict[str, Dict[str, int]] = {}
+        totals = {'total': 0, 'applied': 0, 'manual': 0}
+
+        for result in history:
+            status = result.get('status')
+            if status not in ('APPLIED', 'MANUAL', 'ERROR'):
+                continue  # ELIMINADO/PENDING no dicen nada del formulario
+            stats = self.company_stats.setdefault(self._company_key(result.get('company')),
+                                                  {'total': 0, 'applied': 0, 'manual': 0})
+            for bucket in (stats, totals):
+                bucket['total'] += 1
+                bucket['applied'] += status == 'APPLIED'
+                bucket['manual'] += status == 'MANUAL'
+
+        # Promedios globales usados como prior (valores neutros si no hay historia)
+        self.global_completion = (totals['applied'] + 1) / (totals['total'] + 2)
+        self.global_manual = (totals['manual'] + 1) / (totals['total'] + 2)
+
+    @staticmethod
+    def _company_key(company: Optional[str]) -> str:
+        return clean_text(company or '').lower()
+
+    def _smoothed_rate(self, count: int, total: int, prior: float) -> float:
+        return (count + PRIOR_STRENGTH * prior) / (total + PRIOR_STRENGTH)
+
+    def score_job(self, job: Dict[str, Any]) -> Dict[str, float]:
+        """
+        Calcula el score de un trabajo y sus componentes
+
+        Args:
+            job: Datos del trabajo
+
+        Returns:
+            Diccionario con 'score' y cada componente (0 a 1)
+        """
+        text = f"{job.get('title', '')} {job.get('description', '')}".lower()
+
+        # Coincidencia: keyword de búsqueda en el título + keywords de CV
+        # (cv_match_score lo calcula el scraper al elegir el CV)
+        search_hit = any(k in text for k in self.search_keywords)
+        cv_hits = job.get('cv_match_score')
+        if cv_hits is None:
+            cv_hits = sum(1 for k in self.cv_keywords if k in text)
+        match = 0.5 * search_hit + 0.5 * min(cv_hits / 3, 1.0)
+
+        freshness = self._freshness(job)
+
+        stats = self.company_stats.get(self._company_key(job.get('company')),
+                                       {'total': 0, 'applied': 0, 'manual': 0})
+        completion = self._smoothed_rate(stats['applied'], stats['total'], self.global_completion)
+        manual_risk = self._smoothed_rate(stats['manual'], stats['total'], self.global_manual)
+        if not job.get('has_easy_apply', True) or job.get('application_type') == 'MANUAL':
+            manual_risk = 1.0
+
+        score = (WEIGHT_MATCH * match
+                 + WEIGHT_FRESHNESS * freshness
+                 + WEIGHT_COMPLETION * completion
+                 + WEIGHT_LOW_RISK * (1 - manual_risk))
+
+        return {
+            'score': round(score, 4),
+            'match': round(match, 4),
+            'freshness': round(freshness, 4),
+            'completion': round(completion, 4),
+            'manual_risk': round(manual_risk, 4)
+        }
+
+    def _freshness(self, job: Dict[str, Any]) -> float:
+        """Decaimiento exponencial según la fecha de publicación (o de scraping)"""
+        for field in ('posted_date', 'scraped_at'):
+            value = job.get(field)
+            if not value or value == 'N/A':
+                continue
+            for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d"):
+                try:
+                    date = datetime.strptime(value, fmt)
+                except ValueError:
+                    continue
+                age_days = max((datetime.now() - date).total_seconds() / 86400, 0)
+                return math.pow(0.5, age_days / FRESHNESS_HALF_LIFE_DAYS)
+        return 0.5  # Sin fecha: valor neutro
+
+    def push(self, job: Dict[str, Any]):
+        """Agrega un trabajo a la cola (guarda el score en job['priority'])"""
+        job['priority'] = self.score_job(job)
+        heapq.heappush(self._heap, (-job['priority']['score'], self._counter, job))
+        self._counter += 1
+
+    def extend(self, jobs: Iterable[Dict[str, Any]]):
+        """Agrega varios trabajos a la cola"""
+        for job in jobs:
+            self.push(job)
+
+    def pop(self) -> Optional[Dict[str, Any]]:
+        """Retorna el trabajo con mayor score, o None si la cola está vacía"""
+        if not self._heap:
+            return None
+        return heapq.heappop(self._heap)[2]
+
+    def __len__(self) -> int:
+        return len(self._heap)
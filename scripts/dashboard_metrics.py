@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Dashboard Metrics
+Calcula las métricas del Dashboard a partir de los datos locales (espejo de
+Postulaciones + trabajos encontrados) con group-bys de pandas
+"""
+
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+import pandas as pd
+
+from utils import extract_job_id_from_url
+
+
+# Ancho fijo del bloque escrito en la hoja Dashboard
+DASHBOARD_COLUMNS = 5
+
+# Estados que no cuentan como procesados (todavía no se intentó postular)
+UNPROCESSED_STATUSES = {'PENDIENTE', 'PENDING'}
+
+# Estados de seguimiento: la postulación fue enviada
+FOLLOW_UP_STATUSES = {'EN_REVISION', 'ENTREVISTA', 'RECHAZADO', 'CANCELADO'}
+
+# Empresas listadas en la tabla por empresa (las de más postulaciones)
+TOP_COMPANIES = 15
+
+WEEKS = 8
+
+
+def build_frame(rows: List[List[str]], jobs: Optional[List[Dict[str, Any]]] = None,
+                archived: Optional[Dict[str, Dict[str, str]]] = None) -> pd.DataFrame:
+    """
+    Arma un DataFrame por postulación con los datos del trabajo encontrado
+
+    Args:
+        rows: Filas de Postulaciones (con header)
+        jobs: Trabajos de jobs_found.json (aportan keyword de búsqueda y fecha de scraping)
+        archived: Entradas del índice de archivo (Job ID -> {tipo, estado, ...}); solo
+            aportan tipo y estado, con archivada=True
+
+    Returns:
+        DataFrame con columnas job_id, fecha, empresa, tipo, cv, estado, keyword, encontrado, archivada
+    """
+    df = pd.DataFrame(
+        [row[:12] for row in rows[1:] if len(row) > 4 and row[4]],
+        columns=['id', 'fecha', 'empresa', 'puesto', 'url', 'ubicacion', 'tipo', 'cv', 'estado',
+                 'actualizado', 'notas', 'preguntas']
+    )
+    df['job_id'] = df['url'].map(extract_job_id_from_url)
+    df = df.drop_duplicates('job_id', keep='first')
+    df['archivada'] = False
+
+    active_ids = set(df['job_id'])
+    archived_df = pd.DataFrame(
+        [{'job_id': job_id, 'tipo': entry.get('tipo', ''), 'estado': entry.get('estado', ''), 'archivada': True}
+         for job_id, entry in (archived or {}).items() if job_id not in active_ids],
+        columns=['job_id', 'tipo', 'estado', 'archivada']
+    )
+    if len(archived_df):
+        df = pd.concat([df, archived_df], ignore_index=True)
+    df['fecha'] = pd.to_datetime(df['fecha'], errors='coerce')
+
+    found = pd.DataFrame(
+        [{'job_id': extract_job_id_from_url(job['url']),
+          'keyword': job.get('search_keyword'),
+          'encontrado': job.get('scraped_at')}
+         for job in jobs or [] if job.get('url')],
+        columns=['job_id', 'keyword', 'encontrado']
+    ).drop_duplicates('job_id', keep='last')
+    found['encontrado'] = pd.to_datetime(found['encontrado'], errors='coerce')
+
+    df = df.merge(found, on='job_id', how='left')
+    df['keyword'] = df['keyword'].fillna('(sin keyword)')
+    df['cv'] = df['cv'].replace('', 'N/A')
+    df['empresa'] = df['empresa'].replace('', 'N/A')
+
+    df['procesada'] = ~df['estado'].isin(UNPROCESSED_STATUSES)
+    df['automatizada'] = (df['estado'] == 'APPLIED') | \
+        (df['estado'].isin(FOLLOW_UP_STATUSES) & (df['tipo'] == 'AUTO'))
+    df['horas_a_postular'] = (df['fecha'] - df['encontrado']).dt.total_seconds() / 3600
+    return df
+
+
+def _rate_table(df: pd.DataFrame, column: str, title: str, limit: Optional[int] = None) -> List[List[Any]]:
+    """Tabla procesadas / automatizadas / tasa agrupada por una columna"""
+    grouped = df[df['procesada']].groupby(column).agg(
+        procesadas=('job_id', 'size'),
+        automatizadas=('automatizada', 'sum')
+    ).sort_values('procesadas', ascending=False)
+    if limit:
+        grouped = grouped.head(limit)
+    grouped['tasa'] = (grouped['automatizadas'] / grouped['procesadas'] * 100).round(1)
+
+    values = [[title, 'Procesadas', 'Automatizadas', 'Tasa %']]
+    values += [[str(key), int(row.procesadas), int(row.automatizadas), float(row.tasa)]
+               for key, row in grouped.iterrows()]
+    return values
+
+
+def compute_dashboard(rows: List[List[str]], jobs: Optional[List[Dict[str, Any]]] = None,
+                      now: Optional[datetime] = None,
+                      archived: Optional[Dict[str, Dict[str, str]]] = None) -> List[List[Any]]:
+    """
+    Calcula el Dashboard completo como un bloque de valores listo para escribir
+
+    Los totales, la distribución de estados y las tasas incluyen las postulaciones
+    archivadas; las semanas, el tiempo hasta postular y las tablas por
+    keyword/CV/empresa usan solo las filas activas de Postulaciones.
+
+    Args:
+        rows: Filas de Postulaciones (con header)
+        jobs: Trabajos de jobs_found.json
+        now: Fecha de referencia (por defecto, ahora)
+        archived: Entradas del índice de archivo
+
+    Returns:
+        Filas de DASHBOARD_COLUMNS valores cada una
+    """
+    now = pd.Timestamp(now or datetime.now())
+    df = build_frame(rows, jobs, archived)
+    active = df[~df['archivada']]
+    processed = df[df['procesada']]
+
+    automation_rate = round(float(processed['automatizada'].mean()) * 100, 1) if len(processed) else 0.0
+    hours = df['horas_a_postular'].dropna()
+    hours = hours[hours >= 0]
+    responded = df['estado'].isin({'ENTREVISTA', 'RECHAZADO'}).sum()
+    applied = (df['automatizada'] | df['estado'].isin(FOLLOW_UP_STATUSES)).sum()
+
+    values: List[List[Any]] = [
+        ['Métrica', 'Valor'],
+        ['Total Postulaciones', len(df)],
+        ['Archivadas', int(df['archivada'].sum())],
+        ['Aplicadas últimos 7 días', int((df['fecha'] >= now - pd.Timedelta(days=7)).sum())],
+        ['Procesadas', len(processed)],
+        ['Tasa de Automatización %', automation_rate],
+        ['Tasa de Respuesta %', round(float(responded / applied) * 100, 1) if applied else 0.0],
+        ['Horas hasta postular (mediana)', round(float(hours.median()), 1) if len(hours) else ''],
+        ['Horas hasta postular (p90)', round(float(hours.quantile(0.9)), 1) if len(hours) else ''],
+        ['Actualizado', now.strftime("%Y-%m-%d %H:%M:%S")],
+        []
+    ]
+
+    # Distribución de estados
+    counts = df['estado'].replace('', 'N/A').value_counts()
+    values.append(['Estado', 'Cantidad', '%'])
+    values += [[status, int(count), round(float(count / len(df)) * 100, 1)] for status, count in counts.items()]
+    values.append([])
+
+    # Postulaciones por semana (lunes de inicio), últimas WEEKS semanas
+    dated = df.dropna(subset=['fecha'])
+    weeks = dated.groupby(dated['fecha'].dt.to_period('W-SUN').dt.start_time).agg(
+        postulaciones=('job_id', 'size'),
+        automatizadas=('automatizada', 'sum')
+    ).sort_index().tail(WEEKS)
+    values.append(['Semana', 'Postulaciones', 'Automatizadas'])
+    values += [[week.strftime("%Y-%m-%d"), int(row.postulaciones), int(row.automatizadas)]
+               for week, row in weeks.iterrows()]
+    values.append([])
+
+    values += _rate_table(active, 'keyword', 'Keyword')
+    values.append([])
+    values += _rate_table(active, 'cv', 'CV')
+    values.append([])
+    values += _rate_table(active, 'empresa', 'Empresa', limit=TOP_COMPANIES)
+
+    return [row + [''] * (DASHBOARD_COLUMNS - len(row)) for row in values]
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Debug Artifacts
+Captura screenshots y DOM de los fallos del applier y los escribe en segundo plano
+"""
+
+import base64
+import gzip
+import queue
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from utils import extract_job_id_from_url
+
+
+class DebugArtifactWriter:
+    """
+    Escritor asíncrono de artefactos de debug con límites de retención
+
+    En el loop del applier solo se ejecutan los comandos de WebDriver para
+    capturar; decodificar, comprimir, escribir a disco y limpiar artefactos
+    antiguos ocurre en un thread aparte.
+    """
+
+    def __init__(self, output_dir: str = "data/logs/debug", max_total_mb: float = 200,
+                 max_age_days: float = 7, capture_dom: bool = True, max_pending: int = 20,
+                 logger=None):
+        """
+        Inicializa el escritor
+
+        Args:
+            output_dir: Directorio donde guardar los artefactos
+            max_total_mb: Tamaño máximo total del directorio (MB)
+            max_age_days: Antigüedad máxima de un artefacto (días)
+            capture_dom: Guardar también el HTML de la página
+            max_pending: Capturas máximas en cola antes de descartar nuevas
+            logger: Logger opcional para reportar errores
+        """
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.max_total_bytes = int(max_total_mb * 1024 * 1024)
+        self.max_age_seconds = max_age_days * 24 * 3600
+        self.capture_dom = capture_dom
+        self.logger = logger
+
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._worker, name="debug-artifacts", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def from_config(cls, yaml_config: Dict[str, Any], logger=None) -> 'DebugArtifactWriter':
+        """Crea el escritor desde el bloque 'depuracion' de config.yaml"""
+        settings = yaml_config.get('depuracion', {}) or {}
+        return cls(
+            output_dir=settings.get('directorio', 'data/logs/debug'),
+            max_total_mb=settings.get('max_total_mb', 200),
+            max_age_days=settings.get('max_dias', 7),
+            capture_dom=settings.get('capturar_dom', True),
+            logger=logger
+        )
+
+    def capture(self, driver, job: Dict[str, Any], step: str) -> Optional[Path]:
+        """
+        Captura screenshot (y DOM) y los encola para escritura
+
+        Args:
+            driver: WebDriver de Selenium
+            job: Datos del trabajo (se usa la URL para el Job ID)
+            step: Paso o motivo de la captura (ej: 'no_button', 'paso3_no_next_button')
+
+        Returns:
+            Ruta donde se escribirá el screenshot, o None si no se capturó
+        """
+        base_name = f"{self._safe_job_id(job)}_{self._safe_name(step)}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')[:-3]}"
+
+        try:
+            screenshot_b64 = driver.get_screenshot_as_base64()
+            dom = driver.page_source if self.capture_dom else None
+        except Exception as e:
+            self._log_warning(f"  No se pudo capturar artefacto de debug: {str(e)}")
+            return None
+
+        try:
+            self._queue.put_nowait((base_name, screenshot_b64, dom))
+        except queue.Full:
+            self._log_warning("  Cola de artefactos de debug llena, captura descartada")
+            return None
+
+        return self.output_dir / f"{base_name}.png"
+
+    def close(self, timeout: float = 30):
+        """Espera a que se escriban los artefactos pendientes y detiene el thread"""
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _worker(self):
+        """Thread que escribe artefactos y aplica la retención"""
+        self._enforce_retention()
+
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+
+            base_name, screenshot_b64, dom = item
+            try:
+                # PNG ya viene comprimido; el HTML se guarda con gzip
+                (self.output_dir / f"{base_name}.png").write_bytes(base64.b64decode(screenshot_b64))
+                if dom is not None:
+                    with gzip.open(self.output_dir / f"{base_name}.html.gz", 'wt', encoding='utf-8') as f:
+                        f.write(dom)
+                self._enforce_retention()
+            except Exception as e:
+                self._log_warning(f"  Error escribiendo artefacto de debug {base_name}: {str(e)}")
+
+    def _enforce_retention(self):
+        """Elimina artefactos más antiguos que el límite y luego los más viejos hasta cumplir el tamaño"""
+        now = time.time()
+        files = []
+        for path in self.output_dir.iterdir():
+            if not path.is_file():
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if now - stat.st_mtime > self.max_age_seconds:
+                path.unlink(missing_ok=True)
+            else:
+                files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_total_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def _safe_job_id(self, job: Dict[str, Any]) -> str:
+        """Job ID de LinkedIn o, si no se puede extraer, un nombre seguro derivado de la URL/título"""
+        job_id = extract_job_id_from_url(job.get('url', '') or '')
+        if job_id.isdigit():
+            return job_id
+        return self._safe_name(job_id or job.get('title', 'sin_id'))[:40]
+
+    @staticmethod
+    def _safe_name(text: str) -> str:
+        """Reemplaza caracteres no válidos para nombres de archivo"""
+        return re.sub(r'[^A-Za-z0-9_-]+', '_', text).strip('_') or 'x'
+
+    def _log_warning(self, message: str):
+        if self.logger:
+            self.logger.warning(message)
+        else:
+            print(message)
@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""
+Form Simulator
+Ejecuta LinkedInApplier contra formularios Easy Apply sintéticos servidos localmente
+para medir el rendimiento del motor de formularios sin tocar LinkedIn
+"""
+
+import argparse
+import html
+import json
+import random
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from selenium import webdriver
+
+import linkedin_applier
+from linkedin_applier import LinkedInApplier
+from utils import Config, Logger
+
+
+# Preguntas con respuesta en respuestas_comunes.json: (tipo, texto, opciones)
+KNOWN_QUESTIONS = [
+    ('radio', "Are you legally authorized to work in Chile?", ['Sí', 'No']),
+    ('radio', "Will you require visa sponsorship? (require sponsorship)", ['Sí', 'No']),
+    ('radio', "Are you willing to travel for client meetings?", ['Sí', 'No']),
+    ('select', "Python experience (years)", ['1', '2', '3', '4', '5', '6+']),
+    ('select', "What is your Spanish level?", ['Básico', 'Intermedio', 'Nativo']),
+]
+
+# Preguntas sin respuesta configurada (terminan en MANUAL si son demasiadas)
+UNKNOWN_QUESTIONS = [
+    ('radio', "Have you operated Kafka clusters in production?", ['Sí', 'No']),
+    ('radio', "Do you hold an active security clearance?", ['Sí', 'No']),
+    ('select', "How did you hear about this position?", ['LinkedIn', 'Referido', 'Otro']),
+    ('select', "Which shift do you prefer?", ['Mañana', 'Tarde', 'Noche']),
+]
+
+# Campos de texto reconocidos por fill_text_field
+TEXT_FIELDS = ["Email address", "Mobile phone number", "City", "LinkedIn profile URL"]
+
+PLACEHOLDER_OPTION = "Selecciona una opción"
+
+# Página de trabajo: botón Easy Apply fuera del modal y pasos renderizados con
+# innerHTML (como la SPA de LinkedIn, solo el paso actual existe en el DOM).
+# "Siguiente" no avanza si falta un campo requerido.
+JOB_PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="es"><head><meta charset="utf-8"><title>{title}</title></head>
+<body>
+<h1>{title}</h1>
+<p>{company} · Santiago, Chile</p>
+<button class="jobs-apply-button artdeco-button artdeco-button--primary" aria-label="Solicitud sencilla para {title}" onclick="openModal()">Solicitud sencilla</button>
+<div id="artdeco-modal-outlet"></div>
+<script>
+const STEPS = {steps_json};
+const STEP_DELAY = {step_delay_ms};
+let current = 0;
+function render() {{
+  document.getElementById('artdeco-modal-outlet').innerHTML =
+    '<div data-test-modal-id="easy-apply-modal" class="artdeco-modal-overlay">' +
+    '<div role="dialog" class="artdeco-modal jobs-easy-apply-modal" aria-labelledby="jobs-apply-header">' +
+    '<h2 id="jobs-apply-header">Postular a {company_js}</h2>' +
+    '<div class="artdeco-modal__content jobs-easy-apply-modal__content">' + STEPS[current].body + '</div>' +
+    '<footer role="presentation"><div class="display-flex justify-flex-end ph5 pv4">' + STEPS[current].button + '</div></footer>' +
+    '</div></div>';
+}}
+function missingRequired() {{
+  const modal = document.querySelector('.jobs-easy-apply-modal');
+  return [...modal.querySelectorAll('[required]')].filter(el => {{
+    if (el.type === 'radio') {{ return !modal.querySelector('input[name="' + el.name + '"]:checked'); }}
+    return !el.value || el.value === '{placeholder}';
+  }});
+}}
+function openModal() {{ setTimeout(() => {{ current = 0; render(); }}, STEP_DELAY); }}
+function advance() {{
+  if (missingRequired().length) {{ return; }}
+  setTimeout(() => {{
+    current += 1;
+    if (current >= STEPS.length) {{
+      document.getElementById('artdeco-modal-outlet').innerHTML = '<p>Solicitud enviada</p>';
+    }} else {{
+      render();
+    }}
+  }}, STEP_DELAY);
+}}
+</script>
+</body></html>
+"""
+
+
+class SyntheticFormGenerator:
+    """Genera formularios Easy Apply multi-paso con el markup de form_postulacion.html"""
+
+    def __init__(self, steps: int = 3, fields_per_step: int = 4, mix: Dict[str, float] = None,
+                 unknown_ratio: float = 0.15, step_delay_ms: int = 50, seed: int = 0):
+        """
+        Args:
+            steps: Pasos con campos (sin contar la página final de envío)
+            fields_per_step: Campos por paso
+            mix: Pesos por tipo de campo (text, select, radio, textarea, file)
+            unknown_ratio: Proporción de preguntas sin respuesta configurada
+            step_delay_ms: Latencia simulada al abrir el modal y cambiar de paso
+            seed: Semilla para reproducir la misma secuencia de formularios
+        """
+        self.steps = max(steps, 1)
+        self.fields_per_step = fields_per_step
+        self.mix = mix or {'text': 2, 'select': 1, 'radio': 2, 'textarea': 0.5, 'file': 0.5}
+        self.unknown_ratio = unknown_ratio
+        self.step_delay_ms = step_delay_ms
+        self.random = random.Random(seed)
+        self._field_counter = 0
+
+    def job_page(self, job_id: int) -> str:
+        """Genera la página completa de un trabajo sintético"""
+        title = f"Python Backend Developer {job_id}"
+        company = f"Empresa Simulada {job_id % 50}"
+
+        steps = []
+        for index in range(self.steps):
+            body = ''.join(self._field(kind) for kind in self._field_kinds())
+            if index < self.steps - 1:
+                button = self._button("Ir al siguiente paso", "Siguiente", next_attr=True)
+            else:
+                button = self._button("Revisar tu solicitud", "Revisar")
+            steps.append({'body': body, 'button': button})
+        steps.append({
+            'body': '<h3>Revisa tu solicitud</h3><p>Todo listo para postular.</p>',
+            'button': self._button("Enviar solicitud", "Enviar solicitud")
+        })
+
+        return JOB_PAGE_TEMPLATE.format(
+            title=html.escape(title),
+            company=html.escape(company),
+            company_js=company.replace("'", "\\'"),
+            steps_json=json.dumps(steps),
+            step_delay_ms=self.step_delay_ms,
+            placeholder=PLACEHOLDER_OPTION
+        )
+
+    def _field_kinds(self) -> List[str]:
+        kinds = list(self.mix)
+        weights = [self.mix[k] for k in kinds]
+        return self.random.choices(kinds, weights=weights, k=self.fields_per_step)
+
+    def _next_id(self, prefix: str) -> str:
+        self._field_counter += 1
+        return f"{prefix}-formElement-urn-li-jobs-applyformcommon-easyApplyFormElement-{self._field_counter}"
+
+    def _question(self, kind: str):
+        pool = UNKNOWN_QUESTIONS if self.random.random() < self.unknown_ratio else KNOWN_QUESTIONS
+        candidates = [q for q in pool if q[0] == kind]
+        return self.random.choice(candidates)
+
+    def _field(self, kind: str) -> str:
+        wrapper = '<div class="fb-dash-form-element mt4" data-test-form-element="">{}</div>'
+
+        if kind == 'text':
+            field_id = self._next_id('single-line-text-form-component')
+            label = self.random.choice(TEXT_FIELDS)
+            return wrapper.format(
+                f'<div class="artdeco-text-input"><label for="{field_id}" class="artdeco-text-input--label">{label}</label>'
+                f'<input class="artdeco-text-input--input" id="{field_id}" required="" type="text"></div>'
+            )
+
+        if kind == 'textarea':
+            field_id = self._next_id('multiline-text-form-component')
+            return wrapper.format(
+                f'<label for="{field_id}">Cover letter</label>'
+                f'<textarea id="{field_id}" aria-label="Cover letter" placeholder="Carta de presentación"></textarea>'
+            )
+
+        if kind == 'file':
+            field_id = self._next_id('jobs-document-upload-file-input-upload-resume')
+            return wrapper.format(
+                f'<label for="{field_id}">Upload resume</label>'
+                f'<input id="{field_id}" name="file" type="file" accept=".pdf,.doc,.docx">'
+            )
+
+        _, text, options = self._question(kind)
+        field_id = self._next_id(f'{kind}-form-component')
+
+        if kind == 'select':
+            option_html = ''.join(f'<option value="{html.escape(o)}">{html.escape(o)}</option>'
+                                  for o in [PLACEHOLDER_OPTION] + options)
+            return wrapper.format(
+                f'<label for="{field_id}" class="fb-dash-form-element__label">{html.escape(text)}</label>'
+                f'<select id="{field_id}" required="" class="fb-dash-form-element__select-dropdown">{option_html}</select>'
+            )
+
+        radios = ''.join(
+            f'<div><input type="radio" id="{field_id}-{i}" name="{field_id}" value="{html.escape(o)}" required="">'
+            f'<label for="{field_id}-{i}">{html.escape(o)}</label></div>'
+            for i, o in enumerate(options)
+        )
+        return wrapper.format(
+            f'<fieldset data-test-form-builder-radio-button-form-component="true">'
+            f'<legend>{html.escape(text)}</legend>{radios}</fieldset>'
+        )
+
+    @staticmethod
+    def _button(aria_label: str, text: str, next_attr: bool = False) -> str:
+        extra = ' data-easy-apply-next-button=""' if next_attr else ''
+        return (f'<button aria-label="{aria_label}" class="artdeco-button artdeco-button--2 artdeco-button--primary"'
+                f'{extra} type="button" onclick="advance()"><span class="artdeco-button__text">{text}</span></button>')
+
+
+class SimulationServer:
+    """Servidor HTTP local que genera una página por trabajo sintético (/jobs/view/<id>/)"""
+
+    def __init__(self, generator: SyntheticFormGenerator, host: str = '127.0.0.1', public_host: str = None):
+        generator_ref = generator
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parts = [p for p in self.path.split('/') if p]
+                if len(parts) >= 3 and parts[:2] == ['jobs', 'view'] and parts[2].isdigit():
+                    body = generator_ref.job_page(int(parts[2])).encode('utf-8')
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'text/html; charset=utf-8')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                else:
+                    self.send_error(404)
+
+            def log_message(self, format, *args):
+                pass  # Silenciar el log de acceso
+
+        self.httpd = ThreadingHTTPServer((host, 0), Handler)
+        self.base_url = f"http://{public_host or host}:{self.httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self.httpd.shutdown()
+
+
+class SimulationLogger(Logger):
+    """Logger que, en modo silencioso, solo deja pasar warnings y errores"""
+
+    def __init__(self, quiet: bool = True):
+        super().__init__()
+        self.quiet = quiet
+
+    def log(self, message: str, level: str = "INFO"):
+        if self.quiet and level in ("INFO", "SUCCESS"):
+            return
+        super().log(message, level)
+
+
+class TimingProbe:
+    """Acumula tiempo por categoría (webdriver, respuestas, cv, sleep)"""
+
+    def __init__(self):
+        self.seconds: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+
+    def add(self, category: str, elapsed: float):
+        self.seconds[category] = self.seconds.get(category, 0.0) + elapsed
+        self.calls[category] = self.calls.get(category, 0) + 1
+
+    def wrap(self, category: str, func):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.add(category, time.perf_counter() - start)
+        return timed
+
+
+class _ScaledTime:
+    """Sustituto del módulo time en linkedin_applier: escala y mide time.sleep"""
+
+    def __init__(self, probe: TimingProbe, scale: float):
+        self._probe = probe
+        self._scale = scale
+
+    def sleep(self, seconds: float):
+        start = time.perf_counter()
+        if seconds * self._scale > 0:
+            time.sleep(seconds * self._scale)
+        self._probe.add('sleep', time.perf_counter() - start)
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+def create_driver(remote_url: Optional[str], headless: bool):
+    """Crea un Chrome local (o remoto si se indica URL del grid)"""
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument('--headless=new')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--window-size=1920,1080')
+    if remote_url:
+        return webdriver.Remote(command_executor=remote_url, options=options)
+    return webdriver.Chrome(options=options)
+
+
+def run_simulation(driver, generator: SyntheticFormGenerator, applications: int,
+                   sleep_scale: float = 0.0, quiet: bool = True,
+                   host: str = '127.0.0.1', public_host: str = None) -> Dict[str, Any]:
+    """
+    Ejecuta el applier contra N formularios sintéticos
+
+    Args:
+        driver: WebDriver a instrumentar
+        generator: Generador de formularios
+        applications: Número de postulaciones simuladas
+        sleep_scale: Factor aplicado a los time.sleep del applier (0 = sin esperas)
+        quiet: Silenciar logs INFO del applier
+        host: Interfaz donde escucha el servidor local
+        public_host: Host con que el navegador alcanza el servidor (para Selenium remoto)
+
+    Returns:
+        Reporte con pasos/segundo y desglose de tiempo
+    """
+    probe = TimingProbe()
+    server = SimulationServer(generator, host=host, public_host=public_host)
+    server.start()
+
+    applier = LinkedInApplier(driver, Config(), SimulationLogger(quiet))
+
+    # Instrumentación: todo comando WebDriver (incluye WebElement) pasa por driver.execute
+    driver.execute = probe.wrap('webdriver', driver.execute)
+    applier.find_answer_for_question = probe.wrap('respuestas', applier.find_answer_for_question)
+    applier.fill_current_form_step = probe.wrap('pasos', applier.fill_current_form_step)
+    applier.cv_classifier.classify = probe.wrap('seleccion_cv', applier.cv_classifier.classify)
+    original_time = linkedin_applier.time
+    linkedin_applier.time = _ScaledTime(probe, sleep_scale)
+
+    statuses: Dict[str, int] = {}
+    start = time.perf_counter()
+    try:
+        for job_id in range(1, applications + 1):
+            job = {
+                'url': f"{server.base_url}/jobs/view/{job_id}/",
+                'title': f"Python Backend Developer {job_id}",
+                'company': f"Empresa Simulada {job_id % 50}",
+                'description': ''
+            }
+            result = applier.apply_to_job(job)
+            statuses[result['status']] = statuses.get(result['status'], 0) + 1
+    finally:
+        wall = time.perf_counter() - start
+        linkedin_applier.time = original_time
+        del applier.cv_classifier.classify
+        applier.artifacts.close()
+        server.stop()
+
+    steps = probe.calls.get('pasos', 0)
+    accounted = sum(probe.seconds.get(k, 0.0) for k in ('webdriver', 'respuestas', 'seleccion_cv', 'sleep'))
+    breakdown = {
+        category: {
+            'segundos': round(probe.seconds.get(category, 0.0), 3),
+            'llamadas': probe.calls.get(category, 0),
+            'porcentaje': round(100 * probe.seconds.get(category, 0.0) / wall, 1) if wall else 0.0
+        }
+        for category in ('webdriver', 'respuestas', 'seleccion_cv', 'sleep')
+    }
+    breakdown['otro'] = {
+        'segundos': round(max(wall - accounted, 0.0), 3),
+        'porcentaje': round(100 * max(wall - accounted, 0.0) / wall, 1) if wall else 0.0
+    }
+
+    return {
+        'postulaciones': applications,
+        'estados': statuses,
+        'pasos': steps,
+        'segundos_totales': round(wall, 3),
+        'pasos_por_segundo': round(steps / wall, 3) if wall else 0.0,
+        'postulaciones_por_minuto': round(60 * applications / wall, 2) if wall else 0.0,
+        'desglose': breakdown
+    }
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """Convierte 'text:2,select:1,radio:2' en {'text': 2.0, ...}"""
+    mix = {}
+    for part in value.split(','):
+        kind, _, weight = part.partition(':')
+        mix[kind.strip()] = float(weight or 1)
+    return mix
+
+
+def main():
+    """Función principal: ejecuta la simulación y guarda el reporte"""
+    parser = argparse.ArgumentParser(description="Simulación del motor de formularios Easy Apply")
+    parser.add_argument('--postulaciones', type=int, default=20, help="Formularios a simular")
+    parser.add_argument('--pasos', type=int, default=3, help="Pasos con campos por formulario")
+    parser.add_argument('--campos', type=int, default=4, help="Campos por paso")
+    parser.add_argument('--mezcla', default="text:2,select:1,radio:2,textarea:0.5,file:0.5",
+                        help="Pesos por tipo de campo (text, select, radio, textarea, file)")
+    parser.add_argument('--sin-respuesta', type=float, default=0.15,
+                        help="Proporción de preguntas sin respuesta configurada")
+    parser.add_argument('--delay-paso-ms', type=int, default=50, help="Latencia simulada por paso")
+    parser.add_argument('--escala-sleep', type=float, default=0.0,
+                        help="Factor para los time.sleep del applier (1 = tiempos reales)")
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--remote', default=None, help="URL de Selenium remoto (ej: http://selenium-chrome:4444)")
+    parser.add_argument('--host', default='127.0.0.1', help="Interfaz del servidor local")
+    parser.add_argument('--public-host', default=None, help="Host con que el navegador alcanza el servidor")
+    parser.add_argument('--visible', action='store_true', help="Mostrar el navegador")
+    parser.add_argument('--verbose', action='store_true', help="Mostrar logs INFO del applier")
+    args = parser.parse_args()
+
+    print("🧪 Simulación de formularios Easy Apply")
+    print("=" * 60)
+
+    generator = SyntheticFormGenerator(
+        steps=args.pasos,
+        fields_per_step=args.campos,
+        mix=parse_mix(args.mezcla),
+        unknown_ratio=args.sin_respuesta,
+        step_delay_ms=args.delay_paso_ms,
+        seed=args.semilla
+    )
+
+    driver = create_driver(args.remote, headless=not args.visible)
+    try:
+        report = run_simulation(driver, generator, args.postulaciones,
+                                sleep_scale=args.escala_sleep, quiet=not args.verbose,
+                                host=args.host, public_host=args.public_host)
+    finally:
+        driver.quit()
+
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+    report_file = Path("data/logs/simulation_report.json")
+    report_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(report_file, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\n✅ Reporte guardado en: {report_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,11 +5,39 @@ Maneja la integración con Google Sheets para trackear aplicaciones
 """
 
 import gspread
-from google.oauth2.service_account import Credentials
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Set, Tuple, Callable
 from datetime import datetime
-import time
+import re
+
+from utils import extract_job_id_from_url
+from sheets_mirror import SheetsMirror
+from sheets_client import QuotaAwareClient, RequestCoalescer, SCOPES, get_session
+from dashboard_metrics import compute_dashboard, DASHBOARD_COLUMNS
+from sheets_archive import ArchiveIndex, ARCHIVE_PREFIX
+
+
+# Encabezados de la hoja Preguntas_Pendientes
+PREGUNTAS_HEADERS = ['Fecha', 'Pregunta', 'URL Oferta', 'Estado']
+
+# Estados que escribe la automatización. Los demás (EN_REVISION, ENTREVISTA,
+# RECHAZADO, CANCELADO) son seguimiento manual y la sincronización no los pisa
+AUTOMATION_STATUSES = {'PENDIENTE', 'PENDING', 'APPLIED', 'MANUAL', 'ERROR', 'ELIMINADO'}
+
+# Encabezados de la hoja Postulaciones (el orden define las columnas)
+POSTULACIONES_HEADERS = [
+    'ID', 'Fecha Aplicación', 'Empresa', 'Puesto', 'URL',
+    'Ubicación', 'Tipo Aplicación', 'CV Usado', 'Estado',
+    'Último Update', 'Notas', 'Preguntas Pendientes'
+]
+
+
+def _parse_row_id(value: Any) -> int:
+    """ID numérico de una fila de Postulaciones (0 si la celda no es un número)"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
 
 
 class GoogleSheetsManager:
@@ -17,7 +45,7 @@ class GoogleSheetsManager:
     
     def __init__(self, credentials_path: str, spreadsheet_id: str):
         """
-        Inicializa el gestor
+        Inicializa el gestor (sin conectarse: la conexión se abre en el primer uso)
         
         Args:
             credentials_path: Ruta al archivo de credenciales JSON
@@ -27,33 +55,52 @@ class GoogleSheetsManager:
         self.spreadsheet_id = spreadsheet_id
         
         # Scopes necesarios
-        self.scopes = [
-            'https://www.googleapis.com/auth/spreadsheets',
-            'https://www.googleapis.com/auth/drive'
-        ]
+        self.scopes = SCOPES
+        
+        # Cliente, spreadsheet y handles de hojas compartidos por todo el proceso
+        self._session = get_session(str(self.credentials_path), spreadsheet_id, self.scopes)
+        
+        # Contador de IDs de Postulaciones y próxima fila libre (se siembran por sesión)
+        self._next_row_id: Optional[int] = None
+        self._next_row_number: Optional[int] = None
+        
+        # Índice Job ID -> {'row', 'notes'} de Postulaciones (se construye con una sola lectura)
+        self._row_index: Optional[Dict[str, Dict[str, Any]]] = None
         
-        self.client = None
-        self.spreadsheet = None
+        # Registro de preguntas pendientes: set normalizado + filas nuevas por enviar
+        self._question_set: Optional[set] = None
+        self._question_buffer: List[List[str]] = []
         
-        self._authenticate()
+        # Filas de Postulaciones del espejo local (sincronizado una vez por sesión)
+        self._mirror_rows: Optional[List[List[str]]] = None
+        self._mirror_verified = False
+        
+        # Índice local de postulaciones archivadas (hojas Archivo_YYYY_MM)
+        self._archive_index: Optional[ArchiveIndex] = None
+        
+        # Operaciones encoladas que se agrupan por hoja (ver flush_queued)
+        self._coalescer = RequestCoalescer()
+        
+        # Estado local que se aplica cuando se confirma una escritura encolada (por hoja)
+        self._flush_callbacks: Dict[str, List[Callable[[], None]]] = {}
     
-    def _authenticate(self):
-        """Autentica con Google Sheets"""
-        try:
-            creds = Credentials.from_service_account_file(
-                str(self.credentials_path),
-                scopes=self.scopes
-            )
-            self.client = gspread.authorize(creds)
-            self.spreadsheet = self.client.open_by_key(self.spreadsheet_id)
-            print("✓ Autenticado con Google Sheets")
-        except Exception as e:
-            print(f"✗ Error autenticando: {str(e)}")
-            raise
+    @property
+    def client(self) -> QuotaAwareClient:
+        """Cliente autorizado compartido (cuota compartida y reintentos ante 429/5xx)"""
+        return self._session.client
+    
+    @property
+    def spreadsheet(self) -> gspread.Spreadsheet:
+        """Spreadsheet (se abre en el primer acceso)"""
+        return self._session.spreadsheet
+    
+    def connect(self):
+        """Fuerza la autenticación (ej: para validar la configuración)"""
+        self._session.spreadsheet
     
     def get_or_create_worksheet(self, title: str, headers: List[str] = None) -> gspread.Worksheet:
         """
-        Obtiene o crea una hoja de trabajo
+        Obtiene o crea una hoja de trabajo (cacheada durante el proceso)
         
         Args:
             title: Nombre de la hoja
@@ -63,44 +110,47 @@ class GoogleSheetsManager:
             Worksheet de gspread
         """
         try:
-            # Intentar obtener hoja existente
-            worksheet = self.spreadsheet.worksheet(title)
-            print(f"✓ Hoja '{title}' encontrada")
-            return worksheet
+            return self._session.worksheet(title)
         except gspread.WorksheetNotFound:
-            # Crear nueva hoja, pero manejar posible condición de carrera
-            try:
-                worksheet = self.spreadsheet.add_worksheet(
-                    title=title,
-                    rows=1000,
-                    cols=20
-                )
+            worksheet = self._create_worksheet(title, headers)
+            self._session.register(worksheet)
+            return worksheet
+    
+    def _create_worksheet(self, title: str, headers: List[str] = None) -> gspread.Worksheet:
+        """Crea la hoja con encabezados (llamada a la API)"""
+        # Crear nueva hoja, pero manejar posible condición de carrera
+        try:
+            worksheet = self.spreadsheet.add_worksheet(
+                title=title,
+                rows=1000,
+                cols=20
+            )
 
-                # Agregar encabezados si se proporcionan
-                if headers:
-                    worksheet.append_row(headers)
-                    # Formatear encabezados
-                    worksheet.format('A1:Z1', {
-                        "textFormat": {"bold": True},
-                        "backgroundColor": {"red": 0.9, "green": 0.9, "blue": 0.9}
-                    })
+            # Agregar encabezados si se proporcionan
+            if headers:
+                worksheet.append_row(headers)
+                # Formatear encabezados
+                worksheet.format('A1:Z1', {
+                    "textFormat": {"bold": True},
+                    "backgroundColor": {"red": 0.9, "green": 0.9, "blue": 0.9}
+                })
 
-                print(f"✓ Hoja '{title}' creada")
-                return worksheet
+            print(f"✓ Hoja '{title}' creada")
+            return worksheet
 
-            except Exception as e:
-                # Si al crear la hoja la API indica que ya existe (condición de carrera), intentar recuperarla
-                err_msg = str(e)
-                if 'already exists' in err_msg or 'A sheet with the name' in err_msg:
-                    try:
-                        worksheet = self.spreadsheet.worksheet(title)
-                        print(f"✓ Hoja '{title}' encontrada después de intento de creación")
-                        return worksheet
-                    except Exception:
-                        # Re-raise original exception si no se puede recuperar
-                        raise
-                # Re-raise para cualquier otro error
-                raise
+        except Exception as e:
+            # Si al crear la hoja la API indica que ya existe (condición de carrera), intentar recuperarla
+            err_msg = str(e)
+            if 'already exists' in err_msg or 'A sheet with the name' in err_msg:
+                try:
+                    worksheet = self._session.worksheet(title, refresh=True)
+                    print(f"✓ Hoja '{title}' encontrada después de intento de creación")
+                    return worksheet
+                except Exception:
+                    # Re-raise original exception si no se puede recuperar
+                    raise
+            # Re-raise para cualquier otro error
+            raise
     
     def add_job_application(self, job: Dict[str, Any], result: Dict[str, Any] = None):
         """
@@ -110,21 +160,106 @@ class GoogleSheetsManager:
             job: Datos del trabajo
             result: Resultado de la aplicación (opcional)
         """
-        worksheet = self.get_or_create_worksheet(
-            'Postulaciones',
-            headers=[
-                'ID', 'Fecha Aplicación', 'Empresa', 'Puesto', 'URL',
-                'Ubicación', 'Tipo Aplicación', 'CV Usado', 'Estado',
-                'Último Update', 'Notas', 'Preguntas Pendientes'
-            ]
-        )
+        self.add_job_applications([(job, result)])
+    
+    def add_job_applications(self, applications: List[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]],
+                             timestamps: Optional[List[str]] = None):
+        """
+        Agrega varias aplicaciones a la hoja de Postulaciones en una sola escritura
         
-        # Obtener siguiente ID
-        all_values = worksheet.get_all_values()
-        next_id = len(all_values)  # Incluye header
+        Args:
+            applications: Lista de tuplas (job, result)
+            timestamps: Fecha de cada aplicación (por defecto, ahora)
+        """
+        if not applications:
+            return
         
-        # Preparar datos
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        worksheet = self.get_or_create_worksheet('Postulaciones', headers=POSTULACIONES_HEADERS)
+        
+        # Obtener siguiente ID: se siembra una vez por sesión leyendo solo la columna ID
+        if self._next_row_id is None:
+            self._seed_row_ids(worksheet)
+        next_id = self._next_row_id
+        
+        rows = [self.build_application_row(job, result, next_id + i, timestamps[i] if timestamps else None)
+                for i, (job, result) in enumerate(applications)]
+        
+        response = worksheet.append_rows(rows)
+        self._invalidate_mirror()
+        first_row = self._verify_appended_ids(worksheet, response, next_id, len(rows))
+        
+        # Mantener el índice de filas al día sin volver a leer la hoja
+        if self._row_index is not None:
+            if first_row is None:
+                self._row_index = None
+            else:
+                for offset, row in enumerate(rows):
+                    self._row_index[extract_job_id_from_url(row[4])] = {'row': first_row + offset, 'notes': row[10]}
+        for job, result in applications:
+            status = result.get('status', 'PENDIENTE') if result else 'PENDIENTE'
+            print(f"  ✓ Agregado a Google Sheets: {job.get('title')} - {status}")
+    
+    def _seed_row_ids(self, worksheet: gspread.Worksheet):
+        """
+        Siembra el contador de IDs y la próxima fila libre leyendo solo la columna ID
+        
+        Los IDs no se renumeran al archivar: el siguiente es el mayor ID de
+        Postulaciones o del archivo + 1, así nunca se repite uno ya usado.
+        """
+        ids = worksheet.col_values(1)
+        self._next_row_number = len(ids) + 1
+        self._next_row_id = max([_parse_row_id(value) for value in ids[1:]]
+                                + [self.get_archive_index().max_id()]) + 1
+    
+    def _verify_appended_ids(self, worksheet: gspread.Worksheet, response: Dict[str, Any],
+                             first_id: int, count: int) -> Optional[int]:
+        """
+        Ubica las filas agregadas con el rango que reporta la API
+        
+        Si otra escritura movió la hoja (las filas no quedaron en la fila esperada)
+        y los IDs del lote chocan con los de otras filas, se reasignan los del lote.
+        
+        Returns:
+            Número de la primera fila agregada (None si la API no lo informó)
+        """
+        updated_range = ((response or {}).get('updates') or {}).get('updatedRange', '')
+        match = re.search(r'[A-Z]+(\d+)(?::[A-Z]+(\d+))?$', updated_range)
+        if not match:
+            self._next_row_id = None  # Sin confirmación: volver a sembrar en el próximo append
+            return None
+        
+        start_row = int(match.group(1))
+        end_row = int(match.group(2) or start_row)
+        
+        if start_row != self._next_row_number:
+            ids = worksheet.col_values(1)
+            others = {_parse_row_id(value) for row_number, value in enumerate(ids[1:], start=2)
+                      if not start_row <= row_number <= end_row}
+            if others & set(range(first_id, first_id + count)):
+                first_id = max(others | {self.get_archive_index().max_id()}) + 1
+                worksheet.update(f"A{start_row}:A{end_row}", [[first_id + i] for i in range(count)])
+                print(f"  ⚠ IDs del lote reasignados desde {first_id} (la hoja cambió durante el append)")
+        
+        self._next_row_id = first_id + count
+        self._next_row_number = end_row + 1
+        return start_row
+    
+    @staticmethod
+    def build_application_row(job: Dict[str, Any], result: Optional[Dict[str, Any]], row_id: int,
+                              timestamp: Optional[str] = None) -> List[Any]:
+        """
+        Construye la fila de Postulaciones para un trabajo
+        
+        Args:
+            job: Datos del trabajo
+            result: Resultado de la aplicación (opcional)
+            row_id: Valor de la columna ID
+            timestamp: Fecha de la aplicación (por defecto, ahora)
+        
+        Returns:
+            Lista de valores en el orden de POSTULACIONES_HEADERS
+        """
+        now = timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
         status = 'PENDIENTE'
         cv_used = 'N/A'
@@ -144,8 +279,8 @@ class GoogleSheetsManager:
                 num_questions = len(result['questions_encountered'])
                 notes += f" | {num_questions} preguntas sin respuesta"
         
-        row = [
-            next_id,
+        return [
+            row_id,
             now,
             job.get('company', 'N/A'),
             job.get('title', 'N/A'),
@@ -158,9 +293,6 @@ class GoogleSheetsManager:
             notes,
             'No' if not result or not result.get('questions_encountered') else 'Sí'
         ]
-        
-        worksheet.append_row(row)
-        print(f"  ✓ Agregado a Google Sheets: {job.get('title')} - {status}")
     
     def update_job_status(self, job_url: str, status: str, notes: str = ""):
         """
@@ -171,90 +303,288 @@ class GoogleSheetsManager:
             status: Nuevo estado
             notes: Notas adicionales
         """
-        worksheet = self.spreadsheet.worksheet('Postulaciones')
-        
-        # Buscar la fila con esta URL
-        try:
-            cell = worksheet.find(job_url)
-            row_number = cell.row
-            
-            # Actualizar estado (columna I = 9)
-            worksheet.update_cell(row_number, 9, status)
-            
-            # Actualizar timestamp (columna J = 10)
-            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            worksheet.update_cell(row_number, 10, now)
-            
-            # Agregar notas si se proporcionan (columna K = 11)
-            if notes:
-                current_notes = worksheet.cell(row_number, 11).value or ""
-                updated_notes = f"{current_notes} | {notes}" if current_notes else notes
-                worksheet.update_cell(row_number, 11, updated_notes)
-            
+        not_found = self.update_job_statuses([{'job_url': job_url, 'status': status, 'notes': notes}])
+        if not_found:
+            print(f"  ✗ Trabajo no encontrado en Google Sheets")
+        else:
             print(f"  ✓ Actualizado en Google Sheets: {status}")
+    
+    def update_job_statuses(self, updates: List[Dict[str, Any]]) -> List[str]:
+        """
+        Actualiza el estado de varios trabajos con un solo batch_update
+        
+        Args:
+            updates: Lista de {'job_url', 'status', 'notes' (opcional)}
+        
+        Returns:
+            URLs que no se encontraron en la hoja
+        """
+        if not updates:
+            return []
+        
+        worksheet = self.get_or_create_worksheet('Postulaciones', headers=POSTULACIONES_HEADERS)
+        index = self._get_row_index(worksheet)
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        
+        # Agrupar por fila: si un trabajo aparece varias veces, las notas se acumulan
+        pending: Dict[int, Dict[str, Any]] = {}
+        not_found = []
+        for update in updates:
+            entry = index.get(extract_job_id_from_url(update['job_url']))
+            if not entry:
+                not_found.append(update['job_url'])
+                continue
             
-        except gspread.CellNotFound:
-            print(f"  ✗ Trabajo no encontrado en Google Sheets")
+            # Notas base: las de una escritura encolada aún no enviada, si la hay
+            notes = entry.get('pending_notes', entry['notes'])
+            row = pending.setdefault(entry['row'], {'entry': entry, 'status': None, 'notes': notes,
+                                                    'notes_changed': False})
+            row['status'] = update['status']
+            if update.get('notes'):
+                row['notes'] = f"{row['notes']} | {update['notes']}" if row['notes'] else update['notes']
+                row['notes_changed'] = True
+        
+        # Columnas I (Estado), J (Último Update) y K (Notas, solo si cambian)
+        for row_number, row in pending.items():
+            if row['notes_changed']:
+                self._coalescer.update(worksheet, f"I{row_number}:K{row_number}", [[row['status'], now, row['notes']]])
+            else:
+                self._coalescer.update(worksheet, f"I{row_number}:J{row_number}", [[row['status'], now]])
+        
+        # Las notas del índice solo cambian cuando la escritura se confirma
+        changed = [(row['entry'], row['notes']) for row in pending.values() if row['notes_changed']]
+        for entry, notes in changed:
+            entry['pending_notes'] = notes
+        
+        def confirm():
+            for entry, notes in changed:
+                entry['notes'] = notes
+                if entry.get('pending_notes') == notes:
+                    del entry['pending_notes']
+        
+        if changed:
+            self._flush_callbacks.setdefault('Postulaciones', []).append(confirm)
+        if pending:
+            self.flush_queued(titles={'Postulaciones'})
+        
+        return not_found
+    
+    def _get_row_index(self, worksheet: gspread.Worksheet) -> Dict[str, Dict[str, Any]]:
+        """Construye (una vez por sesión) el índice Job ID -> fila de Postulaciones"""
+        if self._row_index is None:
+            # Se escribe por número de fila: el espejo debe estar verificado contra la hoja
+            self._row_index = {}
+            for row_number, row in enumerate(self.get_postulaciones_rows(verify=True)[1:], start=2):
+                if row[4]:
+                    self._row_index.setdefault(extract_job_id_from_url(row[4]), {
+                        'row': row_number,
+                        'notes': row[10]
+                    })
+        return self._row_index
+    
+    def reconcile_results(self, jobs: List[Dict[str, Any]], results: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Sincroniza los resultados locales con Postulaciones de forma idempotente
+        
+        Compara por Job ID contra las filas de la hoja y envía solo las diferencias:
+        los trabajos que faltan se agregan en un append y los que cambiaron de
+        estado se actualizan en un batch_update. Los estados de seguimiento manual
+        no se modifican.
+        
+        Args:
+            jobs: Trabajos encontrados (para completar los datos de filas nuevas)
+            results: Resultados de aplicaciones
+        
+        Returns:
+            Conteo de filas agregadas, actualizadas, sin cambios, omitidas y ya archivadas
+        """
+        self.get_or_create_worksheet('Postulaciones', headers=POSTULACIONES_HEADERS)
+        sheet_status = {}
+        for row in self.get_postulaciones_rows(verify=True)[1:]:
+            if row[4]:
+                sheet_status.setdefault(extract_job_id_from_url(row[4]), row[8])
+        archived = self.get_archived_job_ids()
+        
+        jobs_by_id = {extract_job_id_from_url(job['url']): job for job in jobs if job.get('url')}
+        
+        # Si un trabajo tiene varios resultados, vale el último
+        latest: Dict[str, Dict[str, Any]] = {}
+        for result in results:
+            if result.get('job_url'):
+                latest[extract_job_id_from_url(result['job_url'])] = result
+        
+        inserts = []
+        updates = []
+        summary = {'agregadas': 0, 'actualizadas': 0, 'sin_cambios': 0, 'omitidas': 0, 'archivadas': 0}
+        for job_id, result in latest.items():
+            status = result.get('status', 'PENDIENTE')
+            if job_id not in sheet_status and job_id in archived:
+                summary['archivadas'] += 1
+            elif job_id not in sheet_status:
+                job = jobs_by_id.get(job_id) or {
+                    'url': result['job_url'],
+                    'title': result.get('job_title', 'N/A'),
+                    'company': result.get('company', 'N/A')
+                }
+                inserts.append((job, result))
+            elif sheet_status[job_id] == status:
+                summary['sin_cambios'] += 1
+            elif sheet_status[job_id] in AUTOMATION_STATUSES:
+                updates.append({'job_url': result['job_url'], 'status': status})
+            else:
+                summary['omitidas'] += 1
+        
+        if inserts:
+            self.add_job_applications(inserts)
+            summary['agregadas'] = len(inserts)
+        if updates:
+            self.update_job_statuses(updates)
+            summary['actualizadas'] = len(updates)
+        
+        return summary
     
     def add_pending_question(self, question: str, job_url: str):
         """
-        Agrega una pregunta pendiente a la hoja de Preguntas_Pendientes
+        Registra una pregunta pendiente para Preguntas_Pendientes
+        
+        La hoja se lee una sola vez por sesión; las preguntas nuevas quedan en un
+        buffer que se envía con flush_pending_questions().
         
         Args:
             question: Texto de la pregunta
             job_url: URL del trabajo relacionado
         """
         try:
-            worksheet = self.get_or_create_worksheet(
-                'Preguntas_Pendientes',
-                headers=['Fecha', 'Pregunta', 'URL Oferta', 'Estado']
-            )
-            
-            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            known = self._get_question_set()
             
             # Verificar si la pregunta ya existe
-            all_values = worksheet.get_all_values()
-            for row in all_values[1:]:  # Skip header
-                if len(row) > 1 and row[1] == question:  # Pregunta ya existe
-                    return
+            key = self._normalize_question(question)
+            if not key or key in known:
+                return
             
-            row = [
-                now,
+            known.add(key)
+            self._question_buffer.append([
+                datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                 question,
                 job_url,
                 'PENDIENTE'
-            ]
-            
-            worksheet.append_row(row)
-            print(f"  ✓ Pregunta agregada a Google Sheets")
+            ])
         except Exception as e:
             print(f"  ✗ Error agregando pregunta: {str(e)}")
             # No fallar si las preguntas no se pueden agregar
             pass
     
-    def update_dashboard(self):
-        """Verifica/crea el dashboard pero NO lo actualiza (las fórmulas se actualizan solas)"""
+    def flush_pending_questions(self) -> int:
+        """
+        Envía las preguntas nuevas en un solo append_rows
+        
+        Returns:
+            Cantidad de preguntas agregadas
+        """
+        if not self._question_buffer:
+            return 0
+        
         try:
-            # Solo asegurarse que existe la hoja Dashboard
-            # Las fórmulas en Google Sheets se actualizan automáticamente
-            dashboard_ws = self.get_or_create_worksheet(
-                'Dashboard',
-                headers=['Métrica', 'Valor']
-            )
+            worksheet = self.get_or_create_worksheet('Preguntas_Pendientes', headers=PREGUNTAS_HEADERS)
+            self._coalescer.append(worksheet, self._question_buffer)
+            # Solo la hoja de preguntas: lo que otros encolaron sale con su propio flush_queued()
+            self.flush_queued(titles={'Preguntas_Pendientes'})
+            count = len(self._question_buffer)
+            self._question_buffer = []
+            print(f"  ✓ {count} preguntas agregadas a Google Sheets")
+            return count
+        except Exception as e:
+            print(f"  ✗ Error agregando preguntas: {str(e)}")
+            # No fallar si las preguntas no se pueden agregar
+            return 0
+    
+    def _get_question_set(self) -> set:
+        """Carga (una vez por sesión) las preguntas ya registradas, normalizadas"""
+        if self._question_set is None:
+            worksheet = self.get_or_create_worksheet('Preguntas_Pendientes', headers=PREGUNTAS_HEADERS)
+            questions = worksheet.col_values(2)[1:]  # Skip header
+            self._question_set = {self._normalize_question(q) for q in questions if q}
+        return self._question_set
+    
+    @staticmethod
+    def _normalize_question(question: str) -> str:
+        """Minúsculas, espacios colapsados y sin puntuación final"""
+        return ' '.join((question or '').lower().split()).rstrip(' ?:.*')
+    
+    def queue_append(self, title: str, rows: List[List[Any]], headers: List[str] = None):
+        """Encola filas para agregar a una hoja (se envían con flush_queued)"""
+        self._coalescer.append(self.get_or_create_worksheet(title, headers=headers), rows)
+    
+    def queue_update(self, title: str, range_name: str, values: List[List[Any]], headers: List[str] = None):
+        """Encola la escritura de un rango A1 de una hoja (se envía con flush_queued)"""
+        self._coalescer.update(self.get_or_create_worksheet(title, headers=headers), range_name, values)
+    
+    def flush_queued(self, titles: Optional[Set[str]] = None) -> int:
+        """
+        Envía lo encolado: un append_rows y un batch_update por hoja
+        
+        Args:
+            titles: Enviar solo lo encolado para estas hojas (por defecto, todo)
+        
+        Returns:
+            Cantidad de llamadas a la API realizadas
+        """
+        written = self._coalescer.written_titles()
+        writes_postulaciones = 'Postulaciones' in written and (titles is None or 'Postulaciones' in titles)
+        callbacks = []
+        for title in list(self._flush_callbacks):
+            if titles is None or title in titles:
+                callbacks += self._flush_callbacks.pop(title)
+        try:
+            calls = self._coalescer.flush(titles)
+        except Exception:
+            # No se sabe qué llamadas alcanzaron a llegar: el índice (y sus notas
+            # pendientes) se reconstruye desde la hoja en el próximo uso
+            if writes_postulaciones:
+                self._row_index = None
+            raise
+        finally:
+            if writes_postulaciones:
+                self._invalidate_mirror()
+        for confirm in callbacks:
+            confirm()
+        return calls
+    
+    def api_stats(self) -> Dict[str, Any]:
+        """Llamadas, reintentos, errores y espera por cuota de esta sesión"""
+        stats = dict(self.client.stats)
+        stats['espera_cuota_segundos'] = round(stats['espera_cuota_segundos'], 1)
+        return stats
+    
+    def update_dashboard(self, jobs: Optional[List[Dict[str, Any]]] = None):
+        """
+        Recalcula el Dashboard con los datos locales y lo escribe en una sola actualización
+        
+        Las métricas (totales, semanas, estados, tasa de automatización por
+        keyword/CV/empresa y tiempo hasta postular) se calculan con pandas sobre el
+        espejo de Postulaciones y el índice de archivo, en vez de fórmulas COUNTIF
+        sobre columnas completas.
+        
+        Args:
+            jobs: Trabajos de jobs_found.json (aportan keyword y fecha de scraping)
+        """
+        try:
+            rows = self.get_postulaciones_rows(refresh=True)
+            values = compute_dashboard(rows, jobs, archived=self.get_archive_index().entries)
             
-            # NO actualizar/limpiar - dejar que las fórmulas hagan su trabajo
-            # El Dashboard debe tener fórmulas como:
-            # - Total Postulaciones: =COUNTA(Postulaciones!A:A)-1
-            # - Aplicadas esta semana: =COUNTIFS(Postulaciones!B:B,">="&TODAY()-7)
-            # - En Revisión: =COUNTIF(Postulaciones!I:I,"EN_REVISION")
-            # - Entrevistas: =COUNTIF(Postulaciones!I:I,"ENTREVISTA")
-            # - Rechazadas: =COUNTIF(Postulaciones!I:I,"RECHAZADO")
-            # - Tasa de Respuesta: =IF(B2>0,B4/B2*100,0)&"%"
+            dashboard_ws = self.get_or_create_worksheet('Dashboard', headers=['Métrica', 'Valor'])
             
-            print(f"  ✓ Dashboard verificado (las fórmulas se actualizan automáticamente)")
+            # Bloque de ancho fijo rellenado hasta el final de la hoja: limpia lo que
+            # quede de un dashboard anterior más largo sin una llamada extra
+            height = max(dashboard_ws.row_count, len(values))
+            values += [[''] * DASHBOARD_COLUMNS] * (height - len(values))
+            self.queue_update('Dashboard', f"A1:{chr(ord('A') + DASHBOARD_COLUMNS - 1)}{height}", values)
+            self.flush_queued(titles={'Dashboard'})
+            
+            print(f"  ✓ Dashboard actualizado ({len(rows) - 1} postulaciones)")
         except Exception as e:
-            print(f"  ✗ Error verificando dashboard: {str(e)}")
-            # No fallar si el dashboard no se puede verificar
+            print(f"  ✗ Error actualizando dashboard: {str(e)}")
+            # No fallar si el dashboard no se puede actualizar
             pass
     
     def get_all_applied_urls(self) -> set:
@@ -265,13 +595,12 @@ class GoogleSheetsManager:
             Set de URLs
         """
         try:
-            worksheet = self.spreadsheet.worksheet('Postulaciones')
-            all_data = worksheet.get_all_values()[1:]  # Skip header
+            all_data = self.get_postulaciones_rows()[1:]  # Skip header
             
-            # Columna E (índice 4) tiene las URLs
+            # Columna E (índice 4) tiene las URLs; se suman las archivadas
             urls = {row[4] for row in all_data if len(row) > 4 and row[4]}
             
-            return urls
+            return urls | self.get_archive_index().urls()
         except gspread.WorksheetNotFound:
             return set()
     
@@ -283,12 +612,11 @@ class GoogleSheetsManager:
             Lista de diccionarios con los trabajos
         """
         try:
-            worksheet = self.spreadsheet.worksheet('Postulaciones')
-            all_data = worksheet.get_all_values()[1:]  # Skip header
+            all_data = self.get_postulaciones_rows()[1:]  # Skip header
             
             jobs = []
             for row in all_data:
-                if len(row) > 4:  # Asegurar que hay suficientes columnas
+                if len(row) > 4 and row[4]:  # Asegurar que hay suficientes columnas
                     job = {
                         'title': row[3] if len(row) > 3 else 'N/A',
                         'company': row[2] if len(row) > 2 else 'N/A',
@@ -302,12 +630,102 @@ class GoogleSheetsManager:
             return jobs
         except gspread.WorksheetNotFound:
             return []
+    
+    def get_archive_index(self) -> ArchiveIndex:
+        """
+        Índice local de postulaciones archivadas
+        
+        Si no existe el archivo local (ej: contenedor nuevo) se reconstruye con una
+        sola lectura de las hojas Archivo_*.
+        """
+        if self._archive_index is None:
+            index = ArchiveIndex()
+            if not index.exists:
+                titles = [title for title in self._session.titles() if title.startswith(ARCHIVE_PREFIX)]
+                index.rebuild(self.spreadsheet, titles)
+                if titles:
+                    print(f"✓ Índice de archivo reconstruido ({len(index)} postulaciones)")
+            self._archive_index = index
+        return self._archive_index
+    
+    def get_archived_job_ids(self) -> set:
+        """Job IDs de las postulaciones archivadas (para deduplicar)"""
+        return self.get_archive_index().job_ids()
+    
+    def delete_postulaciones_rows(self, row_numbers: List[int]):
+        """
+        Borra filas de Postulaciones
+        
+        Los rangos contiguos se borran juntos, de abajo hacia arriba, en un solo
+        batch_update. Los IDs de las filas restantes no cambian.
+        
+        Args:
+            row_numbers: Números de fila (1 = header)
+        """
+        if not row_numbers:
+            return
+        
+        worksheet = self.get_or_create_worksheet('Postulaciones', headers=POSTULACIONES_HEADERS)
+        rows = self.get_postulaciones_rows(verify=True)
+        deleted = set(row_numbers)
+        
+        # Agrupar en rangos contiguos [inicio, fin] ordenados de abajo hacia arriba
+        ranges: List[List[int]] = []
+        for row_number in sorted(deleted, reverse=True):
+            if ranges and ranges[-1][0] == row_number + 1:
+                ranges[-1][0] = row_number
+            else:
+                ranges.append([row_number, row_number])
+        
+        self.spreadsheet.batch_update({'requests': [
+            {'deleteDimension': {'range': {
+                'sheetId': worksheet.id,
+                'dimension': 'ROWS',
+                'startIndex': start - 1,
+                'endIndex': end
+            }}}
+            for start, end in ranges
+        ]})
+        
+        remaining = [row for row_number, row in enumerate(rows, start=1) if row_number not in deleted]
+        
+        # Espejo local al día sin volver a descargar la hoja; el índice de filas se recalcula
+        SheetsMirror(worksheet).replace_rows(remaining)
+        self._mirror_rows = remaining
+        self._row_index = None
+        if self._next_row_number is not None:
+            self._next_row_number = len(remaining) + 1
+    
+    def get_postulaciones_rows(self, verify: bool = False, refresh: bool = False) -> List[List[str]]:
+        """
+        Filas de Postulaciones (con header) desde el espejo local
+        
+        El espejo se sincroniza una vez por sesión leyendo solo las filas nuevas
+        (ver SheetsMirror); la hoja completa solo se descarga si hubo ediciones
+        que no se pueden parchar.
+        
+        Args:
+            verify: Verificar ediciones/borrados aunque no corresponda todavía
+                (necesario antes de escribir por número de fila)
+            refresh: Volver a leer las filas agregadas durante esta sesión
+        """
+        if self._mirror_rows is None or refresh or (verify and not self._mirror_verified):
+            worksheet = self._session.worksheet('Postulaciones')
+            self._mirror_rows = SheetsMirror(worksheet).sync(force_verify=verify)
+            self._mirror_verified = self._mirror_verified or verify
+        return self._mirror_rows
+    
+    def _invalidate_mirror(self):
+        """Marca el espejo como desactualizado después de escribir en Postulaciones"""
+        self._mirror_rows = None
+        self._mirror_verified = False
 
 
 def main():
     """Función de prueba"""
     import json
     from utils import Config
+    from sheets_archive import SheetsArchiver
     
     print("📊 Google Sheets Manager - Prueba")
     print("=" * 60)
@@ -343,27 +761,39 @@ def main():
     with open(jobs_file, 'r', encoding='utf-8') as f:
         jobs = json.load(f)
     
-    # Crear diccionario de resultados por URL
-    results_by_url = {r['job_url']: r for r in results}
+    print(f"\n📤 Sincronizando {len(results)} resultados con Google Sheets...")
     
-    print(f"\n📤 Subiendo {len(results)} resultados a Google Sheets...")
+    # Solo se envían las diferencias con la hoja (agregar/actualizar)
+    summary = manager.reconcile_results(jobs, results)
+    print(f"  ✓ {summary['agregadas']} agregadas, {summary['actualizadas']} actualizadas, "
+          f"{summary['sin_cambios']} sin cambios, {summary['omitidas']} con estado manual, "
+          f"{summary['archivadas']} ya archivadas")
     
-    # Subir cada resultado
-    for job in jobs:
-        if job['url'] in results_by_url:
-            result = results_by_url[job['url']]
-            manager.add_job_application(job, result)
-            
-            # Agregar preguntas pendientes
-            if result.get('questions_encountered'):
-                for question in result['questions_encountered']:
-                    manager.add_pending_question(question, job['url'])
-            
-            time.sleep(1)  # Rate limiting
+    # Mover filas cerradas y antiguas a las hojas de archivo (mantiene Postulaciones chica)
+    yaml_config = config.load_yaml_config()
+    if (yaml_config.get('archivo') or {}).get('activo', False):
+        print("\n🗄  Archivando postulaciones cerradas...")
+        try:
+            SheetsArchiver.from_config(yaml_config, manager).archive()
+        except Exception as e:
+            print(f"  ✗ Error archivando postulaciones: {str(e)}")
+            # No fallar: las filas se archivan en la próxima sincronización
+    
+    # Agregar preguntas pendientes (el registro ya deduplica las existentes)
+    for result in results:
+        for question in result.get('questions_encountered') or []:
+            manager.add_pending_question(question, result['job_url'])
+    
+    # Enviar las preguntas nuevas en una sola escritura
+    manager.flush_pending_questions()
     
     # Actualizar dashboard
     print("\n📊 Actualizando dashboard...")
-    manager.update_dashboard()
+    manager.update_dashboard(jobs)
+    
+    stats = manager.api_stats()
+    print(f"\n📈 API de Sheets: {stats['llamadas']} llamadas, {stats['reintentos']} reintentos, "
+          f"{stats['errores']} errores, {stats['espera_cuota_segundos']}s de espera por cuota")
     
     print("\n✅ Proceso completado")
     print(f"🔗 Ver en: https://docs.google.com/spreadsheets/d/{sheets_id}")
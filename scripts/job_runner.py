@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+Job Runner
+Cola de ejecuciones del runner: IDs de trabajo, cola acotada, concurrencia por
+tipo, historial consultable, webhooks de término y salida en vivo por líneas
+"""
+
+import json
+import os
+import subprocess
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Callable, Iterator, Tuple
+
+import requests
+
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+
+FINISHED_STATES = {SUCCEEDED, FAILED}
+
+WEBHOOK_RETRIES = 3
+WEBHOOK_TIMEOUT_SECONDS = 10
+
+# Memoria por trabajo acotada: últimas líneas para seguir en vivo y cola de
+# cada stream para el resultado (la salida completa queda en <id>.log)
+RING_LINES = 1000
+TAIL_LINES = 200
+
+STDOUT = 'stdout'
+STDERR = 'stderr'
+STDERR_PREFIX = '[stderr] '
+
+
+def read_log_lines(log_file: Path, since: int = 0, until: Optional[int] = None) -> Iterator[Tuple[int, str, str]]:
+    """Líneas (secuencia, stream, texto) del log en disco con since < secuencia <= until"""
+    with open(log_file, 'r', encoding='utf-8') as f:
+        for seq, line in enumerate(f, start=1):
+            if until is not None and seq > until:
+                return
+            if seq > since:
+                if line.startswith(STDERR_PREFIX):
+                    yield seq, STDERR, line[len(STDERR_PREFIX):]
+                else:
+                    yield seq, STDOUT, line
+
+
+class QueueFullError(Exception):
+    """La cola de ejecuciones alcanzó su máximo"""
+    pass
+
+
+class Job:
+    """Una ejecución encolada de un comando del runner"""
+
+    def __init__(self, name: str, job_type: str, cmd: str, webhook: Optional[str] = None):
+        self.id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.type = job_type
+        self.cmd = cmd
+        self.webhook = webhook
+        self.status = QUEUED
+        self.created_at = datetime.now()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.returncode: Optional[int] = None
+        self.error: Optional[str] = None
+        self.done = threading.Event()
+
+        # Arranque: 'warm' (forkserver con dependencias precargadas) o 'cold' (subprocess)
+        self.mode: Optional[str] = None
+        self.startup_ms: Optional[float] = None
+        self.first_output_ms: Optional[float] = None
+        self._launched_at: Optional[float] = None
+
+        # Salida: anillo de (secuencia, stream, línea) + colas por stream
+        self.lines: deque = deque(maxlen=RING_LINES)
+        self.line_count = 0
+        self.tails = {STDOUT: deque(maxlen=TAIL_LINES), STDERR: deque(maxlen=TAIL_LINES)}
+        self.log_file: Optional[Path] = None
+        self._log_handle = None
+        self._cond = threading.Condition()
+
+    def open_log(self, path: Path):
+        """Abre el log en disco: la línea N del archivo es la línea con secuencia N"""
+        self.log_file = path
+        self._log_handle = open(path, 'w', encoding='utf-8')
+
+    def close_log(self):
+        with self._cond:
+            if self._log_handle:
+                self._log_handle.close()
+                self._log_handle = None
+
+    def add_line(self, stream: str, line: str):
+        """Registra una línea de salida y despierta a quienes siguen el trabajo"""
+        if not line.endswith('\n'):
+            line += '\n'
+        with self._cond:
+            if self.first_output_ms is None and self._launched_at is not None:
+                self.first_output_ms = round((time.monotonic() - self._launched_at) * 1000, 1)
+            self.line_count += 1
+            self.lines.append((self.line_count, stream, line))
+            self.tails[stream].append(line)
+            if self._log_handle:
+                self._log_handle.write(line if stream == STDOUT else f"{STDERR_PREFIX}{line}")
+                self._log_handle.flush()
+            self._cond.notify_all()
+
+    def lines_after(self, seq: int, timeout: float) -> Tuple[List[Tuple[int, str, str]], int]:
+        """
+        Líneas con secuencia mayor a seq (espera hasta timeout si no hay)
+
+        Returns:
+            (líneas, cantidad de líneas que ya salieron del anillo y se perdieron)
+        """
+        with self._cond:
+            if self.line_count <= seq and not self.done.is_set():
+                self._cond.wait(timeout)
+            pending = [entry for entry in self.lines if entry[0] > seq]
+            skipped = (pending[0][0] - seq - 1) if pending else max(self.line_count - seq, 0)
+            return pending, skipped
+
+    def finish(self):
+        with self._cond:
+            self.done.set()
+            self._cond.notify_all()
+
+    @property
+    def stdout(self) -> str:
+        return ''.join(self.tails[STDOUT])
+
+    @property
+    def stderr(self) -> str:
+        return ''.join(self.tails[STDERR])
+
+    @property
+    def duration_seconds(self) -> Optional[float]:
+        if not self.started_at:
+            return None
+        end = self.finished_at or datetime.now()
+        return round((end - self.started_at).total_seconds(), 2)
+
+    def to_dict(self, include_output: bool = True) -> Dict[str, Any]:
+        data = {
+            'job_id': self.id,
+            'name': self.name,
+            'type': self.type,
+            'cmd': self.cmd,
+            'status': self.status,
+            'created_at': self.created_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'duration_seconds': self.duration_seconds,
+            'returncode': self.returncode,
+            'error': self.error,
+            'webhook': self.webhook,
+            'mode': self.mode,
+            'startup_ms': self.startup_ms,
+            'first_output_ms': self.first_output_ms,
+            'lines': self.line_count,
+            'log_file': str(self.log_file) if self.log_file else None
+        }
+        if include_output:
+            data['stdout'] = self.stdout
+            data['stderr'] = self.stderr
+        return data
+
+
+class JobManager:
+    """
+    Ejecuta comandos en threads con cola acotada y límite de concurrencia por tipo
+
+    Cada trabajo recibe un ID y queda consultable mientras está en cola, en
+    ejecución y después de terminar (los terminados se guardan en disco, así
+    un reinicio del runner no pierde resultados).
+    """
+
+    def __init__(self, jobs_dir: str = "data/logs/runner_jobs", max_queue: int = 20,
+                 concurrency: Optional[Dict[str, int]] = None, history: int = 200,
+                 cwd: Optional[str] = None, log: Callable[[str], None] = print,
+                 worker_pool=None):
+        """
+        Args:
+            jobs_dir: Directorio con el resultado de cada trabajo terminado
+            max_queue: Trabajos en cola (sin empezar) como máximo
+            concurrency: Máximo de trabajos simultáneos por tipo (por defecto 1)
+            history: Trabajos terminados que se mantienen en memoria
+            cwd: Directorio de trabajo de los comandos
+            log: Función de log del runner
+            worker_pool: WorkerPool para los comandos `python script.py` (None = siempre subprocess)
+        """
+        self.jobs_dir = Path(jobs_dir)
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        self.max_queue = max_queue
+        self.concurrency = concurrency or {}
+        self.history = history
+        self.cwd = cwd
+        self.log = log
+        self.worker_pool = worker_pool
+
+        self._lock = threading.Lock()
+        self._jobs: 'OrderedDict[str, Job]' = OrderedDict()
+        self._pending: deque = deque()
+        self._running: Dict[str, int] = {}
+
+    def submit(self, name: str, cmd: str, job_type: Optional[str] = None,
+               webhook: Optional[str] = None) -> Job:
+        """
+        Encola un comando
+
+        Raises:
+            QueueFullError: Si ya hay max_queue trabajos esperando
+        """
+        job = Job(name, job_type or name, cmd, webhook)
+        with self._lock:
+            if len(self._pending) >= self.max_queue:
+                raise QueueFullError(f"cola llena ({self.max_queue} trabajos en espera)")
+            self._jobs[job.id] = job
+            self._pending.append(job)
+        self.log(f"Trabajo {job.id} encolado: {name}")
+        self._dispatch()
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Estado/resultado de un trabajo (en memoria o, si ya salió del historial, en disco)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job:
+            return job.to_dict()
+        job_file = self.jobs_dir / f"{job_id}.json"
+        if job_id.isalnum() and job_file.exists():
+            with open(job_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return None
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Espera a que un trabajo termine y devuelve su resultado"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job:
+            job.done.wait(timeout)
+        return self.get(job_id)
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Trabajos en memoria, del más reciente al más antiguo (sin salida)"""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return [job.to_dict(include_output=False) for job in reversed(jobs)]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'queued': len(self._pending), 'running': dict(self._running), 'max_queue': self.max_queue}
+
+    def _dispatch(self):
+        """Arranca los trabajos en cola cuyo tipo tenga cupo (FIFO por tipo)"""
+        to_start = []
+        with self._lock:
+            for job in list(self._pending):
+                if self._running.get(job.type, 0) < self.concurrency.get(job.type, 1):
+                    self._pending.remove(job)
+                    self._running[job.type] = self._running.get(job.type, 0) + 1
+                    job.status = RUNNING
+                    job.started_at = datetime.now()
+                    to_start.append(job)
+        for job in to_start:
+            threading.Thread(target=self._run, args=(job,), name=f"job-{job.id}", daemon=True).start()
+
+    def _launch(self, job: Job):
+        """Inicia el proceso: tibio desde el worker pool si se puede, si no subprocess"""
+        entry = self.worker_pool.entry_point(job.cmd) if self.worker_pool else None
+        job._launched_at = time.monotonic()
+        if entry:
+            job.mode = 'warm'
+            process = self.worker_pool.launch(*entry)
+            job.startup_ms = process.startup_ms
+        else:
+            job.mode = 'cold'
+            process = subprocess.Popen(
+                job.cmd, shell=True, cwd=self.cwd, text=True, bufsize=1,
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                env={**os.environ, 'PYTHONUNBUFFERED': '1'}
+            )
+        self.log(f"Trabajo {job.id} en marcha ({job.mode}, pid {process.pid}"
+                 + (f", arranque {job.startup_ms} ms)" if job.startup_ms is not None else ")"))
+        return process
+
+    def _run(self, job: Job):
+        """Ejecuta el comando leyendo stdout/stderr línea a línea (memoria constante)"""
+        self.log(f"Trabajo {job.id} iniciado: {job.cmd}")
+        try:
+            job.open_log(self.jobs_dir / f"{job.id}.log")
+            process = self._launch(job)
+
+            def pump(pipe, stream: str):
+                for line in pipe:
+                    job.add_line(stream, line)
+                pipe.close()
+
+            readers = [
+                threading.Thread(target=pump, args=(process.stdout, STDOUT), daemon=True),
+                threading.Thread(target=pump, args=(process.stderr, STDERR), daemon=True)
+            ]
+            for reader in readers:
+                reader.start()
+            job.returncode = process.wait()
+            for reader in readers:
+                reader.join()
+        except Exception as e:
+            job.returncode = 1
+            job.error = str(e)
+            job.add_line(STDERR, str(e))
+        finally:
+            job.close_log()
+        self._finish(job)
+
+    def follow(self, job_id: str, since: int = 0, heartbeat: float = 15) -> Iterator[Tuple[str, Any]]:
+        """
+        Sigue la salida de un trabajo
+
+        Yields:
+            ('line', (seq, stream, línea)), ('heartbeat', None) y al final
+            ('end', resultado). Las líneas que ya salieron del anillo en memoria
+            (lector lento o trabajo terminado) se leen del log en disco.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+
+        if job is None:
+            result = self.get(job_id)
+            if result is None:
+                return
+            log_file = Path(result.get('log_file') or '')
+            if log_file.is_file():
+                for entry in read_log_lines(log_file, since):
+                    yield 'line', entry
+            yield 'end', result
+            return
+
+        seq = since
+        while True:
+            finished = job.done.is_set()
+            lines, skipped = job.lines_after(seq, heartbeat)
+            if skipped and job.log_file:
+                for entry in read_log_lines(job.log_file, seq, seq + skipped):
+                    yield 'line', entry
+            for entry in lines:
+                yield 'line', entry
+            if lines:
+                seq = lines[-1][0]
+            elif skipped:
+                seq += skipped
+            elif finished:
+                yield 'end', job.to_dict(include_output=False)
+                return
+            else:
+                yield 'heartbeat', None
+
+    def _finish(self, job: Job):
+        job.finished_at = datetime.now()
+        job.status = SUCCEEDED if job.returncode == 0 else FAILED
+        self.log(f"Trabajo {job.id} terminado: {job.status} (returncode={job.returncode}, "
+                 f"{job.duration_seconds}s, {job.line_count} líneas en {job.log_file})")
+
+        self._save(job)
+        with self._lock:
+            self._running[job.type] -= 1
+            self._trim_history()
+        job.finish()
+        self._dispatch()
+
+        if job.webhook:
+            self._notify(job)
+
+    def _trim_history(self):
+        """Saca de memoria los terminados más antiguos (quedan en disco)"""
+        finished = [job_id for job_id, job in self._jobs.items() if job.status in FINISHED_STATES]
+        for job_id in finished[:max(len(finished) - self.history, 0)]:
+            del self._jobs[job_id]
+
+    def _save(self, job: Job):
+        job_file = self.jobs_dir / f"{job.id}.json"
+        tmp_file = job_file.with_suffix('.json.tmp')
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(job.to_dict(), f, ensure_ascii=False)
+            os.replace(tmp_file, job_file)
+        except OSError as e:
+            self.log(f"No se pudo guardar el trabajo {job.id}: {e}")
+
+    def _notify(self, job: Job):
+        """POST del resultado (sin salida completa) al webhook, con reintentos"""
+        payload = job.to_dict(include_output=False)
+        payload['stdout_tail'] = ''.join(list(job.tails[STDOUT])[-20:])
+        payload['stderr_tail'] = ''.join(list(job.tails[STDERR])[-20:])
+        for attempt in range(1, WEBHOOK_RETRIES + 1):
+            try:
+                response = requests.post(job.webhook, json=payload, timeout=WEBHOOK_TIMEOUT_SECONDS)
+                response.raise_for_status()
+                self.log(f"Webhook del trabajo {job.id} notificado")
+                return
+            except requests.RequestException as e:
+                self.log(f"Webhook del trabajo {job.id} falló (intento {attempt}): {e}")
+                if attempt < WEBHOOK_RETRIES:
+                    time.sleep(2 ** attempt)
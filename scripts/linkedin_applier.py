@@ -6,15 +6,26 @@ Aplica automáticamente a trabajos con Easy Apply
 
 import time
 import json
+import os
+import re
+import unicodedata
+import argparse
+import threading
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from selenium.webdriver.common.keys import Keys
 
-from utils import Config, Logger, select_cv_by_keywords
+from utils import Config, Logger, get_cv_classifier, extract_job_id_from_url, find_configured_answer
+from debug_artifacts import DebugArtifactWriter
+from run_checkpoint import ApplyCheckpoint
+from apply_queue import ApplyQueue
+from run_controller import RunController, JobContext, JobDeadlineExceeded
+from retry_queue import RetryQueue
+from sheets_writer import SheetsBatchWriter
+from metrics import PhaseTimer
 
 # Optional: Telegram notifier (graceful if env not configured)
 try:
@@ -23,10 +34,151 @@ except Exception:
     TelegramNotifier = None
 
 
+# Selectores del botón Easy Apply, en orden de prioridad (incluye <a> tags)
+EASY_APPLY_SELECTORS = [
+    # Botones tradicionales
+    "button.jobs-apply-button",
+    "button[aria-label*='Solicitud sencilla']",
+    "button[aria-label*='Easy Apply']",
+    "button#jobs-apply-button-id",
+    "button[data-live-test-job-apply-button]",
+    # Links que funcionan como botones (caso común en LinkedIn)
+    "a[aria-label*='Solicitud sencilla']",
+    "a[aria-label*='Easy Apply']",
+    "a.jobs-apply-button"
+]
+
+# Selectores del modal de postulación
+MODAL_SELECTORS = [
+    "div[data-test-modal-id='easy-apply-modal']",
+    "div.jobs-easy-apply-modal",
+    "div[role='dialog'][aria-labelledby*='apply']"
+]
+
+# Presupuesto total (segundos) para encontrar el botón Easy Apply y el modal
+DISCOVERY_TIMEOUT_SECONDS = 10
+
+# Devuelve [elemento, índice del selector] para el primer selector (en orden
+# de prioridad) que tenga coincidencias, o null si ninguno coincide todavía.
+# Evaluar todos los candidatos en una sola llamada evita una espera por selector.
+FIND_FIRST_MATCH_JS = """
+const selectors = arguments[0];
+const requireVisible = arguments[1];
+for (let i = 0; i < selectors.length; i++) {
+    const elements = document.querySelectorAll(selectors[i]);
+    for (const el of elements) {
+        if (!requireVisible || el.getClientRects().length > 0) {
+            return [el, i];
+        }
+    }
+}
+return null;
+"""
+
+# Selectores de botones de acción del formulario, en orden de prioridad.
+# El último (primario genérico) solo se busca dentro del modal.
+ACTION_BUTTON_SELECTORS = [
+    "button[aria-label*='Enviar']",
+    "button[aria-label*='Submit']",
+    "button[aria-label*='Send']",
+    "button[aria-label*='Continuar']",
+    "button[aria-label*='siguiente']",
+    "button[aria-label*='Next']",
+    "button[aria-label*='Siguiente']",
+    "button[data-easy-apply-next-button]",
+    "button[aria-label*='Review']",
+    "button[aria-label*='Revisar']",
+    "button.artdeco-button--primary"
+]
+
+# Resuelve en una sola llamada el botón de acción del paso actual: busca
+# dentro del modal, filtra visibles/habilitados y clasifica el botón como
+# 'submit', 'review' o 'next' junto con su texto y aria-label.
+RESOLVE_ACTION_BUTTON_JS = """
+const modalSelectors = arguments[0];
+const buttonSelectors = arguments[1];
+let root = null;
+for (const sel of modalSelectors) {
+    const candidate = document.querySelector(sel);
+    if (candidate && candidate.getClientRects().length > 0) { root = candidate; break; }
+}
+const genericSelector = buttonSelectors[buttonSelectors.length - 1];
+const scope = root || document;
+for (const sel of buttonSelectors) {
+    if (!root && sel === genericSelector) { continue; }
+    for (const btn of scope.querySelectorAll(sel)) {
+        if (btn.disabled || btn.getClientRects().length === 0) { continue; }
+        if (window.getComputedStyle(btn).visibility === 'hidden') { continue; }
+        const ariaLabel = btn.getAttribute('aria-label') || '';
+        const label = (btn.innerText || '').trim() || ariaLabel;
+        const context = (label + ' ' + ariaLabel).toLowerCase();
+        let kind = 'next';
+        if (['enviar', 'submit', 'send application'].some(w => context.includes(w))) {
+            kind = 'submit';
+        } else if (['review', 'revisar'].some(w => context.includes(w))) {
+            kind = 'review';
+        }
+        return {element: btn, kind: kind, label: label, aria_label: ariaLabel, selector: sel};
+    }
+}
+return null;
+"""
+
+# Inspecciona la sección de documentos del modal en una sola llamada:
+# - CVs ya subidos a LinkedIn (nombre y si están seleccionados)
+# - inputs de archivo clasificados como 'resume', 'cover_letter' o 'unknown'
+INSPECT_DOCUMENT_UPLOADS_JS = """
+const modalSelectors = arguments[0];
+let root = document;
+for (const sel of modalSelectors) {
+    const candidate = document.querySelector(sel);
+    if (candidate && candidate.getClientRects().length > 0) { root = candidate; break; }
+}
+const resumes = [];
+const cards = root.querySelectorAll(
+    '.jobs-document-upload-redesign-card__container, .jobs-resume-picker__resume, [data-test-document-upload-card]'
+);
+for (const card of cards) {
+    const nameEl = card.querySelector(
+        '.jobs-document-upload-redesign-card__file-name, .jobs-resume-picker__resume-label, h3'
+    );
+    const radio = card.querySelector('input[type="radio"]');
+    const selected = card.className.includes('--selected')
+        || card.getAttribute('aria-checked') === 'true'
+        || card.getAttribute('aria-selected') === 'true'
+        || (radio !== null && radio.checked);
+    resumes.push({
+        element: radio || card,
+        name: ((nameEl && nameEl.innerText) || card.innerText || '').trim(),
+        selected: selected
+    });
+}
+const inputs = [];
+for (const input of root.querySelectorAll('input[type="file"]')) {
+    const label = input.id ? root.querySelector('label[for="' + input.id + '"]') : null;
+    const container = input.closest('div[data-test-form-element], .jobs-document-upload, section, div');
+    const context = [
+        input.id, input.name, input.getAttribute('aria-label') || '',
+        label ? label.innerText : '', container ? (container.innerText || '').slice(0, 200) : ''
+    ].join(' ').toLowerCase();
+    let kind = 'unknown';
+    if (context.includes('cover') || context.includes('carta')) {
+        kind = 'cover_letter';
+    } else if (['resume', 'currículum', 'curriculum', ' cv', 'cv ', 'hoja de vida'].some(w => context.includes(w))) {
+        kind = 'resume';
+    }
+    inputs.push({element: input, kind: kind});
+}
+return {resumes: resumes, file_inputs: inputs};
+"""
+
+
 class LinkedInApplier:
     """Aplicador automático a trabajos de LinkedIn"""
     
     def __init__(self, driver, config: Config, logger: Logger):
+        # Estado del intento en curso (contexto, driver y Job ID), propio de cada thread
+        self._local = threading.local()
         self.driver = driver
         self.config = config
         self.logger = logger
@@ -34,19 +186,84 @@ class LinkedInApplier:
         # Cargar respuestas configuradas
         self.answers = config.load_json_config('respuestas_comunes.json')
         
-        # Cargar rutas de CVs
+        # Cargar rutas de CVs y clasificador (compilado una vez)
         self.cv_paths = config.get_cv_paths()
+        self.cv_classifier = get_cv_classifier(config)
+        
+        # Artefactos de debug (screenshots + DOM) escritos en segundo plano
+        self.artifacts = DebugArtifactWriter.from_config(config.load_yaml_config(), logger)
+        
+        # Checkpoint de la ejecución (opcional, lo asigna main)
+        self.checkpoint: Optional[ApplyCheckpoint] = None
+        
+        # Trabajos (URL) a los que ya se subió el CV en el intento actual, para no
+        # subirlo en cada paso (se limpia al empezar cada intento)
+        self._uploaded_cv_jobs = set()
+        
+        # Spans de tiempo por fase (se exportan al final de la ejecución)
+        self.timer = PhaseTimer()
     
-    def apply_to_job(self, job: Dict[str, Any]) -> Dict[str, Any]:
+    @property
+    def driver(self):
+        """
+        Driver del intento en curso en este thread
+        
+        Un trabajo abandonado por el watchdog conserva el driver con que empezó:
+        no puede manejar el navegador nuevo que lo reemplazó.
+        """
+        return getattr(self._local, 'driver', None) or self._driver
+    
+    @driver.setter
+    def driver(self, driver):
+        self._driver = driver
+    
+    @property
+    def job_context(self) -> Optional[JobContext]:
+        """Contexto (deadline + cancelación) del intento en curso en este thread"""
+        return getattr(self._local, 'context', None)
+    
+    @property
+    def _job_id(self) -> Optional[str]:
+        return getattr(self._local, 'job_id', None)
+    
+    def check_deadline(self):
+        """Lanza JobDeadlineExceeded (o JobAbandoned) si el trabajo actual ya no debe seguir"""
+        if self.job_context is not None:
+            self.job_context.check()
+    
+    def bounded_timeout(self, timeout: float) -> float:
+        """Limita una espera a lo que le queda al trabajo actual"""
+        if self.job_context is None:
+            return timeout
+        return max(min(timeout, self.job_context.deadline - time.monotonic()), 0.5)
+    
+    def capture_artifacts(self, job: Dict[str, Any], reason: str) -> Optional[str]:
+        """Screenshot + DOM del trabajo (nada si el watchdog ya abandonó el intento)"""
+        if self.job_context is not None and self.job_context.cancelled.is_set():
+            return None
+        return self.artifacts.capture(self.driver, job, reason)
+    
+    def apply_to_job(self, job: Dict[str, Any], context: Optional[JobContext] = None) -> Dict[str, Any]:
         """
         Aplica a un trabajo específico
         
         Args:
             job: Diccionario con datos del trabajo
+            context: Deadline y cancelación del intento (lo crea el RunController)
         
         Returns:
             Diccionario con resultado de la aplicación
         """
+        self._local.context = context
+        self._local.driver = self._driver
+        self._local.job_id = extract_job_id_from_url(job['url'])
+        # Un reintento empieza un formulario nuevo: el CV se vuelve a subir
+        self._uploaded_cv_jobs.discard(job['url'])
+        with self.timer.span('job_total', self._job_id):
+            return self._apply_to_job(job)
+    
+    def _apply_to_job(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Cuerpo de apply_to_job (medido como 'job_total')"""
         self.logger.info(f"\n{'='*60}")
         self.logger.info(f"Aplicando a: {job['title']} - {job['company']}")
         self.logger.info(f"{'='*60}")
@@ -64,15 +281,19 @@ class LinkedInApplier:
         
         try:
             # Ir a la página del trabajo
-            self.driver.get(job['url'])
+            with self.timer.span('page_load', self._job_id):
+                self.driver.get(job['url'])
             self.logger.info(f"  Cargando página del trabajo...")
-            time.sleep(5)  # Aumentar tiempo de espera
-            
-            # Scroll para asegurar que el botón esté visible
-            self.driver.execute_script("window.scrollTo(0, 300);")
-            time.sleep(1)
+            with self.timer.span('page_settle', self._job_id):
+                time.sleep(5)  # Aumentar tiempo de espera
+                
+                # Scroll para asegurar que el botón esté visible
+                self.driver.execute_script("window.scrollTo(0, 300);")
+                time.sleep(1)
+            self.check_deadline()
             
             # Verificar si el trabajo ya no acepta postulaciones (eliminado/cerrado)
+            closed_check_start = time.perf_counter()
             try:
                 # Buscar indicadores de trabajo cerrado
                 closed_indicators = [
@@ -87,6 +308,8 @@ class LinkedInApplier:
                 page_text = self.driver.find_element(By.TAG_NAME, "body").text
                 is_closed = any(indicator.lower() in page_text.lower() for indicator in closed_indicators)
                 
+                self.timer.record('closed_check', time.perf_counter() - closed_check_start, self._job_id)
+                
                 if is_closed:
                     result['error'] = "Trabajo ya no acepta postulaciones (eliminado/cerrado)"
                     result['status'] = 'ELIMINADO'
@@ -95,31 +318,13 @@ class LinkedInApplier:
             except Exception:
                 pass  # Continuar si no se puede verificar
             
-            # Buscar botón Easy Apply con múltiples selectores (incluyendo <a> tags)
-            easy_apply_button = None
-            selectors = [
-                # Botones tradicionales
-                "button.jobs-apply-button",
-                "button[aria-label*='Solicitud sencilla']",
-                "button[aria-label*='Easy Apply']",
-                "button#jobs-apply-button-id",
-                "button[data-live-test-job-apply-button]",
-                # Links que funcionan como botones (caso común en LinkedIn)
-                "a[aria-label*='Solicitud sencilla']",
-                "a[aria-label*='Easy Apply']",
-                "a.jobs-apply-button"
-            ]
-            
-            for selector in selectors:
-                try:
-                    easy_apply_button = WebDriverWait(self.driver, 5).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                    )
-                    if easy_apply_button:
-                        self.logger.info(f"  ✓ Botón Easy Apply encontrado con: {selector}")
-                        break
-                except TimeoutException:
-                    continue
+            # Buscar botón Easy Apply: una sola espera sobre todos los selectores
+            discovery_start = time.monotonic()
+            easy_apply_button, matched_selector = self.wait_for_first_match(
+                EASY_APPLY_SELECTORS, DISCOVERY_TIMEOUT_SECONDS
+            )
+            discovery_spent = time.monotonic() - discovery_start
+            self.timer.record('button_discovery', discovery_spent, self._job_id)
             
             if not easy_apply_button:
                 # Verificar si es porque el trabajo está cerrado o no tiene Easy Apply
@@ -139,60 +344,48 @@ class LinkedInApplier:
                 self.logger.warning("✗ No se encontró botón Easy Apply con ningún selector")
                 
                 # Guardar screenshot para debug
-                screenshot_path = Path(f"data/logs/debug_no_button_{job['title'][:30]}.png")
-                screenshot_path.parent.mkdir(parents=True, exist_ok=True)
-                self.driver.save_screenshot(str(screenshot_path))
+                screenshot_path = self.capture_artifacts(job, 'no_button')
                 self.logger.info(f"  Screenshot guardado: {screenshot_path}")
                 
                 return result
             
+            self.logger.info(f"  ✓ Botón Easy Apply encontrado con: {matched_selector}")
+            
             # Click en Easy Apply
-            try:
-                # Scroll al botón
-                self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", easy_apply_button)
-                time.sleep(1)
-                
-                # Intentar click
-                easy_apply_button.click()
-                self.logger.info("  ✓ Click en Easy Apply realizado")
-                time.sleep(3)  # Esperar a que abra el modal
-                
-            except Exception as e:
-                # Intentar click con JavaScript si falla el click normal
-                self.logger.warning(f"  Click normal falló, intentando con JavaScript...")
-                self.driver.execute_script("arguments[0].click();", easy_apply_button)
-                time.sleep(3)
+            with self.timer.span('easy_apply_click', self._job_id):
+                try:
+                    # Scroll al botón
+                    self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", easy_apply_button)
+                    time.sleep(1)
+                    
+                    # Intentar click
+                    easy_apply_button.click()
+                    self.logger.info("  ✓ Click en Easy Apply realizado")
+                    time.sleep(3)  # Esperar a que abra el modal
+                    
+                except Exception as e:
+                    # Intentar click con JavaScript si falla el click normal
+                    self.logger.warning(f"  Click normal falló, intentando con JavaScript...")
+                    self.driver.execute_script("arguments[0].click();", easy_apply_button)
+                    time.sleep(3)
             
-            # Verificar que el modal se haya abierto
+            self.check_deadline()
+            
+            # Verificar que el modal se haya abierto (usa lo que queda del presupuesto)
             try:
-                modal_selectors = [
-                    "div[data-test-modal-id='easy-apply-modal']",
-                    "div.jobs-easy-apply-modal",
-                    "div[role='dialog'][aria-labelledby*='apply']"
-                ]
-                
-                modal_found = False
-                for modal_selector in modal_selectors:
-                    try:
-                        modal = WebDriverWait(self.driver, 5).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, modal_selector))
-                        )
-                        if modal and modal.is_displayed():
-                            modal_found = True
-                            self.logger.info("  ✓ Modal de aplicación abierto correctamente")
-                            break
-                    except TimeoutException:
-                        continue
+                remaining = max(DISCOVERY_TIMEOUT_SECONDS - discovery_spent, 2)
+                with self.timer.span('modal_wait', self._job_id):
+                    modal, _ = self.wait_for_first_match(MODAL_SELECTORS, remaining, require_visible=True)
                 
-                if not modal_found:
+                if modal:
+                    self.logger.info("  ✓ Modal de aplicación abierto correctamente")
+                else:
                     result['error'] = "Modal de aplicación no se abrió"
                     result['status'] = 'ERROR'
                     self.logger.warning("✗ Modal no se abrió después del click")
                     
                     # Screenshot para debug
-                    screenshot_path = Path(f"data/logs/debug_no_modal_{job['title'][:30]}.png")
-                    screenshot_path.parent.mkdir(parents=True, exist_ok=True)
-                    self.driver.save_screenshot(str(screenshot_path))
+                    self.capture_artifacts(job, 'no_modal')
                     
                     return result
                     
@@ -209,12 +402,41 @@ class LinkedInApplier:
             else:
                 self.logger.warning(f"✗ No se pudo completar la aplicación")
             
+        except JobDeadlineExceeded as e:
+            result['error'] = str(e)
+            result['status'] = 'ERROR'
+            self.logger.warning(f"✗ {str(e)}")
+            self.capture_artifacts(job, 'timeout')
+            
         except Exception as e:
             result['error'] = str(e)
             self.logger.error(f"Error aplicando: {str(e)}")
         
         return result
     
+    def wait_for_first_match(self, selectors: List[str], timeout: float,
+                             require_visible: bool = False) -> Tuple[Optional[Any], Optional[str]]:
+        """
+        Espera una sola vez a que alguno de los selectores tenga coincidencias
+        
+        Args:
+            selectors: Selectores CSS en orden de prioridad
+            timeout: Segundos máximos de espera para todos los selectores
+            require_visible: Exigir que el elemento esté renderizado
+        
+        Returns:
+            Tupla (elemento, selector que coincidió) o (None, None) si se agota el tiempo
+        """
+        try:
+            match = WebDriverWait(self.driver, self.bounded_timeout(timeout), poll_frequency=0.25).until(
+                lambda driver: driver.execute_script(FIND_FIRST_MATCH_JS, selectors, require_visible)
+            )
+        except TimeoutException:
+            return None, None
+        
+        element, index = match
+        return element, selectors[index]
+    
     def process_application_form(self, job: Dict[str, Any], result: Dict[str, Any]) -> bool:
         """
         Procesa el formulario de aplicación multi-paso
@@ -238,12 +460,15 @@ class LinkedInApplier:
         
         while current_step < max_steps:
             current_step += 1
+            self.check_deadline()
             self.logger.info(f"  Paso {current_step}...")
             
-            time.sleep(2)
+            with self.timer.span('step_wait', self._job_id, current_step):
+                time.sleep(2)
             
             # Rellenar formulario actual ANTES de buscar botón
-            new_questions = self.fill_current_form_step(job, result, seen_questions)
+            with self.timer.span('form_fill', self._job_id, current_step):
+                new_questions = self.fill_current_form_step(job, result, seen_questions)
             questions_without_answer.extend(new_questions)
             
             # Si hay más de 3 preguntas sin respuesta, abortar
@@ -253,50 +478,28 @@ class LinkedInApplier:
                 result['status'] = 'MANUAL'
                 return False
             
-            time.sleep(1)
-            
-            # Buscar botón de acción
-            next_button = None
-            button_selectors = [
-                "button[aria-label*='Enviar']",
-                "button[aria-label*='Submit']",
-                "button[aria-label*='Send']",
-                "button[aria-label*='Continuar']",
-                "button[aria-label*='siguiente']",
-                "button[aria-label*='Next']",
-                "button[aria-label*='Siguiente']",
-                "button[data-easy-apply-next-button]",
-                "button[aria-label*='Review']",
-                "button[aria-label*='Revisar']",
-                "button.artdeco-button--primary"
-            ]
-            
-            for selector in button_selectors:
-                try:
-                    buttons = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    for btn in buttons:
-                        if btn.is_displayed() and btn.is_enabled():
-                            next_button = btn
-                            break
-                    if next_button:
-                        break
-                except NoSuchElementException:
-                    continue
+            with self.timer.span('step_wait', self._job_id, current_step):
+                time.sleep(1)
             
-            if not next_button:
+            # No empezar un envío si ya no queda tiempo
+            self.check_deadline()
+            
+            # Buscar botón de acción (una sola llamada, dentro del modal)
+            with self.timer.span('action_button', self._job_id, current_step):
+                action = self.resolve_action_button()
+            
+            if not action:
                 self.logger.warning("  No se encontró botón de acción")
-                screenshot_path = Path(f"data/logs/debug_no_next_button_{current_step}.png")
-                screenshot_path.parent.mkdir(parents=True, exist_ok=True)
-                self.driver.save_screenshot(str(screenshot_path))
+                screenshot_path = self.capture_artifacts(job, f'paso{current_step}_no_next_button')
                 self.logger.info(f"  Screenshot guardado: {screenshot_path}")
                 return False
             
-            button_aria_label = next_button.get_attribute('aria-label') or ''
-            button_text = next_button.text or button_aria_label
+            next_button = action['element']
+            button_aria_label = action['aria_label']
+            button_text = action['label']
             
             # IMPORTANTE: Detectar botón "Enviar" ANTES de hacer click
-            button_context = f"{button_text} {button_aria_label}".lower()
-            is_submit_button = any(word in button_context for word in ['enviar', 'submit', 'send application'])
+            is_submit_button = action['kind'] == 'submit'
             
             # Detectar loop infinito
             button_history.append(button_aria_label)
@@ -308,24 +511,31 @@ class LinkedInApplier:
                     result['status'] = 'MANUAL'
                     return False
             
-            self.logger.info(f"  Botón encontrado: '{button_text}'")
+            self.logger.info(f"  Botón encontrado: '{button_text}' ({action['kind']})")
             
-            # Click en el botón
-            try:
-                self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", next_button)
-                time.sleep(0.5)
-                next_button.click()
-                self.logger.info(f"  ✓ Click en '{button_text}'")
-            except Exception as e:
-                self.driver.execute_script("arguments[0].click();", next_button)
-                self.logger.info(f"  ✓ Click en '{button_text}' (JavaScript)")
+            # Registrar el punto de no retorno antes de enviar (no si el intento fue abandonado)
+            if is_submit_button and self.checkpoint:
+                self.check_deadline()
+                self.checkpoint.mark_submitting(job)
             
-            time.sleep(2)
+            # Click en el botón
+            with self.timer.span('step_click', self._job_id, current_step):
+                try:
+                    self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", next_button)
+                    time.sleep(0.5)
+                    next_button.click()
+                    self.logger.info(f"  ✓ Click en '{button_text}'")
+                except Exception as e:
+                    self.driver.execute_script("arguments[0].click();", next_button)
+                    self.logger.info(f"  ✓ Click en '{button_text}' (JavaScript)")
+                
+                time.sleep(2)
             
             # Si era botón "Enviar", aplicación completa
             if is_submit_button:
                 # Esperar confirmación
-                time.sleep(3)
+                with self.timer.span('submit_confirmation', self._job_id, current_step):
+                    time.sleep(3)
                 self.logger.success("  ✓ Aplicación enviada!")
                 result['status'] = 'APPLIED'
                 return True
@@ -334,6 +544,22 @@ class LinkedInApplier:
         result['status'] = 'MANUAL'
         return False
     
+    def resolve_action_button(self) -> Optional[Dict[str, Any]]:
+        """
+        Obtiene el mejor botón de acción visible y habilitado del paso actual
+        
+        Returns:
+            Diccionario con 'element', 'kind' ('next', 'review' o 'submit'),
+            'label', 'aria_label' y 'selector', o None si no hay botón
+        """
+        try:
+            return self.driver.execute_script(
+                RESOLVE_ACTION_BUTTON_JS, MODAL_SELECTORS, ACTION_BUTTON_SELECTORS
+            )
+        except Exception as e:
+            self.logger.warning(f"  Error resolviendo botón de acción: {str(e)}")
+            return None
+    
     def fill_current_form_step(self, job: Dict[str, Any], result: Dict[str, Any], seen_questions: set) -> list:
         """
         Rellena el paso actual del formulario
@@ -350,7 +576,8 @@ class LinkedInApplier:
         
         try:
             # 1. Upload CV si es necesario
-            self.handle_cv_upload(job, result)
+            with self.timer.span('cv_upload', self._job_id):
+                self.handle_cv_upload(job, result)
             
             # 2. Buscar y rellenar campos de texto
             text_fields = self.driver.find_elements(By.CSS_SELECTOR, "input[type='text'], input[type='email'], input[type='tel']")
@@ -375,20 +602,25 @@ class LinkedInApplier:
             return new_questions
     
     def handle_cv_upload(self, job: Dict[str, Any], result: Dict[str, Any]) -> bool:
-        """Maneja la subida de CV"""
+        """
+        Maneja el CV del paso actual
+        
+        Si LinkedIn ya muestra el CV correcto (subido antes) lo selecciona en vez de
+        volver a subirlo; solo sube el PDF cuando no existe y únicamente al input
+        de currículum (nunca al de carta de presentación).
+        """
         try:
-            # Buscar input de archivo
-            file_inputs = self.driver.find_elements(By.CSS_SELECTOR, "input[type='file']")
+            documents = self.driver.execute_script(INSPECT_DOCUMENT_UPLOADS_JS, MODAL_SELECTORS)
+            resumes = documents.get('resumes', [])
+            file_inputs = documents.get('file_inputs', [])
             
-            if not file_inputs:
+            if not resumes and not file_inputs:
                 return True  # No hay upload, está bien
             
-            # Seleccionar CV apropiado
-            cv_type = select_cv_by_keywords(
-                job.get('title', ''),
-                job.get('description', ''),
-                self.config
-            )
+            # Seleccionar CV apropiado (el scraper ya lo guarda en el trabajo)
+            cv_type = job.get('cv_type')
+            if not cv_type:
+                cv_type, _ = self.cv_classifier.classify(job.get('title', ''), job.get('description', '') or '')
             
             cv_path = self.cv_paths.get(cv_type)
             
@@ -396,8 +628,31 @@ class LinkedInApplier:
                 self.logger.warning(f"  CV no encontrado: {cv_path}")
                 return False
             
-            # Subir CV
-            file_inputs[0].send_keys(str(Path(cv_path).absolute()))
+            # 1. ¿LinkedIn ya tiene este CV? Seleccionarlo en vez de subirlo
+            matching = next((r for r in resumes if self._same_document(r['name'], cv_path)), None)
+            if matching:
+                if not matching['selected']:
+                    self.driver.execute_script("arguments[0].click();", matching['element'])
+                    time.sleep(0.5)
+                    self.logger.info(f"  ✓ CV existente seleccionado: {matching['name']}")
+                else:
+                    self.logger.info(f"  ✓ CV ya seleccionado: {matching['name']}")
+                result['cv_used'] = cv_type
+                return True
+            
+            # 2. Ya se subió en un paso anterior de esta postulación
+            if job['url'] in self._uploaded_cv_jobs:
+                return True
+            
+            # 3. Subir solo al input de currículum (o a uno sin clasificar si no hay otro)
+            target = next((i for i in file_inputs if i['kind'] == 'resume'), None)
+            if not target:
+                target = next((i for i in file_inputs if i['kind'] == 'unknown'), None)
+            if not target:
+                return True  # Solo hay input de carta de presentación
+            
+            target['element'].send_keys(str(Path(cv_path).absolute()))
+            self._uploaded_cv_jobs.add(job['url'])
             result['cv_used'] = cv_type
             self.logger.info(f"  ✓ CV subido: {cv_type}")
             time.sleep(2)
@@ -408,6 +663,20 @@ class LinkedInApplier:
             self.logger.warning(f"  Error subiendo CV: {str(e)}")
             return False
     
+    @staticmethod
+    def _same_document(displayed_name: str, cv_path: str) -> bool:
+        """Compara el nombre mostrado por LinkedIn con el archivo del CV (sin extensión, acentos ni símbolos)"""
+        def normalize(text: str) -> str:
+            text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode().lower()
+            text = re.sub(r'\.(pdf|docx?)\b', '', text)
+            return re.sub(r'[^a-z0-9]', '', text)
+        
+        shown = normalize(displayed_name)
+        expected = normalize(Path(cv_path).name)
+        if len(shown) < 6 or not expected:
+            return False  # Nombres demasiado cortos darían falsos positivos
+        return expected in shown or shown in expected
+    
     def fill_text_field(self, field, result: Dict[str, Any]):
         """Rellena un campo de texto basándose en su label/placeholder"""
         try:
@@ -604,44 +873,37 @@ class LinkedInApplier:
         Returns:
             Respuesta si se encuentra, None si no
         """
-        import re
-        
-        preguntas_config = self.answers.get('preguntas_configuradas', {})
-        
-        for pregunta_key, pregunta_data in preguntas_config.items():
-            # Obtener patrón de la pregunta
-            if isinstance(pregunta_data, dict):
-                patron = pregunta_data.get('pregunta_patron', '')
-                patrones = pregunta_data.get('patrones', [patron]) if patron else pregunta_data.get('patrones', [])
-            else:
-                continue
-            
-            # Verificar si algún patrón coincide
-            for patron in patrones:
-                if re.search(patron, question_text, re.IGNORECASE):
-                    # Obtener respuesta
-                    if 'respuesta' in pregunta_data:
-                        return pregunta_data['respuesta']
-                    elif 'respuestas' in pregunta_data:
-                        respuestas = pregunta_data['respuestas']
-                        if isinstance(respuestas, dict):
-                            return respuestas.get('corta') or respuestas.get('default') or list(respuestas.values())[0]
-                        return str(respuestas)
-                    break
-        
-        return None
+        return find_configured_answer(question_text, self.answers.get('preguntas_configuradas', {}))
+
+
+def save_results(results: List[Dict[str, Any]], results_file: Path):
+    """Guarda los resultados de forma atómica (archivo temporal + rename)"""
+    results_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = results_file.with_suffix('.json.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_file, results_file)
 
 
 def main():
     """Función principal de prueba"""
     from linkedin_scraper import LinkedInScraper
     
+    parser = argparse.ArgumentParser(description="LinkedIn Job Applier")
+    parser.add_argument('--resume', action='store_true',
+                        help="Reanudar la última ejecución interrumpida desde el último trabajo completado")
+    args = parser.parse_args()
+    
     print("🤖 LinkedIn Job Applier - Prueba")
     print("=" * 60)
     
     config = Config()
     logger = Logger()
     
+    # Presupuesto de tiempo de la ejecución (el reloj corre desde aquí)
+    yaml_config = config.load_yaml_config()
+    controller = RunController.from_config(yaml_config, logger)
+    
     # Cargar credenciales
     credentials = config.get_linkedin_credentials()
     if not credentials:
@@ -665,15 +927,59 @@ def main():
     new_jobs = [job for job in all_jobs if job.get('is_new', False)]
     pending_jobs = [job for job in new_jobs if job.get('has_easy_apply')]
     
+    # Checkpoint: omitir trabajos ya enviados o ya terminados en la ejecución reanudada
+    checkpoint = ApplyCheckpoint()
+    run_id = checkpoint.start_run(resume=args.resume)
+    logger.info(f"Ejecución {run_id}{' (reanudada)' if args.resume else ''}")
+    
+    results = checkpoint.run_results()
+    if results:
+        logger.info(f"Resultados recuperados del checkpoint: {len(results)}")
+    
+    # Reintentos vencidos de ejecuciones anteriores
+    retry_queue = RetryQueue.from_config(yaml_config, logger)
+    pending_urls = {job['url'] for job in pending_jobs}
+    due_retries = [job for job in retry_queue.due(run_id) if job['url'] not in pending_urls]
+    if due_retries:
+        logger.info(f"Reintentos pendientes: {len(due_retries)}")
+        pending_jobs.extend(due_retries)
+    
+    skipped = [(job, checkpoint.skip_reason(job) or retry_queue.skip_reason(job, run_id)) for job in pending_jobs]
+    for job, reason in skipped:
+        if reason:
+            logger.info(f"  ⊘ Omitido {job['title']}: {reason}")
+    pending_jobs = [job for job, reason in skipped if not reason]
+    
     logger.info(f"Trabajos NUEVOS pendientes de aplicar: {len(pending_jobs)}")
     
-    if len(pending_jobs) == 0:
-        logger.info("No hay trabajos nuevos con Easy Apply")
+    # Ordenar por valor esperado y limitar a max_aplicaciones_por_run
+    max_applications = yaml_config.get('ejecucion', {}).get('max_aplicaciones_por_run') or len(pending_jobs)
+    apply_queue = ApplyQueue(yaml_config, checkpoint.history())
+    apply_queue.extend(pending_jobs)
+    # Una ejecución reanudada ya gastó parte del límite en los resultados restaurados
+    run_budget = max(min(max_applications - len(results), len(apply_queue)), 0)
+    if run_budget < len(pending_jobs):
+        logger.info(f"Límite por ejecución: {run_budget} de {len(pending_jobs)} trabajos (mejor score primero)")
+    
+    results_file = Path("data/logs/application_results.json")
+    
+    # Sin trabajos o sin presupuesto: terminar antes de abrir Chrome e iniciar sesión
+    if len(pending_jobs) == 0 or run_budget == 0:
+        if results:
+            save_results(results, results_file)
+        checkpoint.end_run()
+        if pending_jobs:
+            logger.info("Límite por ejecución alcanzado: no se aplica a más trabajos")
+        else:
+            logger.info("No hay trabajos nuevos con Easy Apply")
         return
     
     # Crear scraper (para reutilizar driver y login)
+    # El timeout de comandos debe aplicarse antes de crear el driver
+    controller.install_command_timeout()
     scraper = LinkedInScraper(config, logger, headless=False)
     scraper.setup_driver()
+    controller.configure_driver(scraper.driver)
     
     if not scraper.login(credentials['username'], credentials['password']):
         logger.error("Login fallido")
@@ -681,6 +987,17 @@ def main():
     
     # Crear applier
     applier = LinkedInApplier(scraper.driver, config, logger)
+    applier.checkpoint = checkpoint
+    
+    def restart_driver():
+        """Reemplaza un navegador colgado por uno nuevo con sesión iniciada"""
+        logger.warning("  Reiniciando navegador...")
+        scraper.close()
+        scraper.setup_driver()
+        controller.configure_driver(scraper.driver)
+        if not scraper.login(credentials['username'], credentials['password']):
+            raise RuntimeError("Login fallido al reiniciar el navegador")
+        applier.driver = scraper.driver
 
     # Inicializar Telegram (si está disponible)
     notifier = None
@@ -693,11 +1010,14 @@ def main():
     
     # Inicializar Google Sheets para agregar resultados
     sheets_manager = None
+    sheets_writer = None
     try:
         from google_sheets_manager import GoogleSheetsManager
         sheets_id = config.get_env_var('GOOGLE_SHEETS_ID')
         if sheets_id and Path('config/google_credentials.json').exists():
             sheets_manager = GoogleSheetsManager('config/google_credentials.json', sheets_id)
+            # Las escrituras van por lotes en segundo plano, fuera del loop del navegador
+            sheets_writer = SheetsBatchWriter(sheets_manager, logger=logger)
             logger.info('✓ Google Sheets manager inicializado')
     except Exception as e:
         logger.warning(f'Google Sheets no disponible: {e}')
@@ -706,21 +1026,76 @@ def main():
     # PASO 2: Aplicar solo a los trabajos nuevos
     # ============================================================================
     
-    results = []
-    for i, job in enumerate(pending_jobs):
-        logger.info(f"\n--- Trabajo {i+1}/{len(pending_jobs)} ---")
-        result = applier.apply_to_job(job)
-        results.append(result)
+    def process_job(job: Dict[str, Any]):
+        """Postula a un trabajo bajo el watchdog y registra su resultado"""
+        is_retry = retry_queue.is_retry(job)
+        checkpoint.claim(job)
+        checkpoint.mark_in_progress(job)
         
-        # Agregar a Google Sheets INMEDIATAMENTE (sin esperar a que termine todo)
-        if sheets_manager:
-            try:
-                sheets_manager.add_job_application(job, result)
-                logger.info('  ✓ Agregado a Google Sheets')
-            except Exception as e:
-                logger.warning(f'  ✗ Error agregando a Google Sheets: {e}')
+        context = controller.job_context()
+        finished, result = controller.run_job(lambda: applier.apply_to_job(job, context), context,
+                                              on_abandon=restart_driver)
+        if not finished:
+            result = {
+                'job_url': job['url'],
+                'job_title': job['title'],
+                'company': job['company'],
+                'success': False,
+                'status': 'ERROR',
+                'error': "Tiempo límite por trabajo excedido (navegador no respondió)",
+                'questions_encountered': [],
+                'cv_used': None
+            }
+        checkpoint.finish(job, result)
+        retry_queue.record(job, result, run_id)
+        
+        # Un reintento reemplaza el resultado anterior del mismo trabajo
+        previous = [idx for idx, r in enumerate(results) if r.get('job_url') == job['url']]
+        if previous:
+            results[previous[-1]] = result
+        else:
+            results.append(result)
+        
+        # Persistir resultados tras cada trabajo (sobreviven a una caída)
+        save_results(results, results_file)
         
-        time.sleep(5)  # Delay entre aplicaciones
+        # Encolar para Google Sheets (el envío ocurre en segundo plano, por lotes)
+        if sheets_writer:
+            if is_retry:
+                sheets_writer.update_job_status(job['url'], result['status'], result.get('error') or '')
+            else:
+                sheets_writer.add_job_application(job, result)
+    
+    for i in range(run_budget):
+        # No iniciar un trabajo que no alcanzaría a terminar dentro de tiempo_limite_minutos
+        if not controller.has_time_for_job():
+            controller.jobs_skipped = run_budget - i
+            logger.warning(f"Tiempo límite de la ejecución alcanzado: {controller.jobs_skipped} trabajos quedan para la próxima")
+            break
+        
+        job = apply_queue.pop()
+        logger.info(f"\n--- Trabajo {i+1}/{run_budget} (score {job['priority']['score']:.2f}) ---")
+        process_job(job)
+        
+        # Delay entre aplicaciones (delay_entre_aplicaciones_segundos)
+        if i < run_budget - 1:
+            controller.wait_between_jobs()
+    
+    # Reintentos que ya vencieron durante esta ejecución (el resto queda para la próxima)
+    retried = set()
+    while controller.has_time_for_job():
+        due = [job for job in retry_queue.due(run_id)
+               if job['url'] not in retried and not (checkpoint.get_state(job) or {}).get('submitted')]
+        if not due:
+            break
+        job = due[0]
+        retried.add(job['url'])
+        controller.wait_between_jobs()
+        logger.info(f"\n--- Reintento: {job['title']} - {job['company']} ---")
+        process_job(job)
+    
+    if len(retry_queue):
+        logger.info(f"Trabajos en cola de reintento: {len(retry_queue)}")
     
     # Mostrar resumen
     logger.info(f"\n{'='*60}")
@@ -731,21 +1106,47 @@ def main():
     logger.info(f"Exitosas: {successful}/{len(results)}")
     logger.info(f"Fallidas: {len(results) - successful}/{len(results)}")
     
+    budget_report = controller.report()
+    logger.info(f"Tiempo: {budget_report['transcurrido_segundos']}s de {budget_report['limite_segundos']}s "
+                f"(preparación {budget_report['preparacion_segundos']}s, trabajos {budget_report['en_trabajos_segundos']}s, "
+                f"delays {budget_report['en_delays_segundos']}s, otros {budget_report['otros_segundos']}s)")
+    logger.info(f"Trabajos con timeout: {budget_report['trabajos_con_timeout'] + budget_report['trabajos_abandonados']}, "
+                f"sin presupuesto: {budget_report['trabajos_sin_presupuesto']}")
+    with open(Path("data/logs/run_budget.json"), 'w', encoding='utf-8') as f:
+        json.dump(budget_report, f, indent=2, ensure_ascii=False)
+    
+    # Desglose de tiempo por fase (data/logs/application_metrics.json)
+    metrics = applier.timer.save(extra={'run_id': run_id, 'presupuesto': budget_report})
+    for phase, stats in list(metrics['fases'].items())[:5]:
+        logger.info(f"  {phase}: total {stats['total']}s, p50 {stats['p50']}s, p95 {stats['p95']}s ({stats['count']})")
+    
     # Guardar resultados en archivo de logs
-    results_file = Path("data/logs/application_results.json")
-    with open(results_file, 'w', encoding='utf-8') as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
+    save_results(results, results_file)
+    checkpoint.end_run()
     
     logger.success(f"Resultados guardados en: {results_file}")
     
+    # Enviar lo que quede en el buffer (o guardarlo para la próxima ejecución)
+    if sheets_writer:
+        sheets_writer.close()
+        logger.info(f'✓ Google Sheets: {sheets_writer.rows_sent} operaciones en {sheets_writer.batches_sent} lotes')
+    
     # Actualizar dashboard si está disponible
     if sheets_manager:
         try:
-            sheets_manager.update_dashboard()
+            sheets_manager.update_dashboard(all_jobs)
             logger.info('✓ Dashboard actualizado')
         except Exception as e:
             logger.warning(f'No se pudo actualizar dashboard: {e}')
-    
+
+        try:
+            stats = sheets_manager.api_stats()
+            logger.info(f"API de Sheets: {stats['llamadas']} llamadas, {stats['reintentos']} reintentos, "
+                        f"{stats['errores']} errores, {stats['espera_cuota_segundos']}s de espera por cuota")
+        except Exception as e:
+            logger.warning(f'No se pudieron leer las estadísticas de la API: {e}')
+
+    applier.artifacts.close()
     scraper.close()
 
 
@@ -17,7 +17,8 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from selenium.webdriver.chrome.options import Options
 import undetected_chromedriver as uc
 
-from utils import Config, Logger, clean_text, extract_job_id_from_url
+from utils import Config, Logger, clean_text, extract_job_id_from_url, get_cv_classifier
+from sheets_archive import ArchiveIndex
 
 
 class LinkedInScraper:
@@ -268,6 +269,7 @@ class LinkedInScraper:
                         
                         if job_data:
                             job_id = extract_job_id_from_url(job_data['url'])
+                            job_data['search_keyword'] = keywords
                             
                             if job_id not in processed_job_ids:
                                 jobs.append(job_data)
@@ -486,6 +488,7 @@ def main():
     # ============================================================================
     all_sheets_jobs = []
     all_sheets_urls = set()
+    archived_job_ids = set()
     
     try:
         from google_sheets_manager import GoogleSheetsManager
@@ -497,6 +500,9 @@ def main():
             all_sheets_jobs = sheets_manager.get_all_jobs_from_sheets()
             all_sheets_urls = {job.get('url') for job in all_sheets_jobs if job.get('url')}
             
+            # Postulaciones movidas a las hojas de archivo (índice local, sin leerlas)
+            archived_job_ids = sheets_manager.get_archived_job_ids()
+            
             # Marcar trabajos del Sheets como no nuevos (ya en base de datos)
             for job in all_sheets_jobs:
                 job['is_new'] = False
@@ -515,6 +521,7 @@ def main():
                 with open(output_file, 'r', encoding='utf-8') as f:
                     all_sheets_jobs = json.load(f)
                 all_sheets_urls = {job.get('url') for job in all_sheets_jobs if job.get('url')}
+                archived_job_ids = ArchiveIndex().job_ids()
                 logger.info(f"✓ Cargados {len(all_sheets_jobs)} trabajos del cache local")
             except Exception as e2:
                 logger.warning(f"No se pudieron cargar trabajos existentes: {str(e2)}")
@@ -536,7 +543,7 @@ def main():
             return
         
         # Extraer Job IDs para deduplicación
-        existing_job_ids = {extract_job_id_from_url(url) for url in all_sheets_urls if url}
+        existing_job_ids = {extract_job_id_from_url(url) for url in all_sheets_urls if url} | archived_job_ids
         
         # Buscar trabajos nuevos
         keywords = yaml_config['busqueda']['palabras_clave'][0]
@@ -548,6 +555,9 @@ def main():
         for job in new_jobs:
             job['is_new'] = True
         
+        # Elegir CV en lote (cv_type + cv_match_score) para que el applier solo lo lea
+        get_cv_classifier(config).annotate_jobs(new_jobs)
+        
         # ============================================================================
         # PASO 3: Guardar trabajos nuevos en cache y variable
         # ============================================================================
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Metrics
+Spans de tiempo por fase del applier y agregación por ejecución (p50, p95, totales)
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+
+METRICS_FILE = "data/logs/application_metrics.json"
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Percentil por rango más cercano (values no vacío)"""
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+class PhaseTimer:
+    """
+    Registra spans (fase, job_id, paso, duración) de una ejecución
+
+    Uso:
+        with timer.span('page_load', job_id):
+            driver.get(url)
+    """
+
+    def __init__(self):
+        self.spans: List[Dict[str, Any]] = []
+        self.started_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, phase: str, job_id: Optional[str] = None, step: Optional[int] = None):
+        """Mide el bloque y lo registra aunque lance una excepción"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - start, job_id, step)
+
+    def record(self, phase: str, seconds: float, job_id: Optional[str] = None, step: Optional[int] = None):
+        """Registra un span ya medido"""
+        with self._lock:
+            self.spans.append({
+                'phase': phase,
+                'job_id': job_id,
+                'step': step,
+                'seconds': round(seconds, 4)
+            })
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Agrega los spans por fase
+
+        Returns:
+            Diccionario con totales por fase (count, total, p50, p95, max) y por trabajo
+        """
+        with self._lock:
+            spans = list(self.spans)
+
+        by_phase: Dict[str, List[float]] = {}
+        by_job: Dict[str, float] = {}
+        for span in spans:
+            by_phase.setdefault(span['phase'], []).append(span['seconds'])
+            if span['phase'] == 'job_total' and span['job_id']:
+                by_job[span['job_id']] = span['seconds']
+
+        phases = {
+            phase: {
+                'count': len(values),
+                'total': round(sum(values), 2),
+                'p50': round(percentile(values, 50), 2),
+                'p95': round(percentile(values, 95), 2),
+                'max': round(max(values), 2)
+            }
+            for phase, values in by_phase.items()
+        }
+
+        # Fases ordenadas por tiempo total (las que más pesan primero)
+        phases = dict(sorted(phases.items(), key=lambda item: item[1]['total'], reverse=True))
+
+        return {
+            'inicio': self.started_at,
+            'fin': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'trabajos': len(by_job),
+            'fases': phases,
+            'por_trabajo': by_job
+        }
+
+    def save(self, path: str = METRICS_FILE, extra: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Escribe el resumen (y los spans crudos) de forma atómica
+
+        Args:
+            path: Archivo de salida
+            extra: Datos adicionales a incluir (ej: presupuesto de tiempo)
+
+        Returns:
+            El reporte escrito
+        """
+        report = self.summary()
+        if extra:
+            report.update(extra)
+        with self._lock:
+            report['spans'] = list(self.spans)
+
+        output = Path(path)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = output.with_suffix('.json.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_file, output)
+        return report
+
+
+def load_latest(path: str = METRICS_FILE, include_spans: bool = False) -> Optional[Dict[str, Any]]:
+    """Carga las métricas de la última ejecución (sin spans crudos por defecto)"""
+    metrics_file = Path(path)
+    if not metrics_file.exists():
+        return None
+    with open(metrics_file, 'r', encoding='utf-8') as f:
+        report = json.load(f)
+    if not include_spans:
+        report.pop('spans', None)
+    return report
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Question Analysis
+Agrupa las preguntas sin respuesta de todas las ejecuciones y sugiere entradas
+para preguntas_configuradas ordenadas por cuántas postulaciones desbloquearían
+"""
+
+import argparse
+import json
+import re
+from collections import Counter, defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Iterable, Set, Tuple
+
+from utils import Config, extract_job_id_from_url, find_configured_answer
+from run_checkpoint import ApplyCheckpoint
+
+
+# Palabras que no aportan a la similitud entre preguntas
+STOPWORDS = {
+    'a', 'an', 'the', 'of', 'in', 'on', 'for', 'to', 'with', 'and', 'or', 'do', 'does',
+    'you', 'your', 'are', 'is', 'have', 'has', 'how', 'what', 'which', 'this', 'that',
+    'el', 'la', 'los', 'las', 'un', 'una', 'de', 'del', 'en', 'con', 'por', 'para', 'y',
+    'o', 'tu', 'su', 'usted', 'es', 'tiene', 'tienes', 'que', 'cuál', 'cuántos', 'cómo',
+    'required', 'obligatorio', 'please'
+}
+
+# Similitud de Jaccard mínima para unir una pregunta a un cluster
+SIMILARITY_THRESHOLD = 0.5
+
+# Fracción mínima de preguntas del cluster que debe cubrir un patrón sugerido
+MIN_PATTERN_COVERAGE = 0.5
+
+
+def normalize_question(text: str) -> List[str]:
+    """
+    Normaliza una pregunta a una lista de tokens
+
+    Minúsculas, sin puntuación, números reemplazados por '#', sin stopwords ni
+    tokens de una letra.
+    LinkedIn suele repetir el texto de la etiqueta dos veces; se deja una sola.
+    """
+    text = (text or '').strip()
+    half = len(text) // 2
+    if len(text) % 2 == 0 and half and text[:half] == text[half:]:
+        text = text[:half]
+
+    text = re.sub(r'\d+', ' # ', text.lower())
+    tokens = re.findall(r'[#\w]+', text)
+    return [token for token in tokens if token not in STOPWORDS and (len(token) > 1 or token == '#')]
+
+
+def shingles(tokens: List[str]) -> Set[str]:
+    """Tokens individuales más bigramas de tokens consecutivos"""
+    grams = set(tokens)
+    grams.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    return grams
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def is_configured(question: str, preguntas_config: Dict[str, Any]) -> bool:
+    """Indica si el applier ya tiene una respuesta para la pregunta (misma búsqueda que el applier)"""
+    return find_configured_answer(question, preguntas_config) is not None
+
+
+class QuestionClusterer:
+    """
+    Clustering incremental de preguntas por similitud de shingles
+
+    Cada pregunta se compara solo con los clusters que comparten al menos un
+    shingle (índice invertido) y se une al más parecido si supera el umbral.
+    """
+
+    def __init__(self, threshold: float = SIMILARITY_THRESHOLD):
+        self.threshold = threshold
+        self.clusters: List[Dict[str, Any]] = []
+        self._index: Dict[str, Set[int]] = defaultdict(set)
+
+    def add(self, question: str) -> int:
+        """
+        Agrega una pregunta y retorna el índice de su cluster
+        """
+        tokens = normalize_question(question)
+        grams = shingles(tokens)
+
+        candidates = set()
+        for gram in grams:
+            candidates.update(self._index.get(gram, ()))
+
+        best, best_score = None, 0.0
+        for idx in candidates:
+            score = jaccard(grams, self.clusters[idx]['shingles'])
+            if score > best_score:
+                best, best_score = idx, score
+
+        if best is None or best_score < self.threshold:
+            best = len(self.clusters)
+            self.clusters.append({'shingles': grams, 'questions': Counter(), 'tokens': Counter()})
+            for gram in grams:
+                self._index[gram].add(best)
+
+        cluster = self.clusters[best]
+        cluster['questions'][question] += 1
+        cluster['tokens'].update(set(tokens))
+        return best
+
+
+def load_results(results_file: Path, checkpoint: ApplyCheckpoint) -> List[Dict[str, Any]]:
+    """
+    Último resultado conocido de cada trabajo (checkpoint + application_results.json)
+    """
+    latest: Dict[str, Dict[str, Any]] = {}
+
+    if results_file.exists():
+        with open(results_file, 'r', encoding='utf-8') as f:
+            for result in json.load(f):
+                latest[extract_job_id_from_url(result.get('job_url', ''))] = result
+
+    # El checkpoint abarca todas las ejecuciones, no solo la última
+    for result in checkpoint.history():
+        latest.setdefault(extract_job_id_from_url(result.get('job_url', '')), result)
+
+    return list(latest.values())
+
+
+def suggest_patterns(questions: Counter) -> Tuple[List[str], float]:
+    """
+    Sugiere patrones regex que cubran las preguntas del cluster
+
+    Usa las frases (1 a 3 tokens consecutivos) más frecuentes entre las preguntas,
+    validándolas contra el texto original.
+
+    Returns:
+        Tupla (patrones, fracción de preguntas cubiertas)
+    """
+    total = sum(questions.values())
+    phrase_counts: Counter = Counter()
+    for question, count in questions.items():
+        toks = normalize_question(question)
+        phrases = {tuple(toks[i:i + n]) for n in (3, 2, 1) for i in range(len(toks) - n + 1)}
+        for phrase in phrases:
+            phrase_counts[phrase] += count
+
+    def to_regex(phrase: Tuple[str, ...]) -> str:
+        return r'\W+'.join(r'\d+' if tok == '#' else re.escape(tok) for tok in phrase)
+
+    # Preferir frases largas (más específicas) y frecuentes; '#' solo no sirve como patrón
+    ranked = sorted(
+        (p for p in phrase_counts if p != ('#',) and phrase_counts[p] / total >= MIN_PATTERN_COVERAGE),
+        key=lambda p: (phrase_counts[p], len(p)),
+        reverse=True
+    )
+
+    patterns, covered = [], set()
+    for phrase in ranked:
+        regex = to_regex(phrase)
+        matches = {q for q in questions if re.search(regex, q, re.IGNORECASE)}
+        if matches - covered:
+            patterns.append(regex)
+            covered |= matches
+        if len(covered) == len(questions) or len(patterns) == 3:
+            break
+
+    coverage = sum(questions[q] for q in covered) / total if total else 0.0
+    return patterns, coverage
+
+
+def analyze(results: Iterable[Dict[str, Any]], preguntas_config: Dict[str, Any],
+            threshold: float = SIMILARITY_THRESHOLD) -> Dict[str, Any]:
+    """
+    Agrupa las preguntas sin respuesta y ordena los clusters por impacto
+
+    Args:
+        results: Resultados de postulaciones (uno por trabajo)
+        preguntas_config: preguntas_configuradas actual (las ya cubiertas se omiten)
+        threshold: Similitud mínima para unir preguntas
+
+    Returns:
+        Reporte con tasa de automatización y clusters ordenados
+    """
+    clusterer = QuestionClusterer(threshold)
+    status_counts: Counter = Counter()
+    job_clusters: Dict[str, Set[int]] = {}
+    job_status: Dict[str, str] = {}
+    already_configured = 0
+
+    for result in results:
+        status = result.get('status')
+        status_counts[status] += 1
+        job_id = extract_job_id_from_url(result.get('job_url', ''))
+        for question in result.get('questions_encountered') or []:
+            if is_configured(question, preguntas_config):
+                already_configured += 1
+                continue
+            job_clusters.setdefault(job_id, set()).add(clusterer.add(question))
+            job_status[job_id] = status
+
+    clusters = []
+    for idx, cluster in enumerate(clusterer.clusters):
+        jobs = [job_id for job_id, ids in job_clusters.items() if idx in ids]
+        manual_jobs = [job_id for job_id in jobs if job_status[job_id] == 'MANUAL']
+        # Trabajos MANUAL cuyo único bloqueo es este cluster
+        unblockable = [job_id for job_id in manual_jobs if job_clusters[job_id] == {idx}]
+        patterns, coverage = suggest_patterns(cluster['questions'])
+        key = '_'.join(tok for tok, _ in cluster['tokens'].most_common(3) if tok != '#') or f"cluster_{idx}"
+
+        clusters.append({
+            'clave_sugerida': re.sub(r'\W+', '_', key).strip('_'),
+            'trabajos_manual': len(manual_jobs),
+            'trabajos_desbloqueables': len(unblockable),
+            'trabajos': len(jobs),
+            'ocurrencias': sum(cluster['questions'].values()),
+            'ejemplos': [q for q, _ in cluster['questions'].most_common(5)],
+            'cobertura_patrones': round(coverage, 2),
+            'entrada_sugerida': {'patrones': patterns, 'respuesta': ""}
+        })
+
+    clusters.sort(key=lambda c: (c['trabajos_manual'], c['trabajos_desbloqueables'], c['ocurrencias']),
+                  reverse=True)
+
+    attempted = status_counts['APPLIED'] + status_counts['MANUAL'] + status_counts['ERROR']
+    return {
+        'generado': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'resultados_analizados': sum(status_counts.values()),
+        'tasa_automatizacion': round(status_counts['APPLIED'] / attempted, 3) if attempted else 0.0,
+        'estados': dict(status_counts),
+        'preguntas_ya_configuradas': already_configured,
+        'clusters': clusters
+    }
+
+
+def main():
+    """Genera data/logs/question_clusters.json"""
+    parser = argparse.ArgumentParser(description="Agrupa preguntas sin respuesta y sugiere preguntas_configuradas")
+    parser.add_argument('--umbral', type=float, default=SIMILARITY_THRESHOLD,
+                        help="Similitud de Jaccard mínima para agrupar (0 a 1)")
+    parser.add_argument('--top', type=int, default=10, help="Clusters a mostrar")
+    parser.add_argument('--salida', default="data/logs/question_clusters.json", help="Archivo de salida")
+    args = parser.parse_args()
+
+    config = Config()
+    preguntas_config = config.load_json_config('respuestas_comunes.json').get('preguntas_configuradas', {})
+    results = load_results(Path("data/logs/application_results.json"), ApplyCheckpoint())
+
+    report = analyze(results, preguntas_config, args.umbral)
+    report['preguntas_configuradas_sugeridas'] = {
+        cluster['clave_sugerida']: cluster['entrada_sugerida']
+        for cluster in report['clusters'][:args.top] if cluster['entrada_sugerida']['patrones']
+    }
+
+    output = Path(args.salida)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print(f"📊 Resultados analizados: {report['resultados_analizados']}")
+    print(f"   Tasa de automatización: {report['tasa_automatizacion']:.1%}")
+    print(f"   Clusters de preguntas sin respuesta: {len(report['clusters'])}")
+    for i, cluster in enumerate(report['clusters'][:args.top], 1):
+        print(f"\n{i}. {cluster['clave_sugerida']} - {cluster['trabajos_manual']} MANUAL "
+              f"({cluster['trabajos_desbloqueables']} se desbloquearían solo con esta respuesta)")
+        print(f"   Ej: {cluster['ejemplos'][0][:80]}")
+        print(f"   Patrones: {cluster['entrada_sugerida']['patrones']}")
+    print(f"\n✓ Reporte guardado en: {output}")
+
+
+if __name__ == "__main__":
+    main()
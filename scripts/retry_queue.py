@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Retry Queue
+Clasifica los fallos del applier y reprograma los transitorios con backoff exponencial
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from utils import extract_job_id_from_url
+
+
+# Categorías de fallo
+TRANSIENT = 'TRANSITORIO'     # Problema momentáneo del navegador/página: se reintenta
+STRUCTURAL = 'ESTRUCTURAL'    # El formulario no calza con lo esperado: un solo reintento, en otra ejecución
+PERMANENT = 'PERMANENTE'      # Reintentar no cambia nada: nunca vuelve al navegador
+
+# Patrones (sobre el texto de result['error'] en minúsculas), evaluados en este orden
+PERMANENT_PATTERNS = [
+    'ya no acepta postulaciones',
+    'postulación externa',
+    'verificar manualmente',
+    'respuestas manuales',
+]
+STRUCTURAL_PATTERNS = [
+    'no se encontró botón',
+    'loop infinito',
+    'límite de pasos',
+    'no such element',
+    'unable to locate element',
+]
+TRANSIENT_PATTERNS = [
+    'modal de aplicación no se abrió',
+    'tiempo límite',
+    'stale element',
+    'timeout',
+    'timed out',
+    'no such window',
+    'invalid session',
+    'chrome not reachable',
+    'disconnected',
+    'connection',
+    'max retries',
+    'net::err',
+    'click intercepted',
+    'not interactable',
+]
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def classify_failure(result: Dict[str, Any]) -> Optional[str]:
+    """
+    Clasifica el resultado de una postulación fallida
+
+    Args:
+        result: Resultado retornado por apply_to_job
+
+    Returns:
+        TRANSIENT, STRUCTURAL o PERMANENT; None si la postulación fue exitosa
+    """
+    status = result.get('status')
+    if result.get('success') or status == 'APPLIED':
+        return None
+    if status == 'ELIMINADO':
+        return PERMANENT
+
+    error = (result.get('error') or '').lower()
+    for category, patterns in ((PERMANENT, PERMANENT_PATTERNS),
+                               (STRUCTURAL, STRUCTURAL_PATTERNS),
+                               (TRANSIENT, TRANSIENT_PATTERNS)):
+        if any(pattern in error for pattern in patterns):
+            return category
+
+    # Sin mensaje reconocible: MANUAL indica un formulario que no se pudo completar,
+    # ERROR/PENDING una excepción del navegador
+    return STRUCTURAL if status == 'MANUAL' else TRANSIENT
+
+
+class RetryQueue:
+    """
+    Cola persistente de trabajos a reintentar (data/logs/retry_queue.json)
+
+    Cada entrada guarda el trabajo, los intentos fallidos y la fecha desde la que
+    puede reintentarse. Los reintentos se toman al final de la ejecución (si ya
+    vencieron) o en la siguiente.
+    """
+
+    def __init__(self, path: str = "data/logs/retry_queue.json", max_retries: int = 3,
+                 backoff_base_seconds: float = 120, logger=None):
+        """
+        Args:
+            path: Archivo donde persistir la cola
+            max_retries: Reintentos máximos por trabajo (reintentos_en_error)
+            backoff_base_seconds: Espera antes del primer reintento (se duplica en cada uno)
+            logger: Logger del proyecto
+        """
+        self.path = Path(path)
+        self.max_retries = max_retries
+        self.backoff_base_seconds = backoff_base_seconds
+        self.logger = logger
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    @classmethod
+    def from_config(cls, yaml_config: Dict[str, Any], logger=None) -> 'RetryQueue':
+        """Crea la cola desde el bloque 'ejecucion' de config.yaml"""
+        ejecucion = yaml_config.get('ejecucion', {}) or {}
+        return cls(
+            max_retries=ejecucion.get('reintentos_en_error', 3),
+            backoff_base_seconds=ejecucion.get('backoff_reintento_segundos', 120),
+            logger=logger
+        )
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            self._log(f"No se pudo leer {self.path}: {str(e)}", warning=True)
+            self.entries = {}
+
+    def save(self):
+        """Guarda la cola de forma atómica"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.path.with_suffix('.json.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_file, self.path)
+
+    def record(self, job: Dict[str, Any], result: Dict[str, Any], run_id: Optional[str] = None) -> Optional[str]:
+        """
+        Registra el resultado de un intento y decide si se reintenta
+
+        Args:
+            job: Datos del trabajo
+            result: Resultado del intento
+            run_id: Ejecución en la que ocurrió
+
+        Returns:
+            Categoría del fallo, o None si fue exitoso
+        """
+        job_id = extract_job_id_from_url(job['url'])
+        category = classify_failure(result)
+
+        if category is None:
+            if self.entries.pop(job_id, None):
+                self.save()
+            return None
+
+        attempts = self.entries.get(job_id, {}).get('attempts', 0) + 1
+        retries_done = attempts - 1
+        limit = 1 if category == STRUCTURAL else self.max_retries
+        next_attempt = None
+
+        if category == PERMANENT:
+            self._log(f"  Fallo permanente, no se reintentará: {result.get('error')}")
+        elif retries_done >= limit:
+            self._log(f"  Reintentos agotados ({retries_done}/{limit}): {result.get('error')}", warning=True)
+        else:
+            next_attempt = datetime.now() + timedelta(seconds=self.backoff_base_seconds * (2 ** retries_done))
+            self._log(f"  Fallo {category.lower()}, reintento {retries_done + 1}/{limit} "
+                      f"desde {next_attempt.strftime('%H:%M:%S')}")
+
+        # Las entradas sin próximo intento se conservan para no volver a abrir el trabajo
+        self.entries[job_id] = {
+            'job': job,
+            'category': category,
+            'attempts': attempts,
+            'last_error': result.get('error'),
+            'last_status': result.get('status'),
+            'run_id': run_id,
+            'next_attempt_at': next_attempt.strftime(DATE_FORMAT) if next_attempt else None
+        }
+
+        self.save()
+        return category
+
+    def due(self, run_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Trabajos cuyo reintento ya venció
+
+        Args:
+            run_id: Ejecución activa (los fallos estructurales solo se reintentan en otra)
+
+        Returns:
+            Lista de trabajos, los más antiguos primero
+        """
+        now = datetime.now().strftime(DATE_FORMAT)
+        ready = [entry for entry in self.entries.values() if self._is_due(entry, run_id, now)]
+        ready.sort(key=lambda entry: entry['next_attempt_at'])
+        return [entry['job'] for entry in ready]
+
+    def is_retry(self, job: Dict[str, Any]) -> bool:
+        """Indica si el trabajo tiene un fallo previo registrado en la cola"""
+        return extract_job_id_from_url(job['url']) in self.entries
+
+    @staticmethod
+    def _is_due(entry: Dict[str, Any], run_id: Optional[str], now: str) -> bool:
+        """El reintento venció y, si es estructural, se está en otra ejecución"""
+        return bool(entry['next_attempt_at']) and entry['next_attempt_at'] <= now \
+            and not (entry['category'] == STRUCTURAL and entry.get('run_id') == run_id)
+
+    def skip_reason(self, job: Dict[str, Any], run_id: Optional[str] = None) -> Optional[str]:
+        """
+        Indica si un trabajo no debe volver al navegador (todavía)
+
+        Un trabajo con fallo registrado solo vuelve cuando su reintento venció
+        (ver due), aunque siga marcado como nuevo en jobs_found.json.
+
+        Args:
+            job: Datos del trabajo
+            run_id: Ejecución activa
+
+        Returns:
+            Motivo (fallo permanente, reintentos agotados o reintento no vencido), o None
+        """
+        entry = self.entries.get(extract_job_id_from_url(job['url']))
+        if not entry:
+            return None
+        if entry['next_attempt_at']:
+            if self._is_due(entry, run_id, datetime.now().strftime(DATE_FORMAT)):
+                return None
+            if entry['category'] == STRUCTURAL and entry.get('run_id') == run_id:
+                return "fallo estructural, se reintenta en otra ejecución"
+            return f"reintento programado desde {entry['next_attempt_at']}"
+        if entry['category'] == PERMANENT:
+            return f"fallo permanente ({entry['last_error']})"
+        return f"reintentos agotados ({entry['last_error']})"
+
+    def __len__(self) -> int:
+        """Trabajos con un reintento programado"""
+        return sum(1 for entry in self.entries.values() if entry['next_attempt_at'])
+
+    def _log(self, message: str, warning: bool = False):
+        if not self.logger:
+            print(message)
+        elif warning:
+            self.logger.warning(message)
+        else:
+            self.logger.info(message)
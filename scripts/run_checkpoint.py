@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Run Checkpoint
+Checkpoints por trabajo para que el applier pueda reanudarse tras una caída
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from utils import extract_job_id_from_url
+
+
+# Estados de un trabajo dentro de una ejecución
+CLAIMED = 'CLAIMED'            # Seleccionado para esta ejecución
+IN_PROGRESS = 'IN_PROGRESS'    # Navegador trabajando en la postulación
+SUBMITTING = 'SUBMITTING'      # Click en "Enviar" en curso (puede haberse enviado)
+DONE = 'DONE'                  # Terminado, con resultado
+
+
+class ApplyCheckpoint:
+    """
+    Registro append-only (JSONL) del estado de cada trabajo del applier
+
+    Cada transición se escribe con fsync antes de continuar, de modo que si el
+    proceso muere se puede reconstruir exactamente qué trabajos terminaron y
+    cuáles pudieron haber enviado la postulación.
+    """
+
+    def __init__(self, path: str = "data/logs/apply_checkpoint.jsonl"):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.run_id: Optional[str] = None
+        self.runs: Dict[str, Dict[str, Any]] = {}   # run_id -> {'ended': bool, 'order': [job_id]}
+        self.jobs: Dict[str, Dict[str, Any]] = {}   # job_id -> último estado conocido
+
+        self._load()
+
+    def _load(self):
+        """Reconstruye el estado reproduciendo el log"""
+        if not self.path.exists():
+            return
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Última línea truncada por una caída
+                self._apply(record)
+
+    def _apply(self, record: Dict[str, Any]):
+        """Aplica un registro al estado en memoria"""
+        event = record.get('event')
+        run_id = record.get('run_id')
+
+        if event == 'run_start':
+            self.runs.setdefault(run_id, {'ended': False, 'order': []})
+        elif event == 'run_end':
+            self.runs.setdefault(run_id, {'ended': False, 'order': []})['ended'] = True
+        elif event == 'job':
+            job_id = record['job_id']
+            run = self.runs.setdefault(run_id, {'ended': False, 'order': []})
+            if record['state'] == DONE:
+                # Un reintento en la misma ejecución reemplaza al resultado anterior
+                if job_id in run['order']:
+                    run['order'].remove(job_id)
+                run['order'].append(job_id)
+            previous = self.jobs.get(job_id, {})
+            self.jobs[job_id] = {
+                'run_id': run_id,
+                'state': record['state'],
+                'result': record.get('result'),
+                'job': record.get('job_data') or previous.get('job'),
+                # Una vez alcanzado SUBMITTING el trabajo queda marcado para siempre
+                'submitted': previous.get('submitted', False) or record['state'] == SUBMITTING
+            }
+
+    def _write(self, record: Dict[str, Any]):
+        """Escribe un registro de forma durable y lo aplica en memoria"""
+        record['ts'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self._apply(record)
+
+    def start_run(self, resume: bool = False) -> str:
+        """
+        Inicia (o reanuda) una ejecución
+
+        Args:
+            resume: Reanudar la última ejecución si no terminó
+
+        Returns:
+            ID de la ejecución activa
+        """
+        last_run_id = next(reversed(self.runs), None) if self.runs else None
+        if resume and last_run_id and not self.runs[last_run_id]['ended']:
+            self.run_id = last_run_id
+            self._close_interrupted_submits()
+            return self.run_id
+
+        self.run_id = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        self._write({'event': 'run_start', 'run_id': self.run_id})
+        self._close_interrupted_submits()
+        return self.run_id
+
+    def _close_interrupted_submits(self):
+        """
+        Cierra como MANUAL los trabajos que quedaron en SUBMITTING tras una caída
+
+        No se sabe si LinkedIn recibió la postulación, así que se reportan para
+        verificación manual en vez de reintentarse.
+        """
+        for state in list(self.jobs.values()):
+            if state['state'] != SUBMITTING or not state.get('job'):
+                continue
+            job = state['job']
+            self.finish(job, {
+                'job_url': job['url'],
+                'job_title': job.get('title', 'N/A'),
+                'company': job.get('company', 'N/A'),
+                'success': False,
+                'status': 'MANUAL',
+                'error': "Ejecución interrumpida durante el envío - verificar manualmente",
+                'questions_encountered': [],
+                'cv_used': None
+            })
+
+    def end_run(self):
+        """Marca la ejecución activa como terminada"""
+        self._write({'event': 'run_end', 'run_id': self.run_id})
+
+    def _job_event(self, job: Dict[str, Any], state: str, **extra):
+        self._write({
+            'event': 'job',
+            'run_id': self.run_id,
+            'job_id': extract_job_id_from_url(job['url']),
+            'state': state,
+            **extra
+        })
+
+    def claim(self, job: Dict[str, Any]):
+        """Registra que el trabajo fue tomado por esta ejecución"""
+        self._job_event(job, CLAIMED, job_data=job)
+
+    def mark_in_progress(self, job: Dict[str, Any]):
+        """Registra que el navegador comenzó a postular"""
+        self._job_event(job, IN_PROGRESS)
+
+    def mark_submitting(self, job: Dict[str, Any]):
+        """Registra que se va a hacer click en "Enviar" (punto de no retorno)"""
+        self._job_event(job, SUBMITTING)
+
+    def finish(self, job: Dict[str, Any], result: Dict[str, Any]):
+        """Registra el resultado final del trabajo"""
+        self._job_event(job, DONE, result=result)
+
+    def get_state(self, job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Último estado conocido de un trabajo (de cualquier ejecución)"""
+        return self.jobs.get(extract_job_id_from_url(job['url']))
+
+    def skip_reason(self, job: Dict[str, Any]) -> Optional[str]:
+        """
+        Indica si un trabajo no debe intentarse en la ejecución activa
+
+        Args:
+            job: Datos del trabajo
+
+        Returns:
+            Motivo para omitirlo, o None si se puede postular
+        """
+        state = self.get_state(job)
+        if not state:
+            return None
+
+        # Garantía: una postulación enviada (o posiblemente enviada) nunca se repite
+        if state.get('submitted') or (state.get('result') or {}).get('status') == 'APPLIED':
+            return "postulación ya enviada (o posiblemente enviada)"
+
+        if state['state'] == DONE and state['run_id'] == self.run_id:
+            return "ya procesado en esta ejecución"
+
+        return None
+
+    def run_results(self) -> List[Dict[str, Any]]:
+        """Resultados de la ejecución activa, en orden de término"""
+        run = self.runs.get(self.run_id, {'order': []})
+        return [self.jobs[job_id]['result'] for job_id in run['order']
+                if self.jobs[job_id]['run_id'] == self.run_id and self.jobs[job_id].get('result')]
+
+    def history(self) -> List[Dict[str, Any]]:
+        """Último resultado de cada trabajo terminado, de todas las ejecuciones"""
+        return [state['result'] for state in self.jobs.values()
+                if state['state'] == DONE and state.get('result')]
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Run Controller
+Controla el presupuesto de tiempo de una ejecución del applier: límite global,
+límite por trabajo, watchdog para llamadas WebDriver colgadas y delay entre trabajos
+"""
+
+import threading
+import time
+from typing import Dict, Any, Callable, Optional, Tuple
+
+
+# Segundos extra que se le dan al trabajo tras su límite antes de darlo por colgado
+WATCHDOG_GRACE_SECONDS = 5
+
+
+class JobDeadlineExceeded(Exception):
+    """El trabajo actual superó su tiempo límite"""
+
+
+class JobAbandoned(JobDeadlineExceeded):
+    """El watchdog abandonó el trabajo: su thread ya no debe tocar el driver ni el estado compartido"""
+
+
+class JobContext:
+    """Deadline y señal de cancelación de un intento (cada trabajo tiene el suyo)"""
+
+    def __init__(self, deadline: float):
+        self.deadline = deadline
+        self.cancelled = threading.Event()
+
+    def check(self):
+        """Lanza JobAbandoned si el watchdog lo canceló o JobDeadlineExceeded si se pasó del límite"""
+        if self.cancelled.is_set():
+            raise JobAbandoned("Trabajo abandonado por el watchdog")
+        if time.monotonic() >= self.deadline:
+            raise JobDeadlineExceeded("Tiempo límite por trabajo excedido")
+
+
+class RunController:
+    """
+    Presupuesto de tiempo de una ejecución
+
+    - Límite global (tiempo_limite_minutos): no se inicia un trabajo si no queda
+      tiempo para completarlo.
+    - Límite por trabajo: el applier lo revisa entre fases (cooperativo) y un
+      watchdog abandona el trabajo si sigue corriendo después del límite.
+    - Timeout HTTP de cada comando WebDriver, para que ninguna llamada quede
+      bloqueada indefinidamente.
+    """
+
+    def __init__(self, time_limit_minutes: float = 60, job_timeout_seconds: float = 180,
+                 command_timeout_seconds: float = 60, delay_seconds: float = 10, logger=None):
+        """
+        Args:
+            time_limit_minutes: Presupuesto total de la ejecución
+            job_timeout_seconds: Tiempo máximo por trabajo
+            command_timeout_seconds: Tiempo máximo de un comando WebDriver
+            delay_seconds: Espera entre postulaciones
+            logger: Logger del proyecto
+        """
+        self.time_limit = time_limit_minutes * 60
+        self.job_timeout = job_timeout_seconds
+        self.command_timeout = command_timeout_seconds
+        self.delay = delay_seconds
+        self.logger = logger
+
+        self.started_at = time.monotonic()
+        self.first_job_at: Optional[float] = None
+
+        self.job_durations = []
+        self.delay_seconds_spent = 0.0
+        self.jobs_timed_out = 0
+        self.jobs_abandoned = 0
+        self.jobs_skipped = 0
+
+    @classmethod
+    def from_config(cls, yaml_config: Dict[str, Any], logger=None) -> 'RunController':
+        """Crea el controlador desde el bloque 'ejecucion' de config.yaml"""
+        ejecucion = yaml_config.get('ejecucion', {}) or {}
+        return cls(
+            time_limit_minutes=ejecucion.get('tiempo_limite_minutos', 60),
+            job_timeout_seconds=ejecucion.get('tiempo_limite_por_trabajo_segundos', 180),
+            command_timeout_seconds=ejecucion.get('timeout_comando_webdriver_segundos', 60),
+            delay_seconds=ejecucion.get('delay_entre_aplicaciones_segundos', 10),
+            logger=logger
+        )
+
+    def install_command_timeout(self):
+        """
+        Aplica el timeout HTTP a los comandos WebDriver
+
+        Debe llamarse antes de crear el driver: Selenium fija el timeout al
+        construir la conexión.
+        """
+        from selenium.webdriver.remote.remote_connection import RemoteConnection
+        RemoteConnection.set_timeout(self.command_timeout)
+
+    def configure_driver(self, driver):
+        """Aplica timeouts de carga de página y scripts al driver (menores que el del comando)"""
+        page_timeout = max(self.command_timeout - 5, 10)
+        driver.set_page_load_timeout(page_timeout)
+        driver.set_script_timeout(page_timeout)
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def remaining(self) -> float:
+        return max(self.time_limit - self.elapsed(), 0.0)
+
+    def has_time_for_job(self) -> bool:
+        """Indica si queda presupuesto para iniciar otro trabajo"""
+        if self.job_durations:
+            expected = sum(self.job_durations) / len(self.job_durations)
+        else:
+            expected = self.job_timeout / 2
+        return self.remaining() >= min(expected, self.job_timeout)
+
+    def job_deadline(self) -> float:
+        """Deadline absoluto (time.monotonic) para el próximo trabajo"""
+        return time.monotonic() + min(self.job_timeout, self.remaining())
+
+    def job_context(self) -> JobContext:
+        """Contexto (deadline + cancelación) para el próximo trabajo"""
+        return JobContext(self.job_deadline())
+
+    def run_job(self, func: Callable[[], Any], context: JobContext,
+                on_abandon: Optional[Callable[[], None]] = None) -> Tuple[bool, Any]:
+        """
+        Ejecuta un trabajo bajo el watchdog
+
+        Args:
+            func: Función que postula al trabajo y retorna su resultado
+            context: Contexto del trabajo (ver job_context); se cancela si se abandona
+            on_abandon: Se llama si el trabajo sigue colgado tras el límite
+                        (ej: reiniciar el driver para liberar la llamada bloqueada)
+
+        Returns:
+            Tupla (terminó, resultado). Si el trabajo fue abandonado, (False, None)
+        """
+        if self.first_job_at is None:
+            self.first_job_at = time.monotonic()
+
+        outcome = {}
+
+        def target():
+            try:
+                outcome['result'] = func()
+            except BaseException as e:
+                outcome['error'] = e
+
+        start = time.monotonic()
+        worker = threading.Thread(target=target, name="apply-job", daemon=True)
+        worker.start()
+        worker.join(max(context.deadline - start, 0) + WATCHDOG_GRACE_SECONDS)
+
+        if worker.is_alive():
+            self.jobs_abandoned += 1
+            self._log_warning("  ⏱ Trabajo colgado después de su tiempo límite, abandonándolo")
+            # Antes de tocar el driver: el thread abandonado deja de escribir estado compartido
+            context.cancelled.set()
+            if on_abandon:
+                try:
+                    on_abandon()
+                except Exception as e:
+                    self._log_warning(f"  Error recuperando el driver: {str(e)}")
+            # Dar tiempo a que la llamada bloqueada falle antes de seguir con el driver
+            worker.join(self.command_timeout)
+            self.job_durations.append(time.monotonic() - start)
+            return False, None
+
+        self.job_durations.append(time.monotonic() - start)
+
+        if 'error' in outcome:
+            raise outcome['error']
+
+        if time.monotonic() > context.deadline:
+            self.jobs_timed_out += 1
+        return True, outcome.get('result')
+
+    def wait_between_jobs(self):
+        """Espera el delay configurado entre postulaciones (sin exceder el presupuesto)"""
+        wait = min(self.delay, self.remaining())
+        if wait > 0:
+            time.sleep(wait)
+            self.delay_seconds_spent += wait
+
+    def report(self) -> Dict[str, Any]:
+        """Resumen de cómo se gastó el presupuesto de la ejecución"""
+        elapsed = self.elapsed()
+        in_jobs = sum(self.job_durations)
+        setup = (self.first_job_at - self.started_at) if self.first_job_at else elapsed
+        return {
+            'limite_segundos': round(self.time_limit, 1),
+            'transcurrido_segundos': round(elapsed, 1),
+            'restante_segundos': round(self.remaining(), 1),
+            'preparacion_segundos': round(setup, 1),
+            'en_trabajos_segundos': round(in_jobs, 1),
+            'en_delays_segundos': round(self.delay_seconds_spent, 1),
+            'otros_segundos': round(max(elapsed - setup - in_jobs - self.delay_seconds_spent, 0), 1),
+            'trabajos_ejecutados': len(self.job_durations),
+            'trabajos_con_timeout': self.jobs_timed_out,
+            'trabajos_abandonados': self.jobs_abandoned,
+            'trabajos_sin_presupuesto': self.jobs_skipped,
+            'duracion_promedio_segundos': round(in_jobs / len(self.job_durations), 1) if self.job_durations else 0,
+            'duracion_maxima_segundos': round(max(self.job_durations), 1) if self.job_durations else 0
+        }
+
+    def _log_warning(self, message: str):
+        if self.logger:
+            self.logger.warning(message)
+        else:
+            print(message)
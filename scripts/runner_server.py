@@ -1,17 +1,18 @@
-from flask import Flask, jsonify, request
-import subprocess
-import threading
-import shlex
+from flask import Flask, jsonify, request, Response, stream_with_context
+import json
 import os
 import sys
 from datetime import datetime
-from pathlib import Path
+from urllib.parse import urlparse
 
 # Agregar scripts a path para imports
 scripts_path = os.path.join(os.path.dirname(os.path.abspath(__file__)))
 if scripts_path not in sys.path:
     sys.path.insert(0, scripts_path)
 
+from job_runner import JobManager, QueueFullError
+from worker_pool import WorkerPool
+
 app = Flask(__name__)
 
 # Setup logging
@@ -31,51 +32,109 @@ def log_message(msg):
         print(f"Error writing to log: {e}")
 
 
-def run_command(cmd):
-    try:
-        log_message(f"Ejecutando comando: {cmd}")
-        # Run command and capture output
-        completed = subprocess.run(cmd, shell=True, capture_output=True, text=True, cwd='/app')
-        log_message(f"Comando completado: returncode={completed.returncode}")
-        if completed.stdout:
-            log_message(f"STDOUT: {completed.stdout[:500]}")  # Limitar a 500 chars
-        if completed.stderr:
-            log_message(f"STDERR: {completed.stderr[:500]}")
-        return {
-            'returncode': completed.returncode,
-            'stdout': completed.stdout,
-            'stderr': completed.stderr
-        }
-    except Exception as e:
-        log_message(f"Error ejecutando comando: {str(e)}")
-        return {'returncode': 1, 'stdout': '', 'stderr': str(e)}
+# Comandos disponibles: nombre -> (comando, tipo). La concurrencia se limita por
+# tipo (applier y applier_resume comparten navegador/sesión de LinkedIn)
+JOB_COMMANDS = {
+    'scraper': ('python scripts/linkedin_scraper.py', 'scraper'),
+    'applier': ('python scripts/linkedin_applier.py', 'applier'),
+    'applier_resume': ('python scripts/linkedin_applier.py --resume', 'applier'),
+    'sync': ('python scripts/google_sheets_manager.py', 'sync')
+}
+
+job_manager = JobManager(
+    jobs_dir='/app/data/logs/runner_jobs',
+    max_queue=20,
+    concurrency={'scraper': 1, 'applier': 1, 'sync': 1},
+    cwd='/app',
+    log=log_message
+)
+
+
+def is_http_url(url):
+    """True si url es una URL http(s) con host (destino válido para el webhook)"""
+    parsed = urlparse(url)
+    return parsed.scheme in ('http', 'https') and bool(parsed.netloc)
 
 
 @app.route('/run/<name>', methods=['POST', 'GET'])
 def run(name):
+    """Encola un comando. Por defecto espera el resultado (n8n); con async=true devuelve el job_id"""
     log_message(f"Recibido request /run/{name}")
-    # Map friendly names to scripts
-    mapping = {
-        'scraper': 'python scripts/linkedin_scraper.py',
-        'applier': 'python scripts/linkedin_applier.py',
-        'sync': 'python scripts/google_sheets_manager.py'
-    }
-
-    if name not in mapping:
+
+    if name not in JOB_COMMANDS:
         log_message(f"Error: job desconocido '{name}'")
         return jsonify({'error': 'unknown job'}), 404
 
-    cmd = mapping[name]
+    cmd, job_type = JOB_COMMANDS[name]
+    body = request.get_json(silent=True) or {}
+    webhook = request.args.get('webhook') or body.get('webhook')
+    if webhook and not is_http_url(webhook):
+        log_message(f"Rechazado /run/{name}: webhook inválido '{webhook}'")
+        return jsonify({'error': 'webhook must be an http(s) URL'}), 400
+
+    try:
+        job = job_manager.submit(name, cmd, job_type=job_type, webhook=webhook)
+    except QueueFullError as e:
+        log_message(f"Rechazado /run/{name}: {e}")
+        return jsonify({'error': str(e)}), 429
 
-    # Optionally run asynchronously if requested
     if request.args.get('async', 'false').lower() in ('1', 'true', 'yes'):
-        log_message(f"Iniciando ejecución asincrónica: {cmd}")
-        thread = threading.Thread(target=run_command, args=(cmd,))
-        thread.start()
-        return jsonify({'status': 'started', 'cmd': cmd}), 202
+        return jsonify({
+            'status': job.status,
+            'job_id': job.id,
+            'status_url': f'/jobs/{job.id}',
+            'cmd': cmd
+        }), 202
+
+    return jsonify(job_manager.wait(job.id))
+
+
+@app.route('/jobs', methods=['GET'])
+def jobs_list():
+    """Trabajos recientes (sin salida) y estado de la cola"""
+    return jsonify({'jobs': job_manager.list(), 'queue': job_manager.stats()}), 200
 
-    result = run_command(cmd)
-    return jsonify(result)
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Estado, resultado y duración de un trabajo"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': 'unknown job id'}), 404
+    return jsonify(job), 200
+
+
+@app.route('/jobs/<job_id>/stream', methods=['GET'])
+def job_stream(job_id):
+    """
+    Sigue la salida de un trabajo en vivo (server-sent events)
+    
+    Cada línea es un evento 'stdout' o 'stderr' con id = número de línea; al
+    reconectar se continúa desde Last-Event-ID (o ?desde=N). Termina con un
+    evento 'end' que trae el resultado.
+    """
+    if job_manager.get(job_id) is None:
+        return jsonify({'error': 'unknown job id'}), 404
+    
+    since = request.headers.get('Last-Event-ID') or request.args.get('desde') or 0
+    try:
+        since = int(since)
+    except ValueError:
+        since = 0
+    
+    def events():
+        for kind, payload in job_manager.follow(job_id, since=since):
+            if kind == 'line':
+                seq, stream, line = payload
+                text = line.rstrip('\r\n')
+                yield f"id: {seq}\nevent: {stream}\ndata: {text}\n\n"
+            elif kind == 'heartbeat':
+                yield ": keep-alive\n\n"
+            elif kind == 'end':
+                yield f"event: end\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+    
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 
 @app.route('/notify/telegram', methods=['POST', 'GET'])
@@ -194,6 +253,17 @@ def notify_telegram():
         return jsonify({'status': 'error', 'message': str(e)}), 200
 
 
+@app.route('/metrics/latest', methods=['GET'])
+def metrics_latest():
+    """Desglose de tiempo por fase de la última ejecución del applier"""
+    from metrics import load_latest
+    include_spans = request.args.get('spans', 'false').lower() in ('1', 'true', 'yes')
+    report = load_latest('/app/data/logs/application_metrics.json', include_spans=include_spans)
+    if report is None:
+        return jsonify({'error': 'no metrics yet'}), 404
+    return jsonify(report), 200
+
+
 @app.route('/health', methods=['GET'])
 def health():
     """Health check endpoint"""
@@ -202,6 +272,11 @@ def health():
 
 
 if __name__ == '__main__':
+    # Solo en el proceso principal: los procesos de trabajo reimportan este módulo
+    if os.environ.get('RUNNER_WARM_WORKERS', '1') != '0':
+        job_manager.worker_pool = WorkerPool(cwd='/app', log=log_message)
+        job_manager.worker_pool.start()
+        log_message("Worker pool activado (forkserver con dependencias precargadas)")
     log_message("Iniciando Flask runner server en 0.0.0.0:5000")
     app.run(host='0.0.0.0', port=5000, debug=False)
 
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Sheets Archive
+Archivo por mes de las filas cerradas de Postulaciones e índice local de IDs archivados
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+from utils import extract_job_id_from_url
+
+
+ARCHIVE_INDEX_FILE = "data/logs/archived_ids.json"
+ARCHIVE_PREFIX = 'Archivo_'
+
+# Estados cerrados: la fila ya no va a cambiar (o lleva demasiado sin respuesta)
+DEFAULT_ARCHIVE_STATUSES = ['APPLIED', 'ERROR', 'ELIMINADO', 'RECHAZADO', 'CANCELADO']
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def archive_title(date: datetime) -> str:
+    """Nombre de la hoja de archivo de un mes (ej: Archivo_2026_08)"""
+    return f"{ARCHIVE_PREFIX}{date.strftime('%Y_%m')}"
+
+
+def _parse_date(value: str) -> Optional[datetime]:
+    try:
+        return datetime.strptime(value, DATE_FORMAT)
+    except (TypeError, ValueError):
+        return None
+
+
+class ArchiveIndex:
+    """
+    Índice local Job ID -> {id, url, hoja, tipo, estado} de las postulaciones archivadas
+
+    Permite deduplicar contra el archivo sin leer las hojas Archivo_*. Si el
+    archivo local no existe se reconstruye desde esas hojas (ver rebuild).
+    """
+
+    def __init__(self, path: str = ARCHIVE_INDEX_FILE):
+        self.path = Path(path)
+        self.entries: Dict[str, Dict[str, str]] = self._load()
+
+    @property
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def job_ids(self) -> set:
+        return set(self.entries)
+
+    def urls(self) -> set:
+        return {entry['url'] for entry in self.entries.values() if entry.get('url')}
+
+    def max_id(self) -> int:
+        """Mayor ID de Postulaciones archivado (los IDs nuevos deben superarlo)"""
+        ids = [entry.get('id', '') for entry in self.entries.values()]
+        return max([int(row_id) for row_id in ids if str(row_id).isdigit()], default=0)
+
+    def add(self, row: List[str], title: str):
+        """Registra una fila de Postulaciones archivada en la hoja title"""
+        self.entries[extract_job_id_from_url(row[4])] = {
+            'id': row[0], 'url': row[4], 'hoja': title, 'tipo': row[6], 'estado': row[8]
+        }
+
+    def rebuild(self, spreadsheet, titles: List[str]):
+        """
+        Reconstruye el índice leyendo las columnas ID a Estado de las hojas de archivo
+
+        Args:
+            spreadsheet: Spreadsheet de gspread
+            titles: Hojas de archivo (una sola lectura para todas)
+        """
+        self.entries = {}
+        if titles:
+            response = spreadsheet.values_batch_get([f"'{title}'!A2:I" for title in titles])
+            for title, value_range in zip(titles, response.get('valueRanges', [])):
+                for values in value_range.get('values', []):
+                    row = [str(value) for value in values] + [''] * (9 - len(values))
+                    if row[4]:
+                        self.add(row, title)
+        self.save()
+
+    def _load(self) -> Dict[str, Dict[str, str]]:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return {}
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.path.with_suffix('.json.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False)
+        os.replace(tmp_file, self.path)
+
+
+class SheetsArchiver:
+    """
+    Mueve las filas cerradas y antiguas de Postulaciones a hojas Archivo_YYYY_MM
+
+    Una fila se archiva si su estado está en statuses y no tuvo actividad
+    ('Último Update') en max_age_days. El orden es: agregar a las hojas de
+    archivo, guardar el índice local y recién entonces borrar de Postulaciones,
+    así una ejecución interrumpida no pierde filas (las ya indexadas solo se borran).
+    """
+
+    def __init__(self, sheets_manager, max_age_days: int = 60,
+                 statuses: Optional[List[str]] = None, logger=None):
+        """
+        Args:
+            sheets_manager: GoogleSheetsManager
+            max_age_days: Días sin actividad para archivar una fila
+            statuses: Estados archivables
+            logger: Logger del proyecto
+        """
+        self.manager = sheets_manager
+        self.max_age = timedelta(days=max_age_days)
+        self.statuses = set(statuses or DEFAULT_ARCHIVE_STATUSES)
+        self.logger = logger
+
+    @classmethod
+    def from_config(cls, yaml_config: Dict[str, Any], sheets_manager, logger=None) -> 'SheetsArchiver':
+        """Crea el archivador desde el bloque 'archivo' de config.yaml"""
+        settings = yaml_config.get('archivo', {}) or {}
+        return cls(
+            sheets_manager,
+            max_age_days=settings.get('dias_sin_actividad', 60),
+            statuses=settings.get('estados'),
+            logger=logger
+        )
+
+    def select(self, rows: List[List[str]], now: datetime) -> List[Tuple[int, List[str]]]:
+        """
+        Filas archivables
+
+        Returns:
+            Lista de (número de fila en la hoja, fila)
+        """
+        cutoff = now - self.max_age
+        selected = []
+        for row_number, row in enumerate(rows[1:], start=2):
+            if not row[4] or row[8] not in self.statuses:
+                continue
+            last_activity = _parse_date(row[9]) or _parse_date(row[1])
+            if last_activity and last_activity < cutoff:
+                selected.append((row_number, row))
+        return selected
+
+    def archive(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Archiva las filas cerradas
+
+        Returns:
+            Resumen con filas archivadas y hojas usadas
+        """
+        now = now or datetime.now()
+        rows = self.manager.get_postulaciones_rows(verify=True)
+        selected = self.select(rows, now)
+        summary = {'archivadas': 0, 'hojas': []}
+        if not selected:
+            self._log("Archivo: no hay filas para archivar")
+            return summary
+
+        # Agregar a las hojas de archivo (un append por mes, en una sola tanda)
+        index = self.manager.get_archive_index()
+        by_title: Dict[str, List[List[str]]] = {}
+        for _, row in selected:
+            if extract_job_id_from_url(row[4]) in index:
+                continue  # Ya archivada por una ejecución interrumpida: solo falta borrarla
+            when = _parse_date(row[1]) or _parse_date(row[9]) or now
+            by_title.setdefault(archive_title(when), []).append(row)
+
+        for title, archive_rows in by_title.items():
+            self.manager.queue_append(title, archive_rows, headers=rows[0])
+        self.manager.flush_queued(titles=set(by_title))
+
+        for title, archive_rows in by_title.items():
+            for row in archive_rows:
+                index.add(row, title)
+        index.save()
+
+        # Recién con el índice guardado se borran de la hoja activa
+        self.manager.delete_postulaciones_rows([row_number for row_number, _ in selected])
+
+        summary['archivadas'] = len(selected)
+        summary['hojas'] = sorted(by_title)
+        self._log(f"✓ Archivo: {len(selected)} filas movidas a {', '.join(summary['hojas']) or 'archivo'}")
+        return summary
+
+    def _log(self, message: str):
+        if self.logger:
+            self.logger.info(message)
+        else:
+            print(message)
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Sheets Client
+Cliente de gspread con presupuesto de cuota compartido, backoff ante 429/5xx,
+agrupación de escrituras por hoja y sesiones compartidas por proceso
+"""
+
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+import gspread
+import requests
+from google.oauth2.service_account import Credentials
+from gspread.client import Client
+from gspread.exceptions import APIError
+
+
+# Cuota por defecto de la API de Sheets: 60 requests por minuto por usuario
+DEFAULT_REQUESTS_PER_MINUTE = 60
+DEFAULT_BURST = 10
+
+SCOPES = [
+    'https://www.googleapis.com/auth/spreadsheets',
+    'https://www.googleapis.com/auth/drive'
+]
+
+# Respuestas que se reintentan (5xx solo en requests idempotentes; 429 en todas)
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+MAX_RETRIES = 6
+BACKOFF_BASE_SECONDS = 1
+BACKOFF_MAX_SECONDS = 64
+
+
+class TokenBucket:
+    """Token bucket thread-safe: acquire() bloquea hasta que haya un token"""
+
+    def __init__(self, rate_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE, capacity: int = DEFAULT_BURST):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Toma un token, esperando si hace falta
+
+        Returns:
+            Segundos esperados
+        """
+        start = time.monotonic()
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return now - start
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def penalize(self):
+        """Vacía el bucket tras un 429 para que los demás threads también frenen"""
+        with self._lock:
+            self.tokens = min(self.tokens, 0.0)
+
+
+# Bucket compartido por todos los clientes del proceso (todos consumen la misma cuota)
+_shared_bucket = TokenBucket()
+
+
+class QuotaAwareClient(Client):
+    """
+    gspread.Client que pasa cada request por el token bucket compartido y
+    reintenta con backoff exponencial con jitter
+
+    Un 429 siempre se reintenta (la API rechazó la request sin aplicarla). Los
+    5xx y errores de red solo en requests idempotentes (lecturas y escrituras
+    de rangos fijos): un values:append que falló así pudo haberse aplicado y
+    reintentarlo duplicaría filas.
+    """
+
+    def __init__(self, auth, session=None, bucket: Optional[TokenBucket] = None):
+        super().__init__(auth, session)
+        self.bucket = bucket or _shared_bucket
+        self._stats_lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Reinicia los contadores (al comienzo de cada ejecución)"""
+        with self._stats_lock:
+            self.stats = {'llamadas': 0, 'reintentos': 0, 'errores': 0, 'espera_cuota_segundos': 0.0}
+
+    def _count(self, key: str, amount: float = 1):
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    @staticmethod
+    def _is_idempotent(method: str, endpoint: str) -> bool:
+        """GET, values:batchUpdate y values.update (PUT) pueden repetirse sin efectos extra"""
+        method = method.upper()
+        if method == 'GET':
+            return True
+        if method == 'POST':
+            return endpoint.endswith('/values:batchUpdate')
+        return method == 'PUT' and '/values/' in endpoint
+
+    def request(self, method, endpoint, params=None, data=None, json=None, files=None, headers=None):
+        idempotent = self._is_idempotent(method, endpoint)
+        for attempt in range(MAX_RETRIES + 1):
+            self._count('espera_cuota_segundos', self.bucket.acquire())
+            self._count('llamadas')
+            try:
+                return super().request(method, endpoint, params=params, data=data, json=json,
+                                       files=files, headers=headers)
+            except APIError as e:
+                status = getattr(e.response, 'status_code', None)
+                retryable = status == 429 or (idempotent and status in RETRY_STATUS_CODES)
+                if not retryable or attempt == MAX_RETRIES:
+                    self._count('errores')
+                    raise
+                if status == 429:
+                    self.bucket.penalize()
+            except (requests.ConnectionError, requests.Timeout):
+                if not idempotent or attempt == MAX_RETRIES:
+                    self._count('errores')
+                    raise
+
+            self._count('reintentos')
+            delay = min(BACKOFF_BASE_SECONDS * (2 ** attempt), BACKOFF_MAX_SECONDS)
+            time.sleep(delay * random.uniform(0.5, 1.5))
+
+
+class RequestCoalescer:
+    """
+    Agrupa operaciones encoladas por hoja y las envía en el mínimo de llamadas
+
+    Por cada hoja: un append_rows con todas las filas y un batch_update con
+    todos los rangos.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._appends: Dict[str, Tuple[gspread.Worksheet, List[List[Any]]]] = {}
+        self._updates: Dict[str, Tuple[gspread.Worksheet, List[Dict[str, Any]]]] = {}
+
+    def append(self, worksheet: gspread.Worksheet, rows: List[List[Any]]):
+        """Encola filas para agregar al final de la hoja"""
+        with self._lock:
+            self._appends.setdefault(worksheet.title, (worksheet, []))[1].extend(rows)
+
+    def update(self, worksheet: gspread.Worksheet, range_name: str, values: List[List[Any]]):
+        """Encola la escritura de un rango (A1)"""
+        with self._lock:
+            self._updates.setdefault(worksheet.title, (worksheet, []))[1].append(
+                {'range': range_name, 'values': values}
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._appends) + len(self._updates)
+
+    def written_titles(self) -> set:
+        """Hojas con escrituras (append o update) encoladas"""
+        with self._lock:
+            return set(self._appends) | set(self._updates)
+
+    def flush(self, titles: Optional[Set[str]] = None) -> int:
+        """
+        Envía lo encolado (appends antes que updates)
+
+        Si una llamada falla, lo encolado se descarta: quien encoló conserva su
+        propio estado y reintenta (ej: SheetsBatchWriter).
+
+        Args:
+            titles: Enviar solo lo encolado para estas hojas (por defecto, todo)
+
+        Returns:
+            Cantidad de llamadas a la API realizadas
+        """
+        with self._lock:
+            appends = self._take(self._appends, titles)
+            updates = self._take(self._updates, titles)
+
+        calls = 0
+        for worksheet, rows in appends.values():
+            worksheet.append_rows(rows)
+            calls += 1
+        for worksheet, data in updates.values():
+            worksheet.batch_update(data)
+            calls += 1
+        return calls
+
+    @staticmethod
+    def _take(queued: Dict[str, Any], titles: Optional[Set[str]]) -> Dict[str, Any]:
+        """Saca de una cola las entradas de las hojas pedidas (todas si titles es None)"""
+        selected = {title: entry for title, entry in queued.items() if titles is None or title in titles}
+        for title in selected:
+            del queued[title]
+        return selected
+
+
+class SheetsSession:
+    """
+    Conexión perezosa y compartida a un spreadsheet
+
+    Nada toca la red hasta el primer uso de client/spreadsheet/worksheet. El
+    cliente autorizado (y su pool de conexiones HTTP) se comparte entre todas
+    las sesiones con el mismo archivo de credenciales, y los handles de hojas
+    se cargan todos con una sola lectura de metadata.
+    """
+
+    def __init__(self, credentials_path: str, spreadsheet_id: str, scopes: Optional[List[str]] = None):
+        self.credentials_path = Path(credentials_path)
+        self.spreadsheet_id = spreadsheet_id
+        self.scopes = scopes or SCOPES
+        self._spreadsheet: Optional[gspread.Spreadsheet] = None
+        self._worksheets: Optional[Dict[str, gspread.Worksheet]] = None
+        self._lock = threading.RLock()
+
+    @property
+    def connected(self) -> bool:
+        return self._spreadsheet is not None
+
+    @property
+    def client(self) -> QuotaAwareClient:
+        return get_client(str(self.credentials_path), self.scopes)
+
+    @property
+    def spreadsheet(self) -> gspread.Spreadsheet:
+        with self._lock:
+            if self._spreadsheet is None:
+                try:
+                    self._spreadsheet = self.client.open_by_key(self.spreadsheet_id)
+                    print("✓ Autenticado con Google Sheets")
+                except Exception as e:
+                    print(f"✗ Error autenticando: {str(e)}")
+                    raise
+            return self._spreadsheet
+
+    def worksheet(self, title: str, refresh: bool = False) -> gspread.Worksheet:
+        """
+        Handle de una hoja (cacheado)
+
+        Raises:
+            gspread.WorksheetNotFound: Si la hoja no existe
+        """
+        with self._lock:
+            if self._worksheets is None or (refresh and title not in self._worksheets):
+                self._worksheets = {ws.title: ws for ws in self.spreadsheet.worksheets()}
+            if title not in self._worksheets:
+                raise gspread.WorksheetNotFound(title)
+            return self._worksheets[title]
+
+    def titles(self) -> List[str]:
+        """Nombres de las hojas del spreadsheet (desde el cache de metadata)"""
+        with self._lock:
+            if self._worksheets is None:
+                self._worksheets = {ws.title: ws for ws in self.spreadsheet.worksheets()}
+            return list(self._worksheets)
+
+    def register(self, worksheet: gspread.Worksheet):
+        """Agrega al cache una hoja recién creada"""
+        with self._lock:
+            if self._worksheets is not None:
+                self._worksheets[worksheet.title] = worksheet
+
+
+_registry_lock = threading.Lock()
+_clients: Dict[Tuple[str, Tuple[str, ...]], QuotaAwareClient] = {}
+_sessions: Dict[Tuple[str, str], SheetsSession] = {}
+
+
+def get_client(credentials_path: str, scopes: Optional[List[str]] = None) -> QuotaAwareClient:
+    """Cliente autorizado del proceso para un archivo de credenciales (se crea una vez)"""
+    scopes = scopes or SCOPES
+    key = (str(Path(credentials_path).resolve()), tuple(scopes))
+    with _registry_lock:
+        if key not in _clients:
+            creds = Credentials.from_service_account_file(str(credentials_path), scopes=scopes)
+            _clients[key] = QuotaAwareClient(creds)
+        return _clients[key]
+
+
+def get_session(credentials_path: str, spreadsheet_id: str, scopes: Optional[List[str]] = None) -> SheetsSession:
+    """Sesión compartida del proceso para un spreadsheet (sin llamadas a la red)"""
+    key = (str(Path(credentials_path).resolve()), spreadsheet_id)
+    with _registry_lock:
+        if key not in _sessions:
+            _sessions[key] = SheetsSession(credentials_path, spreadsheet_id, scopes)
+        return _sessions[key]
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Sheets Mirror
+Espejo local de la hoja Postulaciones sincronizado por deltas
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Any, List
+
+import gspread
+
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Columnas de Postulaciones (A..L) y columnas usadas para detectar ediciones
+# (I = Estado, que se edita a mano en el seguimiento, y J = Último Update)
+NUM_COLUMNS = 12
+LAST_COLUMN = 'L'
+CHECKSUM_RANGE = 'I:J'
+CHECKSUM_SLICE = slice(8, 10)
+
+# Si cambió más que esta fracción de filas, se relee la hoja completa
+MAX_PATCH_FRACTION = 0.1
+
+
+class SheetsMirror:
+    """
+    Copia local de Postulaciones (data/logs/sheets_mirror.json)
+
+    - Cada sync lee solo las filas agregadas después de la marca de agua
+      (cantidad de filas ya espejadas) con una lectura por rango.
+    - Cada verify_every_hours se leen solo las columnas Estado y 'Último Update'
+      y se compara su checksum: si hubo ediciones se releen solo las filas cambiadas
+      y, si se borraron filas o cambiaron demasiadas, la hoja completa.
+    """
+
+    def __init__(self, worksheet: gspread.Worksheet, path: str = "data/logs/sheets_mirror.json",
+                 verify_every_hours: float = 24):
+        """
+        Args:
+            worksheet: Hoja Postulaciones
+            path: Archivo del espejo local
+            verify_every_hours: Cada cuánto verificar el checksum de ediciones
+        """
+        self.worksheet = worksheet
+        self.path = Path(path)
+        self.verify_every = timedelta(hours=verify_every_hours)
+        self.state: Dict[str, Any] = self._load()
+
+    @property
+    def rows(self) -> List[List[str]]:
+        """Filas espejadas, con header"""
+        return self.state.get('filas', [])
+
+    def _load(self) -> Dict[str, Any]:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return {}
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.path.with_suffix('.json.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False)
+        os.replace(tmp_file, self.path)
+
+    def sync(self, force_verify: bool = False) -> List[List[str]]:
+        """
+        Sincroniza el espejo con la hoja
+
+        Args:
+            force_verify: Verificar ediciones aunque no corresponda todavía
+
+        Returns:
+            Filas de la hoja (con header)
+        """
+        if not self.rows:
+            self.full_resync()
+            return self.rows
+
+        verified_at = self.state.get('ultima_verificacion')
+        verify_due = force_verify or not verified_at or \
+            datetime.now() - datetime.strptime(verified_at, DATE_FORMAT) >= self.verify_every
+
+        if verify_due and not self._verify_and_patch():
+            self.full_resync()
+            return self.rows
+
+        # Delta: filas agregadas después de la marca de agua
+        watermark = len(self.rows)
+        new_rows = self.worksheet.get(f"A{watermark + 1}:{LAST_COLUMN}")
+        if new_rows:
+            self.rows.extend(self._pad(row) for row in new_rows)
+            print(f"✓ Espejo de Sheets: {len(new_rows)} filas nuevas")
+
+        self._update_checksum()
+        self.state['ultima_sincronizacion'] = datetime.now().strftime(DATE_FORMAT)
+        self._save()
+        return self.rows
+
+    def full_resync(self):
+        """Descarga la hoja completa"""
+        self.state['filas'] = [self._pad(row) for row in self.worksheet.get_all_values()]
+        self.state['ultima_verificacion'] = datetime.now().strftime(DATE_FORMAT)
+        self.state['ultima_sincronizacion'] = self.state['ultima_verificacion']
+        self._update_checksum()
+        self._save()
+        print(f"✓ Espejo de Sheets resincronizado completo ({len(self.rows)} filas)")
+
+    def replace_rows(self, rows: List[List[str]]):
+        """Reemplaza el espejo después de un cambio estructural hecho por nosotros (ej: archivo)"""
+        self.state['filas'] = [self._pad(row) for row in rows]
+        self._update_checksum()
+        self._save()
+
+    def _verify_and_patch(self) -> bool:
+        """
+        Compara la columna de control con el espejo y relee las filas editadas
+
+        Returns:
+            False si hace falta una resincronización completa
+        """
+        watermark = len(self.rows)
+        self.state['ultima_verificacion'] = datetime.now().strftime(DATE_FORMAT)
+
+        # La API omite las filas y celdas vacías al final: completar para comparar
+        marks = [self._mark(row) for row in self.worksheet.get(CHECKSUM_RANGE)]
+        marks = marks + [self._mark([])] * max(watermark - len(marks), 0)
+        if self._checksum(marks[:watermark]) == self.state.get('checksum'):
+            return True
+
+        changed = [i for i in range(watermark) if marks[i] != self._mark(self.rows[i][CHECKSUM_SLICE])]
+        if not changed:
+            return True
+        if len(changed) > max(watermark * MAX_PATCH_FRACTION, 1):
+            return False
+
+        # Verificar que la fila siga siendo el mismo trabajo (si no, se borraron/movieron filas)
+        ranges = [f"A{i + 1}:{LAST_COLUMN}{i + 1}" for i in changed]
+        fresh = self.worksheet.batch_get(ranges)
+        for i, value_range in zip(changed, fresh):
+            row = self._pad(value_range[0] if value_range else [])
+            if row[4] != self.rows[i][4]:
+                return False
+            self.rows[i] = row
+
+        print(f"✓ Espejo de Sheets: {len(changed)} filas editadas actualizadas")
+        return True
+
+    def _update_checksum(self):
+        self.state['checksum'] = self._checksum([self._mark(row[CHECKSUM_SLICE]) for row in self.rows])
+
+    @staticmethod
+    def _mark(cells: List[Any]) -> str:
+        """Valor de control de una fila (Estado + Último Update)"""
+        cells = [str(value) for value in cells] + [''] * 2
+        return f"{cells[0]}\t{cells[1]}"
+
+    @staticmethod
+    def _checksum(values: List[str]) -> str:
+        return hashlib.sha1('\n'.join(values).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _pad(row: List[Any]) -> List[str]:
+        """La API omite las celdas vacías al final de cada fila"""
+        row = [str(value) for value in row]
+        return row + [''] * (NUM_COLUMNS - len(row))
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Sheets Writer
+Escritura en segundo plano y por lotes de resultados a Google Sheets
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List
+
+
+# Tipos de operación encolada
+APPEND = 'postulacion'
+STATUS = 'estado'
+
+# Envíos fallidos seguidos antes de dejar de reintentar en esta ejecución (lo no
+# enviado ya está en disco: se reenvía en la próxima y reconcile_results lo repara)
+MAX_FLUSH_FAILURES = 5
+
+
+class SheetsBatchWriter:
+    """
+    Thread que envía resultados a Google Sheets en lotes
+
+    El loop del applier solo encola (sin llamadas a la API). El thread agrupa las
+    filas y las envía con append_rows cuando se juntan batch_size operaciones o
+    pasan flush_interval segundos. Si un envío falla, lo no confirmado se guarda
+    en disco de inmediato y se reintenta con backoff (hasta MAX_FLUSH_FAILURES
+    veces seguidas). Lo que no se alcanza a enviar se reenvía en la siguiente ejecución.
+    """
+
+    def __init__(self, sheets_manager, batch_size: int = 10, flush_interval: float = 30,
+                 max_queue: int = 500, pending_file: str = "data/logs/sheets_pending.json",
+                 logger=None):
+        """
+        Args:
+            sheets_manager: GoogleSheetsManager autenticado
+            batch_size: Operaciones que disparan un envío
+            flush_interval: Segundos máximos que una operación espera en el buffer
+            max_queue: Tamaño máximo de la cola (si se llena, se guarda a disco)
+            pending_file: Archivo para operaciones no enviadas
+            logger: Logger del proyecto
+        """
+        self.manager = sheets_manager
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.pending_file = Path(pending_file)
+        self.logger = logger
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._buffer: List[Dict[str, Any]] = self._load_pending()
+        self._overflow: List[Dict[str, Any]] = []
+        self._failures = 0
+        # El archivo pendiente tiene operaciones (recuperadas o de un envío fallido)
+        # y debe reflejar lo que sigue sin confirmar
+        self._persisted = bool(self._buffer)
+
+        self.rows_sent = 0
+        self.batches_sent = 0
+
+        if self._buffer:
+            self._log(f"Reenviando {len(self._buffer)} operaciones pendientes de Google Sheets")
+
+        self._thread = threading.Thread(target=self._worker, name="sheets-writer", daemon=True)
+        self._thread.start()
+
+    def add_job_application(self, job: Dict[str, Any], result: Dict[str, Any]):
+        """Encola una fila nueva para Postulaciones"""
+        self._submit({
+            'tipo': APPEND,
+            'job': job,
+            'result': result,
+            'fecha': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        })
+
+    def update_job_status(self, job_url: str, status: str, notes: str = ""):
+        """Encola un cambio de estado de una fila existente"""
+        self._submit({'tipo': STATUS, 'job_url': job_url, 'status': status, 'notes': notes})
+
+    def _submit(self, item: Dict[str, Any]):
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            # Nunca bloquear el loop del applier: queda en disco para la próxima ejecución
+            with self._lock:
+                self._overflow.append(item)
+            self._log("Cola de Google Sheets llena, operación guardada para después", warning=True)
+
+    def close(self, timeout: float = 60):
+        """
+        Envía lo pendiente y detiene el thread
+
+        Lo que no se pudo enviar dentro del timeout se guarda en pending_file.
+        """
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+        with self._lock:
+            remaining = self._buffer + self._overflow
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    remaining.append(item)
+            self._buffer, self._overflow = [], []
+
+        self._save_pending(remaining)
+        if remaining:
+            self._log(f"{len(remaining)} operaciones de Google Sheets guardadas en {self.pending_file}",
+                      warning=True)
+
+    def _worker(self):
+        """Junta operaciones y las envía por tamaño o tiempo"""
+        oldest = time.monotonic() if self._buffer else None
+        retry_at = 0.0
+        stopping = False
+
+        while not stopping:
+            wait = self.flush_interval if oldest is None else max(oldest + self.flush_interval - time.monotonic(), 0)
+            wait = max(wait, retry_at - time.monotonic())
+            try:
+                item = self._queue.get(timeout=wait)
+                if item is None:
+                    stopping = True
+                else:
+                    with self._lock:
+                        self._buffer.append(item)
+                    oldest = oldest or time.monotonic()
+            except queue.Empty:
+                pass
+
+            with self._lock:
+                size = len(self._buffer)
+            now = time.monotonic()
+            due = oldest is not None and now - oldest >= self.flush_interval
+            if size and (size >= self.batch_size or due or stopping) and (now >= retry_at or stopping):
+                if self._flush():
+                    oldest = None
+                elif self._failures >= MAX_FLUSH_FAILURES:
+                    # Sin más envíos en esta ejecución: close() guarda el buffer y lo que
+                    # siga llegando a la cola
+                    self._log(f"Google Sheets falló {self._failures} veces seguidas: lo pendiente queda en "
+                              f"{self.pending_file} para la próxima ejecución", warning=True)
+                    return
+                else:
+                    # Backoff exponencial ante errores (cuota, red)
+                    retry_at = now + min(self.flush_interval * (2 ** (self._failures - 1)), 600)
+
+    def _flush(self) -> bool:
+        """Envía el buffer. Solo se quitan del buffer las operaciones confirmadas"""
+        with self._lock:
+            batch = list(self._buffer)
+
+        appends = [item for item in batch if item['tipo'] == APPEND]
+        statuses = [item for item in batch if item['tipo'] == STATUS]
+        sent = []
+
+        try:
+            if appends:
+                self.manager.add_job_applications(
+                    [(item['job'], item['result']) for item in appends],
+                    timestamps=[item['fecha'] for item in appends]
+                )
+                sent.extend(appends)
+            if statuses:
+                not_found = self.manager.update_job_statuses(statuses)
+                sent.extend(statuses)
+                for job_url in not_found:
+                    self._log(f"Trabajo no encontrado en Google Sheets: {job_url}", warning=True)
+        except Exception as e:
+            self._failures += 1
+            self._persisted = True
+            self._log(f"Error enviando lote a Google Sheets (se reintentará): {str(e)}", warning=True)
+        finally:
+            self._confirm(sent)
+
+        if len(sent) < len(batch):
+            return False
+
+        self._failures = 0
+        self.batches_sent += 1
+        self._log(f"✓ Lote de {len(batch)} operaciones enviado a Google Sheets")
+        return True
+
+    def _confirm(self, sent: List[Dict[str, Any]]):
+        """
+        Quita del buffer las operaciones ya enviadas (para no duplicarlas al reintentar)
+
+        Si hay archivo pendiente, se reescribe con lo que sigue sin confirmar: así
+        un lote fallido sobrevive a una caída y lo ya enviado no se reenvía.
+        """
+        sent_ids = {id(item) for item in sent}
+        with self._lock:
+            self._buffer = [item for item in self._buffer if id(item) not in sent_ids]
+            unconfirmed = self._buffer + self._overflow
+        if self._persisted:
+            self._save_pending(unconfirmed)
+            self._persisted = bool(unconfirmed)
+        self.rows_sent += len(sent)
+
+    def _load_pending(self) -> List[Dict[str, Any]]:
+        if not self.pending_file.exists():
+            return []
+        try:
+            with open(self.pending_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            self._log(f"No se pudo leer {self.pending_file}: {str(e)}", warning=True)
+            return []
+
+    def _save_pending(self, items: List[Dict[str, Any]]):
+        """Guarda (o limpia) las operaciones pendientes de forma atómica"""
+        if not items:
+            self.pending_file.unlink(missing_ok=True)
+            return
+        self.pending_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.pending_file.with_suffix('.json.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(items, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_file, self.pending_file)
+
+    def _log(self, message: str, warning: bool = False):
+        if not self.logger:
+            print(message)
+        elif warning:
+            self.logger.warning(message)
+        else:
+            self.logger.info(message)
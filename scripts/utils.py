@@ -5,11 +5,13 @@ Funciones auxiliares para cargar configuración, credenciales, etc.
 """
 
 import os
+import re
 import json
 import yaml
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from dotenv import load_dotenv
+import pandas as pd
 import sys
 
 # Importar el gestor de credenciales
@@ -140,6 +142,118 @@ class Logger:
         self.log(message, "SUCCESS")
 
 
+class CVClassifier:
+    """
+    Clasificador de CV compilado una sola vez desde config.yaml
+    
+    Reglas de selección:
+    1. Palabras clave DEFINITIVAS (prioridad alta) → CV de consultoría
+    2. Si no hay coincidencia definitiva, el CV con más keywords encontradas
+    3. Si ningún CV tiene keywords, el CV por defecto
+    """
+    
+    # Palabras clave definitivas: freelance, data engineer (más específico que
+    # solo "engineer"), machine learning/ml, business intelligence/bi, analytics
+    PRIORITY_TERMS = [
+        "freelance", "data engineer", "machine learning", " ml ",
+        "business intelligence", " bi ", "data analyst", "analytics"
+    ]
+    PRIORITY_CV = "consultoria"
+    
+    def __init__(self, yaml_config: Dict[str, Any]):
+        cv_config = yaml_config.get('cvs', {})
+        self.cv_types = list(cv_config.keys())
+        self.default_cv = yaml_config.get('seleccion_cv', {}).get('cv_por_defecto', 'software')
+        
+        self.priority_regex = re.compile('|'.join(re.escape(term) for term in self.PRIORITY_TERMS))
+        
+        # Vocabulario de keywords y a qué CVs suma cada una
+        self.keywords = []
+        self.keyword_cvs = []
+        for cv_type, cv_info in cv_config.items():
+            for keyword in cv_info.get('keywords', []):
+                self.keywords.append(keyword.lower())
+                self.keyword_cvs.append(cv_type)
+    
+    def classify(self, job_title: str, job_description: str = "") -> Tuple[str, int]:
+        """
+        Selecciona el CV para un trabajo
+        
+        Returns:
+            Tupla (tipo de CV, número de keywords del CV encontradas)
+        """
+        text_to_analyze = (job_title + " " + job_description).lower()
+        
+        scores = dict.fromkeys(self.cv_types, 0)
+        for keyword, cv_type in zip(self.keywords, self.keyword_cvs):
+            if keyword in text_to_analyze:
+                scores[cv_type] += 1
+        
+        return self._select(self.priority_regex.search(text_to_analyze) is not None, scores)
+    
+    def classify_batch(self, jobs: List[Dict[str, Any]]) -> List[Tuple[str, int]]:
+        """
+        Clasifica muchos trabajos a la vez con una matriz trabajos × keywords
+        
+        Args:
+            jobs: Lista de trabajos (usa 'title' y 'description')
+        
+        Returns:
+            Lista de tuplas (tipo de CV, score) en el mismo orden
+        """
+        if not jobs:
+            return []
+        
+        texts = pd.Series([
+            f"{job.get('title', '') or ''} {job.get('description', '') or ''}".lower()
+            for job in jobs
+        ])
+        
+        priority_hits = texts.str.contains(self.priority_regex, regex=True)
+        
+        if not self.keywords:
+            return [self._select(bool(hit), {}) for hit in priority_hits]
+        
+        # Matriz de presencia (trabajos × keywords) por pertenencia de keyword a CV
+        presence = pd.DataFrame({
+            i: texts.str.contains(keyword, regex=False)
+            for i, keyword in enumerate(self.keywords)
+        }).astype(int)
+        membership = pd.get_dummies(pd.Series(self.keyword_cvs)).reindex(columns=self.cv_types, fill_value=0).astype(int)
+        scores = presence.to_numpy() @ membership.to_numpy()
+        
+        return [
+            self._select(bool(priority_hits.iat[row]), dict(zip(self.cv_types, scores[row].tolist())))
+            for row in range(len(jobs))
+        ]
+    
+    def annotate_jobs(self, jobs: List[Dict[str, Any]]):
+        """Guarda en cada trabajo el CV elegido ('cv_type') y su score ('cv_match_score')"""
+        for job, (cv_type, score) in zip(jobs, self.classify_batch(jobs)):
+            job['cv_type'] = cv_type
+            job['cv_match_score'] = score
+    
+    def _select(self, priority_hit: bool, scores: Dict[str, int]) -> Tuple[str, int]:
+        if priority_hit:
+            return self.PRIORITY_CV, scores.get(self.PRIORITY_CV, 0)
+        
+        if scores:
+            # max() conserva el primer CV en caso de empate (orden de config.yaml)
+            selected_cv = max(scores, key=scores.get)
+            if scores[selected_cv] > 0:
+                return selected_cv, scores[selected_cv]
+            return self.default_cv, 0
+        
+        return 'software', 0  # Default
+
+
+def get_cv_classifier(config: Config) -> CVClassifier:
+    """Obtiene el clasificador de CV de la configuración (se compila una sola vez)"""
+    if getattr(config, '_cv_classifier', None) is None:
+        config._cv_classifier = CVClassifier(config.load_yaml_config())
+    return config._cv_classifier
+
+
 def select_cv_by_keywords(job_title: str, job_description: str, config: Config) -> str:
     """
     Selecciona el CV apropiado basándose en keywords del trabajo
@@ -152,56 +266,7 @@ def select_cv_by_keywords(job_title: str, job_description: str, config: Config)
     Returns:
         Tipo de CV a usar ('software' o 'consultoria')
     """
-    yaml_config = config.load_yaml_config()
-    cv_config = yaml_config.get('cvs', {})
-    
-    text_to_analyze = (job_title + " " + job_description).lower()
-    
-    # ============================================================================
-    # PASO 1: Palabras clave DEFINITIVAS (prioridad alta)
-    # ============================================================================
-    
-    # Si contiene "freelance", usar consultoria
-    if "freelance" in text_to_analyze or "freelancer" in text_to_analyze:
-        return "consultoria"
-    
-    # Si contiene "data engineer" completo, usar consultoria (más específico que solo "engineer")
-    if "data engineer" in text_to_analyze:
-        return "consultoria"
-    
-    # Si contiene "machine learning" o "ml", usar consultoria
-    if "machine learning" in text_to_analyze or " ml " in text_to_analyze:
-        return "consultoria"
-    
-    # Si contiene "business intelligence" o "bi", usar consultoria
-    if "business intelligence" in text_to_analyze or " bi " in text_to_analyze:
-        return "consultoria"
-    
-    # Si contiene "data analyst" o "analytics", usar consultoria
-    if "data analyst" in text_to_analyze or "analytics" in text_to_analyze:
-        return "consultoria"
-    
-    # ============================================================================
-    # PASO 2: Scoring por keywords si no hay coincidencia definitiva
-    # ============================================================================
-    
-    scores = {}
-    for cv_type, cv_info in cv_config.items():
-        keywords = cv_info.get('keywords', [])
-        score = sum(1 for keyword in keywords if keyword.lower() in text_to_analyze)
-        scores[cv_type] = score
-    
-    # Retornar el CV con mayor score
-    if scores:
-        selected_cv = max(scores, key=scores.get)
-        
-        # Si hay empate o score muy bajo, usar default
-        if scores[selected_cv] == 0:
-            return yaml_config.get('seleccion_cv', {}).get('cv_por_defecto', 'software')
-        
-        return selected_cv
-    
-    return 'software'  # Default
+    return get_cv_classifier(config).classify(job_title, job_description)[0]
 
 
 def format_job_data(job_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -302,6 +367,44 @@ def extract_job_id_from_url(url: str) -> str:
     return url
 
 
+def find_configured_answer(question_text: str, preguntas_config: Dict[str, Any]) -> Optional[str]:
+    """
+    Busca la respuesta configurada para una pregunta en preguntas_configuradas
+    
+    Una entrada cuyo patrón coincide pero que no tiene 'respuesta'/'respuestas'
+    no responde la pregunta (se sigue buscando en las demás entradas).
+    
+    Args:
+        question_text: Texto de la pregunta
+        preguntas_config: Bloque preguntas_configuradas de answers.yaml
+    
+    Returns:
+        Respuesta si se encuentra, None si no
+    """
+    for pregunta_data in preguntas_config.values():
+        if not isinstance(pregunta_data, dict):
+            continue
+        patron = pregunta_data.get('pregunta_patron', '')
+        patrones = pregunta_data.get('patrones', [patron]) if patron else pregunta_data.get('patrones', [])
+        
+        for patron in patrones:
+            try:
+                matched = re.search(patron, question_text, re.IGNORECASE)
+            except re.error:
+                continue
+            if matched:
+                if 'respuesta' in pregunta_data:
+                    return pregunta_data['respuesta']
+                elif 'respuestas' in pregunta_data:
+                    respuestas = pregunta_data['respuestas']
+                    if isinstance(respuestas, dict):
+                        return respuestas.get('corta') or respuestas.get('default') or list(respuestas.values())[0]
+                    return str(respuestas)
+                break
+    
+    return None
+
+
 def should_skip_job(job_title: str, job_description: str, config: Config) -> bool:
     """
     Verifica si un trabajo debe ser omitido basándose en keywords excluidas
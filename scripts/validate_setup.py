@@ -181,6 +181,7 @@ def check_connectivity():
             if sheets_id and Path('config/google_credentials.json').exists():
                 try:
                     manager = GoogleSheetsManager('config/google_credentials.json', sheets_id)
+                    manager.connect()
                     print_status("✓", "Google Sheets conectado")
                 except Exception as e:
                     print_status("✗", f"Google Sheets error: {str(e)[:50]}")
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Worker Pool
+Procesos de trabajo tibios para el runner: un forkserver con las dependencias
+pesadas ya importadas crea un proceso nuevo por ejecución en milisegundos
+"""
+
+import multiprocessing
+import os
+import runpy
+import shlex
+import sys
+import threading
+import time
+from typing import List, Optional, Tuple
+
+
+# Importados una sola vez en el forkserver; cada trabajo hereda los módulos ya
+# cargados. Los que no estén instalados se ignoran.
+PRELOAD_MODULES = [
+    'selenium.webdriver',
+    'selenium.webdriver.support.ui',
+    'selenium.webdriver.support.expected_conditions',
+    'undetected_chromedriver',
+    'gspread',
+    'google.oauth2.service_account',
+    'google.auth.transport.requests',
+    'cryptography.fernet',
+    'cryptography.hazmat.primitives.kdf.pbkdf2',
+    'yaml',
+    'dotenv',
+    'pandas',
+    'requests',
+    'bs4',
+    'telegram',
+    'flask'
+]
+
+READY_TIMEOUT_SECONDS = 30
+
+
+def _noop():
+    """Proceso vacío para arrancar el forkserver por adelantado"""
+    pass
+
+
+def _run_entry(script: str, args: List[str], cwd: str, stdout_conn, stderr_conn, ready_conn):
+    """
+    Punto de entrada del proceso de trabajo: equivale a `python script args`
+
+    stdout/stderr se redirigen a los pipes del runner y el script corre como
+    __main__ (las excepciones y sys.exit definen el código de salida).
+    """
+    os.dup2(stdout_conn.fileno(), 1)
+    os.dup2(stderr_conn.fileno(), 2)
+    stdout_conn.close()
+    stderr_conn.close()
+    sys.stdout = open(1, 'w', encoding='utf-8', buffering=1, closefd=False)
+    sys.stderr = open(2, 'w', encoding='utf-8', buffering=1, closefd=False)
+
+    os.chdir(cwd)
+    path = os.path.abspath(script)
+    sys.argv = [script] + list(args)
+    sys.path.insert(0, os.path.dirname(path))
+
+    ready_conn.send(time.monotonic())
+    ready_conn.close()
+
+    runpy.run_path(path, run_name='__main__')
+
+
+class WorkerProcess:
+    """Proceso de trabajo con la misma interfaz que usa el runner de subprocess.Popen"""
+
+    def __init__(self, process, stdout_conn, stderr_conn, startup_ms: Optional[float]):
+        self.process = process
+        self.pid = process.pid
+        self.stdout = self._reader(stdout_conn)
+        self.stderr = self._reader(stderr_conn)
+        self.startup_ms = startup_ms
+
+    @staticmethod
+    def _reader(conn):
+        """Archivo de texto dueño de su propio fd: se cierra al terminar de leerlo, como con Popen"""
+        handle = open(os.dup(conn.fileno()), 'r', encoding='utf-8', errors='replace')
+        conn.close()
+        return handle
+
+    def wait(self) -> int:
+        """Espera el término (código negativo si murió por una señal, como Popen)"""
+        self.process.join()
+        return self.process.exitcode
+
+
+class WorkerPool:
+    """
+    Forkserver con las dependencias precargadas
+
+    Cada ejecución es un proceso propio (un fallo o un cuelgue no afecta al
+    runner ni a otras ejecuciones), pero se crea por fork desde un intérprete
+    que ya importó selenium, gspread, google-auth, cryptography, pandas, etc.
+    """
+
+    def __init__(self, cwd: str, log=print):
+        """
+        Args:
+            cwd: Directorio de trabajo de los scripts
+            log: Función de log del runner
+        """
+        self.cwd = cwd
+        self.log = log
+        self.ctx = multiprocessing.get_context('forkserver')
+        self.ctx.set_forkserver_preload(PRELOAD_MODULES)
+        self.boot_seconds: Optional[float] = None
+
+    def start(self):
+        """Arranca el forkserver en segundo plano (las importaciones pesadas se pagan acá)"""
+        def boot():
+            start = time.monotonic()
+            process = self.ctx.Process(target=_noop)
+            process.start()
+            process.join()
+            self.boot_seconds = round(time.monotonic() - start, 2)
+            self.log(f"Forkserver listo en {self.boot_seconds}s")
+        threading.Thread(target=boot, name="forkserver-boot", daemon=True).start()
+
+    @staticmethod
+    def entry_point(cmd: str) -> Optional[Tuple[str, List[str]]]:
+        """(script, args) si cmd es `python <script>.py ...`; None si hay que usar subprocess"""
+        parts = shlex.split(cmd)
+        if len(parts) >= 2 and parts[0] in ('python', 'python3') and parts[1].endswith('.py'):
+            return parts[1], parts[2:]
+        return None
+
+    def launch(self, script: str, args: List[str]) -> WorkerProcess:
+        """
+        Crea el proceso de trabajo y espera a que el script esté por empezar
+
+        Returns:
+            WorkerProcess con stdout/stderr para leer por líneas y startup_ms
+        """
+        stdout_r, stdout_w = self.ctx.Pipe(duplex=False)
+        stderr_r, stderr_w = self.ctx.Pipe(duplex=False)
+        ready_r, ready_w = self.ctx.Pipe(duplex=False)
+
+        start = time.monotonic()
+        process = self.ctx.Process(
+            target=_run_entry,
+            args=(script, args, self.cwd, stdout_w, stderr_w, ready_w),
+            name=f"worker-{os.path.basename(script)}"
+        )
+        process.start()
+
+        # El hijo tiene sus copias: cerrar las nuestras para recibir EOF al terminar
+        for conn in (stdout_w, stderr_w, ready_w):
+            conn.close()
+
+        startup_ms = None
+        try:
+            if ready_r.poll(READY_TIMEOUT_SECONDS):
+                startup_ms = round((ready_r.recv() - start) * 1000, 1)
+        except EOFError:
+            pass  # El proceso murió antes de llegar al script
+        finally:
+            ready_r.close()
+
+        return WorkerProcess(process, stdout_r, stderr_r, startup_ms)
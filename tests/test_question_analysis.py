@@ -0,0 +1,44 @@
+"""Pruebas de la detección de preguntas ya configuradas (question_analysis)"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+from question_analysis import is_configured
+from utils import find_configured_answer
+
+
+PREGUNTAS = {
+    # Patrón sin 'respuesta'/'respuestas': el applier no la puede responder
+    'anos_experiencia_general': {
+        'patrones': ['years of experience', 'años de experiencia'],
+        'respuestas_por_contexto': {'default': '4'}
+    },
+    'autorizacion_trabajo': {
+        'patrones': ['authorized to work'],
+        'respuesta': 'Yes'
+    }
+}
+
+
+def test_pattern_without_answer_is_not_configured():
+    question = "How many years of experience do you have with Kubernetes?"
+    assert find_configured_answer(question, PREGUNTAS) is None
+    assert not is_configured(question, PREGUNTAS)
+
+
+def test_pattern_with_answer_is_configured():
+    question = "Are you legally authorized to work in Chile?"
+    assert find_configured_answer(question, PREGUNTAS) == 'Yes'
+    assert is_configured(question, PREGUNTAS)
+
+
+def test_later_entry_answers_after_unanswered_match():
+    preguntas = dict(PREGUNTAS, experiencia_python={
+        'patrones': ['years of experience.*python'],
+        'respuestas': {'corta': '5'}
+    })
+    question = "Years of experience with Python?"
+    assert find_configured_answer(question, preguntas) == '5'
+    assert is_configured(question, preguntas)
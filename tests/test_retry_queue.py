@@ -0,0 +1,75 @@
+"""Pruebas de la clasificación de fallos y de cuándo un trabajo vuelve al navegador (retry_queue)"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+from retry_queue import (RetryQueue, classify_failure, DATE_FORMAT,
+                         TRANSIENT, STRUCTURAL, PERMANENT)
+
+
+JOB = {'url': 'https://www.linkedin.com/jobs/view/4346887275/', 'title': 'Dev', 'company': 'ACME'}
+
+
+def _queue(tmp_path, **kwargs):
+    return RetryQueue(path=str(tmp_path / 'retry_queue.json'), **kwargs)
+
+
+def _make_due(queue):
+    past = (datetime.now() - timedelta(seconds=1)).strftime(DATE_FORMAT)
+    for entry in queue.entries.values():
+        entry['next_attempt_at'] = past
+
+
+def test_classify_failure():
+    assert classify_failure({'success': True, 'status': 'APPLIED'}) is None
+    assert classify_failure({'status': 'ELIMINADO'}) == PERMANENT
+    assert classify_failure({'status': 'MANUAL', 'error': 'Requiere postulación externa'}) == PERMANENT
+    assert classify_failure({'status': 'MANUAL', 'error': 'Loop infinito detectado'}) == STRUCTURAL
+    assert classify_failure({'status': 'ERROR', 'error': 'Tiempo límite por trabajo excedido'}) == TRANSIENT
+    assert classify_failure({'status': 'MANUAL', 'error': 'algo raro'}) == STRUCTURAL
+    assert classify_failure({'status': 'ERROR', 'error': 'algo raro'}) == TRANSIENT
+
+
+def test_scheduled_retry_is_skipped_until_due(tmp_path):
+    queue = _queue(tmp_path, backoff_base_seconds=600)
+    queue.record(JOB, {'status': 'ERROR', 'error': 'Timeout'}, run_id='run-1')
+
+    # Sigue siendo is_new en jobs_found.json, pero el backoff no venció
+    assert queue.skip_reason(JOB, 'run-2').startswith('reintento programado desde')
+    assert queue.due('run-2') == []
+
+    _make_due(queue)
+    assert queue.skip_reason(JOB, 'run-2') is None
+    assert queue.due('run-2') == [JOB]
+
+
+def test_structural_failure_only_retries_in_another_run(tmp_path):
+    queue = _queue(tmp_path, backoff_base_seconds=0)
+    queue.record(JOB, {'status': 'MANUAL', 'error': 'Loop infinito detectado'}, run_id='run-1')
+    _make_due(queue)
+
+    assert queue.skip_reason(JOB, 'run-1') is not None
+    assert queue.due('run-1') == []
+    assert queue.skip_reason(JOB, 'run-2') is None
+
+    # Un solo reintento: el segundo fallo estructural lo agota
+    queue.record(JOB, {'status': 'MANUAL', 'error': 'Loop infinito detectado'}, run_id='run-2')
+    assert queue.skip_reason(JOB, 'run-3').startswith('reintentos agotados')
+
+
+def test_permanent_failure_never_returns(tmp_path):
+    queue = _queue(tmp_path)
+    queue.record(JOB, {'status': 'ELIMINADO', 'error': 'Ya no acepta postulaciones'}, run_id='run-1')
+    assert queue.skip_reason(JOB, 'run-2').startswith('fallo permanente')
+    assert queue.due('run-2') == []
+
+
+def test_success_clears_the_entry(tmp_path):
+    queue = _queue(tmp_path)
+    queue.record(JOB, {'status': 'ERROR', 'error': 'Timeout'}, run_id='run-1')
+    queue.record(JOB, {'success': True, 'status': 'APPLIED'}, run_id='run-2')
+    assert not queue.is_retry(JOB)
+    assert _queue(tmp_path).skip_reason(JOB, 'run-3') is None
@@ -0,0 +1,70 @@
+"""Pruebas de reanudación del applier desde el checkpoint (run_checkpoint)"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+from run_checkpoint import ApplyCheckpoint
+
+
+def _job(n):
+    return {'url': f'https://www.linkedin.com/jobs/view/{n}/', 'title': f'Dev {n}', 'company': 'ACME'}
+
+
+def _result(job, status):
+    return {'job_url': job['url'], 'success': status == 'APPLIED', 'status': status}
+
+
+def _crashed_run(path):
+    """Ejecución que terminó un trabajo, quedó en medio de un envío y de otro trabajo, y se cayó"""
+    checkpoint = ApplyCheckpoint(str(path))
+    run_id = checkpoint.start_run()
+    done, submitting, in_progress = _job(1), _job(2), _job(3)
+    for job in (done, submitting, in_progress):
+        checkpoint.claim(job)
+        checkpoint.mark_in_progress(job)
+    checkpoint.finish(done, _result(done, 'APPLIED'))
+    checkpoint.mark_submitting(submitting)
+    return run_id
+
+
+def test_resume_restores_results_and_closes_interrupted_submits(tmp_path):
+    path = tmp_path / 'apply_checkpoint.jsonl'
+    run_id = _crashed_run(path)
+
+    checkpoint = ApplyCheckpoint(str(path))
+    assert checkpoint.start_run(resume=True) == run_id
+
+    results = checkpoint.run_results()
+    assert [(r['job_url'], r['status']) for r in results] == [
+        (_job(1)['url'], 'APPLIED'),
+        (_job(2)['url'], 'MANUAL'),   # Posiblemente enviada: se verifica a mano
+    ]
+
+    assert checkpoint.skip_reason(_job(1)) is not None
+    assert checkpoint.skip_reason(_job(2)) is not None
+    assert checkpoint.skip_reason(_job(3)) is None   # Nunca llegó a enviarse: se reintenta
+
+
+def test_new_run_reports_only_interrupted_submits_and_never_resubmits(tmp_path):
+    path = tmp_path / 'apply_checkpoint.jsonl'
+    run_id = _crashed_run(path)
+
+    checkpoint = ApplyCheckpoint(str(path))
+    assert checkpoint.start_run(resume=False) != run_id
+    # El envío interrumpido se cierra como MANUAL en la ejecución nueva (para sincronizarlo)
+    assert [(r['job_url'], r['status']) for r in checkpoint.run_results()] == [(_job(2)['url'], 'MANUAL')]
+    assert checkpoint.skip_reason(_job(1)) is not None
+    assert checkpoint.skip_reason(_job(2)) is not None
+
+
+def test_truncated_last_line_is_ignored(tmp_path):
+    path = tmp_path / 'apply_checkpoint.jsonl'
+    run_id = _crashed_run(path)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"event": "job", "run_id": "')
+
+    checkpoint = ApplyCheckpoint(str(path))
+    assert checkpoint.start_run(resume=True) == run_id
+    assert len(checkpoint.run_results()) == 2
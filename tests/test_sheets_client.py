@@ -0,0 +1,66 @@
+"""Pruebas de reintentos del QuotaAwareClient según la idempotencia de la request"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from gspread.client import Client
+from gspread.exceptions import APIError
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+import sheets_client
+from sheets_client import QuotaAwareClient, TokenBucket
+
+SPREADSHEET = 'https://sheets.googleapis.com/v4/spreadsheets/abc'
+
+
+class StubResponse:
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+        self.text = ''
+
+    def json(self):
+        return {'error': {'code': self.status_code, 'message': 'error', 'status': 'UNAVAILABLE'}}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Cliente cuya request base falla una vez con el status indicado en client.fail_with"""
+    monkeypatch.setattr(sheets_client.time, 'sleep', lambda seconds: None)
+    client = QuotaAwareClient(auth=None, bucket=TokenBucket(rate_per_minute=60000, capacity=100))
+    client.fail_with = None
+
+    def base_request(self, method, endpoint, **kwargs):
+        if self.fail_with:
+            status, self.fail_with = self.fail_with, None
+            raise APIError(StubResponse(status))
+        return 'ok'
+
+    monkeypatch.setattr(Client, 'request', base_request)
+    return client
+
+
+def test_append_is_not_retried_on_server_error(client):
+    client.fail_with = 503
+    with pytest.raises(APIError):
+        client.request('post', f'{SPREADSHEET}/values/Postulaciones!A1:append')
+    assert client.stats['reintentos'] == 0
+    assert client.stats['errores'] == 1
+
+
+def test_append_is_retried_on_quota_error(client):
+    client.fail_with = 429
+    assert client.request('post', f'{SPREADSHEET}/values/Postulaciones!A1:append') == 'ok'
+    assert client.stats['reintentos'] == 1
+
+
+@pytest.mark.parametrize('method, endpoint', [
+    ('get', f'{SPREADSHEET}/values/Postulaciones!A2:I'),
+    ('post', f'{SPREADSHEET}/values:batchUpdate'),
+    ('put', f'{SPREADSHEET}/values/Dashboard!A1'),
+])
+def test_idempotent_requests_are_retried_on_server_error(client, method, endpoint):
+    client.fail_with = 503
+    assert client.request(method, endpoint) == 'ok'
+    assert client.stats['reintentos'] == 1
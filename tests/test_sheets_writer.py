@@ -0,0 +1,79 @@
+"""Pruebas de fallos, persistencia y reenvío del SheetsBatchWriter"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+from sheets_writer import SheetsBatchWriter, MAX_FLUSH_FAILURES
+
+
+class StubManager:
+    """GoogleSheetsManager falso: falla las primeras `failures` escrituras"""
+
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.calls = 0
+        self.rows = []
+
+    def add_job_applications(self, applications, timestamps=None):
+        self.calls += 1
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("503 Service Unavailable")
+        self.rows.extend(applications)
+
+    def update_job_statuses(self, updates):
+        return []
+
+
+def _job(n):
+    return {'url': f'https://www.linkedin.com/jobs/view/{n}/'}, {'status': 'APPLIED'}
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_failed_batch_is_persisted_then_sent(tmp_path):
+    pending = tmp_path / 'sheets_pending.json'
+    manager = StubManager(failures=1)
+    writer = SheetsBatchWriter(manager, batch_size=1, flush_interval=0.01, pending_file=str(pending))
+
+    writer.add_job_application(*_job(1))
+    assert _wait_for(pending.exists)
+    assert len(json.loads(pending.read_text())) == 1
+
+    assert _wait_for(lambda: len(manager.rows) == 1)
+    assert not pending.exists()
+    writer.close()
+    assert not pending.exists()
+
+
+def test_failure_cap_stops_the_worker_and_close_saves_everything(tmp_path):
+    pending = tmp_path / 'sheets_pending.json'
+    manager = StubManager(failures=100)
+    writer = SheetsBatchWriter(manager, batch_size=1, flush_interval=0.01, pending_file=str(pending))
+
+    writer.add_job_application(*_job(1))
+    # El thread termina al llegar al límite en vez de seguir girando
+    assert _wait_for(lambda: not writer._thread.is_alive())
+    assert manager.calls == MAX_FLUSH_FAILURES
+
+    writer.add_job_application(*_job(2))
+    writer.close(timeout=1)
+    assert manager.calls == MAX_FLUSH_FAILURES
+    saved = json.loads(pending.read_text())
+    assert [item['job']['url'] for item in saved] == [_job(1)[0]['url'], _job(2)[0]['url']]
+
+    # La próxima ejecución reenvía lo guardado y limpia el archivo
+    retry_manager = StubManager()
+    retry_writer = SheetsBatchWriter(retry_manager, batch_size=1, flush_interval=0.01, pending_file=str(pending))
+    retry_writer.close()
+    assert len(retry_manager.rows) == 2
+    assert not pending.exists()